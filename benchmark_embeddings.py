@@ -18,6 +18,10 @@ except ImportError:
 # Add the server directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'server'))
 
+from app.cpu_threads import configure_cpu_threads
+
+configure_cpu_threads()
+
 from app.services.embedding_service import EmbeddingService
 
 
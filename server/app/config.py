@@ -13,6 +13,8 @@ class DatabaseSettings(BaseSettings):
     pool_size: int = Field(default=10, gt=0)
     max_overflow: int = Field(default=20, ge=0)
     pool_pre_ping: bool = Field(default=True)
+    pool_recycle: int = Field(default=1800, ge=-1)
+    query_cache_size: int = Field(default=1200, ge=0)
 
     class Config:
         env_prefix = "DATABASE_"
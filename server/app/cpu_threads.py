@@ -0,0 +1,43 @@
+"""
+CPU thread configuration for model inference.
+
+Tokenizers, torch and MKL each start a pool sized to every logical core by
+default and fight over the CPU. Process entry points (the API app, the RQ
+worker) call configure_cpu_threads() before any model library is imported;
+library modules never change the process environment themselves.
+"""
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+def default_thread_count() -> int:
+    """Half the logical cores, which approximates the physical core count on SMT hosts."""
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+def configure_cpu_threads() -> None:
+    """
+    Cap the tokenizer, OpenMP and MKL thread pools for this process.
+
+    Values already set in the environment are kept, so OMP_NUM_THREADS and
+    friends can still be overridden per deployment.
+    """
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+    os.environ.setdefault("OMP_NUM_THREADS", str(default_thread_count()))
+    os.environ.setdefault("MKL_NUM_THREADS", os.environ["OMP_NUM_THREADS"])
+
+
+def configure_torch_threads() -> None:
+    """Match torch's intra-op pool to OMP_NUM_THREADS and use a single inter-op thread."""
+    try:
+        import torch
+    except ImportError:
+        return
+    try:
+        torch.set_num_threads(int(os.getenv("OMP_NUM_THREADS", str(default_thread_count()))))
+        torch.set_num_interop_threads(1)
+    except (RuntimeError, ValueError) as e:
+        # set_num_interop_threads fails once torch has started parallel work
+        logger.debug(f"Could not configure torch threads: {e}")
@@ -11,6 +11,7 @@ from ..services.cache_service import cache_service
 from ..repositories import FeedbackRepository
 from ..services.queue_service import queue_service
 from ..services.embedding_service import EmbeddingService
+from ..services.faiss_vector_store import save_faiss_stores
 from ..services.sentiment_service import SentimentService
 from .clustering_jobs import process_feedback_clustering
 
@@ -38,7 +39,7 @@ def process_feedback_annotation(
 
     db = SessionLocal()
     embedding_service = EmbeddingService()
-    sentiment_service = SentimentService()
+    sentiment_service = SentimentService(embedding_service=embedding_service)
     try:
         repo = FeedbackRepository(db)
 
@@ -85,7 +86,7 @@ def process_feedback_annotation(
 
                 # Store embeddings in ChromaDB
                 chroma_ids = [f"feedback_{item[0].id}" for item in feedback_items]
-                embedding_service.store_embeddings_chroma(
+                embedding_service.store_embeddings(
                     embeddings=embeddings,
                     texts=[item[1] for item in feedback_items],
                     ids=chroma_ids,
@@ -96,11 +97,27 @@ def process_feedback_annotation(
         else:
             logger.warning("Embedding service not available or no texts to embed")
 
+        # Score sentiment for the whole batch in one pass (a single forward
+        # pass per batch for the transformer strategy; the MiniLM head reuses
+        # the embeddings generated above)
+        sentiments = None
+        if feedback_items:
+            try:
+                sentiments = sentiment_service.analyze_batch(
+                    [item[1] for item in feedback_items],
+                    embeddings=embeddings
+                )
+            except Exception as e:
+                logger.warning(f"Batch sentiment analysis failed ({e}), scoring items individually")
+
         # Second pass: create annotations with embeddings and sentiment
         for i, (feedback, text_to_process) in enumerate(feedback_items):
             try:
                 # Analyze sentiment using the configured strategy
-                sentiment, sentiment_score = sentiment_service.analyze_sentiment(text_to_process)
+                if sentiments is not None:
+                    sentiment, sentiment_score = sentiments[i]
+                else:
+                    sentiment, sentiment_score = sentiment_service.analyze_sentiment(text_to_process)
 
                 # Get embedding for this feedback item
                 embedding = embeddings[i].tolist() if embeddings is not None else None
@@ -178,6 +195,9 @@ def process_feedback_annotation(
         raise
     finally:
         db.close()
+        # RQ runs each job in a work horse that exits with os._exit(), which
+        # skips exit hooks, so write the FAISS index snapshot here
+        save_faiss_stores()
 
 
 def enqueue_feedback_annotation(
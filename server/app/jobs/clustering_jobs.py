@@ -12,6 +12,7 @@ from ..services.cache_service import cache_service
 from ..repositories import FeedbackRepository, TopicRepository
 from ..services.queue_service import queue_service
 from ..services.clustering_service import ClusteringService
+from ..services.faiss_vector_store import save_faiss_stores
 
 logger = logging.getLogger(__name__)
 
@@ -105,6 +106,8 @@ def process_feedback_clustering(
         raise
     finally:
         db.close()
+        # Work horses exit with os._exit(); write the FAISS index snapshot now
+        save_faiss_stores()
 
 
 def enqueue_feedback_clustering(
@@ -293,6 +296,8 @@ def cluster_daily_topics(
         raise
     finally:
         db.close()
+        # Work horses exit with os._exit(); write the FAISS index snapshot now
+        save_faiss_stores()
 
 
 def enqueue_daily_topic_clustering(
@@ -43,9 +43,10 @@ def process_feedback_ingestion(
         failed = []
         skipped_non_english = []
 
+        # First pass: load feedback items
+        feedback_items = []
         for feedback_id in feedback_ids:
             try:
-                # Get feedback item
                 feedback = repo.get_feedback_by_id(feedback_id)
                 if not feedback:
                     failed.append({
@@ -53,12 +54,38 @@ def process_feedback_ingestion(
                         "error": "Feedback not found"
                     })
                     continue
+                feedback_items.append(feedback)
+            except Exception as e:
+                logger.error(f"Failed to load feedback {feedback_id}: {e}")
+                failed.append({
+                    "id": feedback_id,
+                    "error": str(e)
+                })
 
-                # Perform text processing
-                normalized_text, detected_lang, should_process = text_processor.process_text(
-                    feedback.text,
+        # Normalize all texts and detect languages in one batched call; if it
+        # fails, items are processed one by one so a bad text only fails itself
+        text_results = None
+        if feedback_items:
+            try:
+                text_results = text_processor.process_texts(
+                    [feedback.text for feedback in feedback_items],
                     skip_non_english=True  # Skip non-English for MVP
                 )
+            except Exception as e:
+                logger.warning(f"Batch text processing failed ({e}), processing items individually")
+
+        # Second pass: store processed data
+        for i, feedback in enumerate(feedback_items):
+            feedback_id = str(feedback.id)
+            try:
+                # Perform text processing
+                if text_results is not None:
+                    normalized_text, detected_lang, should_process = text_results[i]
+                else:
+                    normalized_text, detected_lang, should_process = text_processor.process_text(
+                        feedback.text,
+                        skip_non_english=True  # Skip non-English for MVP
+                    )
 
                 # Update feedback with processed data
                 feedback.normalized_text = normalized_text
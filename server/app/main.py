@@ -1,3 +1,7 @@
+# Thread pools must be capped before any model library is imported
+from .cpu_threads import configure_cpu_threads
+configure_cpu_threads()
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -9,6 +13,8 @@ from .routers.metrics import router as metrics_router
 from .logging import setup_logging, LoggingSettings
 from .middleware.request_timing import RequestTimingMiddleware
 from .metrics import set_service_health
+from .services.sentiment_service import enable_vader_pool, shutdown_vader_pool
+from .services.faiss_vector_store import save_faiss_stores
 
 # Setup logging
 logging_settings = LoggingSettings()
@@ -80,6 +86,17 @@ app.include_router(
 # Metrics router (development only)
 app.include_router(metrics_router)
 
+@app.on_event("startup")
+def start_worker_pools():
+    """Allow large VADER batches to use the process pool in the long-lived API process."""
+    enable_vader_pool()
+
+@app.on_event("shutdown")
+def release_worker_pools():
+    """Stop the VADER process pool and write the FAISS index snapshot."""
+    shutdown_vader_pool()
+    save_faiss_stores()
+
 # Health check endpoints
 @app.get("/health")
 async def health_check():
@@ -2,6 +2,7 @@
 Prometheus metrics configuration and collection.
 """
 import os
+from dataclasses import dataclass
 from typing import Optional
 from prometheus_client import (
     Counter,
@@ -15,127 +16,167 @@ from prometheus_client.registry import CollectorRegistry
 from .logging import log
 
 
-# Create registry for metrics
-registry = CollectorRegistry()
-
-# HTTP Request Metrics
-http_requests_total = Counter(
-    "http_requests_total",
-    "Total number of HTTP requests",
-    ["method", "endpoint", "status_code"],
-    registry=registry,
-)
-
-http_request_duration_seconds = Histogram(
-    "http_request_duration_seconds",
-    "HTTP request duration in seconds",
-    ["method", "endpoint"],
-    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
-    registry=registry,
-)
-
-http_request_size_bytes = Histogram(
-    "http_request_size_bytes",
-    "HTTP request size in bytes",
-    ["method", "endpoint"],
-    buckets=(100, 1000, 10000, 100000, 1000000),
-    registry=registry,
-)
+@dataclass(frozen=True)
+class Metrics:
+    """A full set of application collectors registered on one registry."""
+
+    registry: CollectorRegistry
+    http_requests_total: Counter
+    http_request_duration_seconds: Histogram
+    http_request_size_bytes: Histogram
+    http_response_size_bytes: Histogram
+    active_connections: Gauge
+    feedback_processed_total: Counter
+    worker_jobs_total: Counter
+    worker_job_duration_seconds: Histogram
+    worker_active_jobs: Gauge
+    service_health_status: Gauge
+    db_connections_active: Gauge
+    db_query_duration_seconds: Histogram
+    cache_hits_total: Counter
+    cache_misses_total: Counter
+    cache_size: Gauge
+
+
+def build_metrics(registry: Optional[CollectorRegistry] = None) -> Metrics:
+    """Create every application collector on ``registry`` (a fresh one by default).
+
+    The module-level collectors below come from one call at import; tests can
+    build their own isolated set instead of reloading this module.
+    """
+    registry = registry if registry is not None else CollectorRegistry()
+    return Metrics(
+        registry=registry,
+        # HTTP Request Metrics
+        http_requests_total=Counter(
+            "http_requests_total",
+            "Total number of HTTP requests",
+            ["method", "endpoint", "status_code"],
+            registry=registry,
+        ),
+        http_request_duration_seconds=Histogram(
+            "http_request_duration_seconds",
+            "HTTP request duration in seconds",
+            ["method", "endpoint"],
+            buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+            registry=registry,
+        ),
+        http_request_size_bytes=Histogram(
+            "http_request_size_bytes",
+            "HTTP request size in bytes",
+            ["method", "endpoint"],
+            buckets=(100, 1000, 10000, 100000, 1000000),
+            registry=registry,
+        ),
+        http_response_size_bytes=Histogram(
+            "http_response_size_bytes",
+            "HTTP response size in bytes",
+            ["method", "endpoint", "status_code"],
+            buckets=(100, 1000, 10000, 100000, 1000000),
+            registry=registry,
+        ),
+        # Application Metrics
+        active_connections=Gauge(
+            "active_connections",
+            "Number of active connections",
+            registry=registry,
+        ),
+        feedback_processed_total=Counter(
+            "feedback_processed_total",
+            "Total number of feedback items processed",
+            ["source", "status"],
+            registry=registry,
+        ),
+        # Worker Metrics
+        worker_jobs_total=Counter(
+            "worker_jobs_total",
+            "Total number of worker jobs processed",
+            ["job_type", "status"],
+            registry=registry,
+        ),
+        worker_job_duration_seconds=Histogram(
+            "worker_job_duration_seconds",
+            "Worker job duration in seconds",
+            ["job_type"],
+            buckets=(1, 5, 10, 30, 60, 120, 300, 600),
+            registry=registry,
+        ),
+        worker_active_jobs=Gauge(
+            "worker_active_jobs",
+            "Number of currently active worker jobs",
+            ["job_type"],
+            registry=registry,
+        ),
+        # Service Health Metrics
+        service_health_status=Gauge(
+            "service_health_status",
+            "Service health status (1=healthy, 0=unhealthy)",
+            ["service"],
+            registry=registry,
+        ),
+        # Database Metrics
+        db_connections_active=Gauge(
+            "db_connections_active",
+            "Number of active database connections",
+            registry=registry,
+        ),
+        db_query_duration_seconds=Histogram(
+            "db_query_duration_seconds",
+            "Database query duration in seconds",
+            ["operation", "table"],
+            buckets=(0.001, 0.01, 0.1, 1.0, 5.0),
+            registry=registry,
+        ),
+        # Cache Metrics
+        cache_hits_total=Counter(
+            "cache_hits_total",
+            "Total number of cache hits",
+            ["cache_name"],
+            registry=registry,
+        ),
+        cache_misses_total=Counter(
+            "cache_misses_total",
+            "Total number of cache misses",
+            ["cache_name"],
+            registry=registry,
+        ),
+        cache_size=Gauge(
+            "cache_size",
+            "Current cache size",
+            ["cache_name"],
+            registry=registry,
+        )
+    )
 
-http_response_size_bytes = Histogram(
-    "http_response_size_bytes",
-    "HTTP response size in bytes",
-    ["method", "endpoint", "status_code"],
-    buckets=(100, 1000, 10000, 100000, 1000000),
-    registry=registry,
-)
-
-# Application Metrics
-active_connections = Gauge(
-    "active_connections",
-    "Number of active connections",
-    registry=registry,
-)
-
-feedback_processed_total = Counter(
-    "feedback_processed_total",
-    "Total number of feedback items processed",
-    ["source", "status"],
-    registry=registry,
-)
-
-# Worker Metrics
-worker_jobs_total = Counter(
-    "worker_jobs_total",
-    "Total number of worker jobs processed",
-    ["job_type", "status"],
-    registry=registry,
-)
 
-worker_job_duration_seconds = Histogram(
-    "worker_job_duration_seconds",
-    "Worker job duration in seconds",
-    ["job_type"],
-    buckets=(1, 5, 10, 30, 60, 120, 300, 600),
-    registry=registry,
-)
-
-worker_active_jobs = Gauge(
-    "worker_active_jobs",
-    "Number of currently active worker jobs",
-    ["job_type"],
-    registry=registry,
-)
-
-# Service Health Metrics
-service_health_status = Gauge(
-    "service_health_status",
-    "Service health status (1=healthy, 0=unhealthy)",
-    ["service"],
-    registry=registry,
-)
-
-# Database Metrics
-db_connections_active = Gauge(
-    "db_connections_active",
-    "Number of active database connections",
-    registry=registry,
-)
+# Create registry for metrics
+registry = CollectorRegistry()
+_default_metrics = build_metrics(registry)
 
-db_query_duration_seconds = Histogram(
-    "db_query_duration_seconds",
-    "Database query duration in seconds",
-    ["operation", "table"],
-    buckets=(0.001, 0.01, 0.1, 1.0, 5.0),
-    registry=registry,
-)
+# Process-wide collectors used by the API and worker
+http_requests_total = _default_metrics.http_requests_total
+http_request_duration_seconds = _default_metrics.http_request_duration_seconds
+http_request_size_bytes = _default_metrics.http_request_size_bytes
+http_response_size_bytes = _default_metrics.http_response_size_bytes
+active_connections = _default_metrics.active_connections
+feedback_processed_total = _default_metrics.feedback_processed_total
+worker_jobs_total = _default_metrics.worker_jobs_total
+worker_job_duration_seconds = _default_metrics.worker_job_duration_seconds
+worker_active_jobs = _default_metrics.worker_active_jobs
+service_health_status = _default_metrics.service_health_status
+db_connections_active = _default_metrics.db_connections_active
+db_query_duration_seconds = _default_metrics.db_query_duration_seconds
+cache_hits_total = _default_metrics.cache_hits_total
+cache_misses_total = _default_metrics.cache_misses_total
+cache_size = _default_metrics.cache_size
 
-# Cache Metrics
-cache_hits_total = Counter(
-    "cache_hits_total",
-    "Total number of cache hits",
-    ["cache_name"],
-    registry=registry,
-)
 
-cache_misses_total = Counter(
-    "cache_misses_total",
-    "Total number of cache misses",
-    ["cache_name"],
-    registry=registry,
-)
-
-cache_size = Gauge(
-    "cache_size",
-    "Current cache size",
-    ["cache_name"],
-    registry=registry,
-)
+_DEVELOPMENT_ENVIRONMENTS = frozenset(("dev", "development", "local"))
 
 
 def is_development_mode() -> bool:
-    """Check if we're running in development mode."""
-    return os.getenv("ENVIRONMENT", "development").lower() in ["dev", "development", "local"]
+    """Check if we're running in development mode (ENVIRONMENT is read on every call)."""
+    return os.environ.get("ENVIRONMENT", "").lower() in _DEVELOPMENT_ENVIRONMENTS
 
 
 def get_metrics() -> bytes:
@@ -170,10 +211,11 @@ def observe_http_request_duration(method: str, endpoint: str, duration: float):
         log.warning("Failed to record HTTP request duration", extra={"error": str(e)})
 
 
-def observe_worker_job_duration(job_type: str, duration: float):
-    """Record worker job duration."""
+def observe_worker_job_duration(job_type: str, duration: float, metrics: Optional[Metrics] = None):
+    """Record worker job duration (on ``metrics`` if given, else the process-wide collectors)."""
     try:
-        worker_job_duration_seconds.labels(job_type=job_type).observe(duration)
+        histogram = (metrics or _default_metrics).worker_job_duration_seconds
+        histogram.labels(job_type=job_type).observe(duration)
     except Exception as e:
         log.warning("Failed to record worker job duration", extra={"error": str(e)})
 
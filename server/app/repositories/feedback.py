@@ -3,6 +3,7 @@ Feedback repository for CRUD operations on feedback data.
 """
 
 import hashlib
+import logging
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
 from uuid import UUID
@@ -12,6 +13,8 @@ from sqlalchemy import text
 from .base import BaseRepository, PaginationParams, DateFilter
 from ..models import Feedback, NLPAnnotation
 
+logger = logging.getLogger(__name__)
+
 class FeedbackRepository(BaseRepository[Feedback]):
     """Repository for feedback CRUD operations."""
 
@@ -43,6 +46,25 @@ class FeedbackRepository(BaseRepository[Feedback]):
         result = self.execute_query(query, {"content_hash": content_hash}, fetch="one")
         return UUID(result["id"]) if result else None
 
+    def find_existing_hashes(self, content_hashes: List[str]) -> Dict[str, UUID]:
+        """
+        Look up many content hashes with a single query.
+
+        Args:
+            content_hashes: Content hashes to check
+
+        Returns:
+            Mapping of each already-stored hash to its feedback id
+        """
+        if not content_hashes:
+            return {}
+        query = (
+            "SELECT meta->>'content_hash' AS content_hash, id FROM feedback "
+            "WHERE meta->>'content_hash' = ANY(:content_hashes)"
+        )
+        rows = self.execute_query(query, {"content_hashes": list(set(content_hashes))}, fetch="all")
+        return {row["content_hash"]: UUID(str(row["id"])) for row in rows}
+
     def create_feedback(
         self,
         source: str,
@@ -76,17 +98,24 @@ class FeedbackRepository(BaseRepository[Feedback]):
         text: str,
         customer_id: Optional[str] = None,
         meta: Optional[Dict[str, Any]] = None,
-        created_at: Optional[datetime] = None
+        created_at: Optional[datetime] = None,
+        known_hashes: Optional[Dict[str, UUID]] = None
     ) -> Tuple[Feedback, bool]:
         """
         Create feedback with duplicate detection.
         Returns (feedback, is_duplicate)
+
+        When ``known_hashes`` (from find_existing_hashes) is given, it replaces the
+        per-row duplicate query and is updated with the newly created feedback.
         """
         # Generate content hash for duplicate detection
         content_hash = self._generate_content_hash(text, created_at.isoformat() if created_at else None)
 
         # Check for existing feedback with same hash
-        existing_id = self.check_duplicate(content_hash)
+        if known_hashes is not None:
+            existing_id = known_hashes.get(content_hash)
+        else:
+            existing_id = self.check_duplicate(content_hash)
         if existing_id:
             # Return existing feedback and mark as duplicate
             existing_feedback = self.get_feedback_by_id(existing_id)
@@ -104,6 +133,8 @@ class FeedbackRepository(BaseRepository[Feedback]):
             meta=meta,
             created_at=created_at
         )
+        if known_hashes is not None:
+            known_hashes[content_hash] = feedback.id
 
         return feedback, False
 
@@ -120,6 +151,8 @@ class FeedbackRepository(BaseRepository[Feedback]):
         duplicates = []
         errors = []
 
+        # First pass: validate rows and parse dates
+        valid_items = []
         for i, item in enumerate(feedback_items):
             try:
                 # Validate required fields
@@ -130,10 +163,6 @@ class FeedbackRepository(BaseRepository[Feedback]):
                     })
                     continue
 
-                # Parse optional fields
-                customer_id = item.get("customer_id")
-                meta = item.get("meta", {})
-
                 # Parse created_at if provided
                 created_at = None
                 if "created_at" in item and item["created_at"]:
@@ -146,13 +175,36 @@ class FeedbackRepository(BaseRepository[Feedback]):
                         })
                         continue
 
+                valid_items.append((i, item, created_at))
+
+            except Exception as e:
+                errors.append({
+                    "index": i,
+                    "error": str(e)
+                })
+
+        # Check every row against stored feedback with one query instead of one per row;
+        # if the bulk lookup fails, rows fall back to individual duplicate checks
+        known_hashes = None
+        try:
+            known_hashes = self.find_existing_hashes([
+                self._generate_content_hash(item["text"], created_at.isoformat() if created_at else None)
+                for _, item, created_at in valid_items
+            ])
+        except Exception as e:
+            logger.warning(f"Bulk duplicate lookup failed ({e}), checking rows individually")
+
+        # Second pass: create feedback
+        for i, item, created_at in valid_items:
+            try:
                 # Create feedback with duplicate check
                 feedback, is_duplicate = self.create_feedback_with_duplicate_check(
                     source=source,
                     text=item["text"],
-                    customer_id=customer_id,
-                    meta=meta,
-                    created_at=created_at
+                    customer_id=item.get("customer_id"),
+                    meta=item.get("meta", {}),
+                    created_at=created_at,
+                    known_hashes=known_hashes
                 )
 
                 if is_duplicate:
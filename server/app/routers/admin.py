@@ -9,7 +9,7 @@ from fastapi import Request
 from pydantic import BaseModel
 
 from ..services.database import get_db
-from ..services.auth_service import get_admin_user, get_viewer_user
+from ..services.auth_service import get_admin_user, get_viewer_user, get_request_context
 from ..repositories import AnalyticsRepository, TopicRepository
 from ..config import settings
 from ..logging import get_logger
@@ -359,6 +359,7 @@ async def relabel_topic(
     request: RelabelTopicRequest,
     req: Request,
     current_user: Dict[str, Any] = Depends(get_admin_user),
+    request_context: Dict[str, Any] = Depends(get_request_context),
     db: Session = Depends(get_db)
 ):
     """Relabel a topic with new label and keywords. Requires admin authentication."""
@@ -379,8 +380,8 @@ async def relabel_topic(
             new_label=request.new_label,
             new_keywords=request.new_keywords,
             changed_by=current_user.get("sub", "unknown"),
-            ip_address=current_user.get("ip_address"),
-            user_agent=current_user.get("user_agent")
+            ip_address=request_context["ip_address"],
+            user_agent=request_context["user_agent"]
         )
 
         return RelabelTopicResponse(
@@ -441,6 +442,7 @@ async def reassign_feedback(
     request: ReassignFeedbackRequest,
     req: Request,
     current_user: Dict[str, Any] = Depends(get_admin_user),
+    request_context: Dict[str, Any] = Depends(get_request_context),
     db: Session = Depends(get_db)
 ):
     """Reassign a feedback comment to a different topic. Requires admin authentication."""
@@ -455,8 +457,8 @@ async def reassign_feedback(
             new_topic_id=request.new_topic_id,
             changed_by=current_user.get("sub", "unknown"),
             reason=request.reason,
-            ip_address=current_user.get("ip_address"),
-            user_agent=current_user.get("user_agent")
+            ip_address=request_context["ip_address"],
+            user_agent=request_context["user_agent"]
         )
 
         # Refresh materialized view after reassignment
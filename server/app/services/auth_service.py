@@ -2,22 +2,28 @@
 JWT authentication service with role-based access control for admin and viewer endpoints.
 """
 
+import bcrypt
 from jose import jwt
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, Literal
 from fastapi import HTTPException, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from passlib.context import CryptContext
 
 from ..config import settings
 
 security = HTTPBearer()
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt work factor for password hashing
+BCRYPT_ROUNDS = 12
 
 UserRole = Literal["admin", "viewer"]
 
+# Roles each user role is allowed to act as (admin has access to viewer endpoints too)
+_ROLE_HIERARCHY: Dict[str, frozenset] = {
+    "admin": frozenset({"admin", "viewer"}),
+    "viewer": frozenset({"viewer"}),
+}
+
 
 class AuthService:
     """JWT authentication service with role-based access control."""
@@ -51,11 +57,17 @@ class AuthService:
 
     def hash_password(self, password: str) -> str:
         """Hash a password for storing."""
-        return pwd_context.hash(password)
+        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode("utf-8")
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify a password against its hash."""
-        return pwd_context.verify(plain_password, hashed_password)
+        if isinstance(hashed_password, str):
+            hashed_password = hashed_password.encode("utf-8")
+        try:
+            return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password)
+        except ValueError:
+            # Malformed hash
+            return False
 
     def authenticate_user(self, username: str, password: str) -> Optional[Dict[str, Any]]:
         """Authenticate a user by username and password."""
@@ -109,15 +121,13 @@ class AuthService:
         if not user_role:
             raise HTTPException(status_code=403, detail="User role not specified in token")
 
-        if user_role not in ["admin", "viewer"]:
+        granted_roles = _ROLE_HIERARCHY.get(user_role)
+        if granted_roles is None:
             raise HTTPException(status_code=403, detail="Invalid user role")
 
-        if required_role == "admin" and user_role != "admin":
-            raise HTTPException(status_code=403, detail="Admin privileges required")
-
-        # Viewer role has access to viewer endpoints, admin has access to both
-        if required_role == "viewer" and user_role not in ["admin", "viewer"]:
-            raise HTTPException(status_code=403, detail="Viewer privileges required")
+        if required_role not in granted_roles:
+            detail = "Admin privileges required" if required_role == "admin" else "Viewer privileges required"
+            raise HTTPException(status_code=403, detail=detail)
 
         return current_user
 
@@ -134,13 +144,17 @@ class AuthService:
 auth_service = AuthService()
 
 
-def get_current_user(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict[str, Any]:
-    """Dependency to get current authenticated user with request info."""
-    user = auth_service.verify_token(credentials.credentials)
-    # Add request metadata to user info
-    user["ip_address"] = request.client.host if request.client else None
-    user["user_agent"] = request.headers.get("user-agent")
-    return user
+def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict[str, Any]:
+    """Dependency to get current authenticated user."""
+    return auth_service.verify_token(credentials.credentials)
+
+
+def get_request_context(request: Request) -> Dict[str, Optional[str]]:
+    """Dependency exposing client metadata for endpoints that record audit info."""
+    return {
+        "ip_address": request.client.host if request.client else None,
+        "user_agent": request.headers.get("user-agent"),
+    }
 
 
 def get_admin_user(current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, Any]:
@@ -1,26 +1,141 @@
 import numpy as np
 import logging
+import threading
 from typing import List, Dict, Tuple, Optional, Any
-from collections import Counter
-import re
+from collections import OrderedDict
+import hashlib
 from .embedding_service import EmbeddingService
+from .keyword_extraction import KeywordExtractor, _extract_keywords_worker, _sparse_column_means
 
 logger = logging.getLogger(__name__)
 
-class ClusteringService:
+# In-memory copies of small Chroma collections, keyed by collection id and
+# shared by every ClusteringService in the process (QueryService builds one per
+# request): (document count, L2-normalized vectors, (id, text, metadata) rows)
+_similarity_mirrors: Dict[Any, Tuple[int, np.ndarray, List[Tuple[str, str, Dict[str, Any]]]]] = {}
+_similarity_mirrors_lock = threading.Lock()
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    from joblib import Parallel, delayed
+    JOBLIB_AVAILABLE = True
+except ImportError:
+    JOBLIB_AVAILABLE = False
+
+
+def _similarity_threshold_labels_numpy(embeddings: np.ndarray, threshold: float) -> np.ndarray:
+    """
+    Greedy threshold clustering over L2-normalized embeddings.
+
+    Each row joins the first existing cluster whose centroid has cosine
+    similarity above ``threshold``, otherwise it starts a new cluster.
+    Centroids are tracked as running sums (cosine is scale invariant) and
+    their norms are cached, so only the updated cluster is re-normed per row.
+    """
+    n, dim = embeddings.shape
+    labels = np.empty(n, dtype=np.int32)
+    sums = np.zeros((n, dim), dtype=embeddings.dtype)
+    norms = np.ones(n, dtype=embeddings.dtype)
+    n_clusters = 0
+
+    for i in range(n):
+        row = embeddings[i]
+        label = -1
+        if n_clusters:
+            similarities = (sums[:n_clusters] @ row) / norms[:n_clusters]
+            matches = np.flatnonzero(similarities > threshold)
+            if matches.size:
+                label = int(matches[0])
+        if label == -1:
+            label = n_clusters
+            n_clusters += 1
+        sums[label] += row
+        norm = np.linalg.norm(sums[label])
+        norms[label] = norm if norm > 0 else 1.0
+        labels[i] = label
+
+    return labels
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _similarity_threshold_labels_jit(embeddings, threshold):
+        n, dim = embeddings.shape
+        labels = np.empty(n, dtype=np.int32)
+        sums = np.zeros((n, dim), dtype=embeddings.dtype)
+        norms = np.zeros(n, dtype=np.float64)
+        n_clusters = 0
+
+        for i in range(n):
+            label = -1
+            for k in range(n_clusters):
+                dot = 0.0
+                for d in range(dim):
+                    dot += sums[k, d] * embeddings[i, d]
+                if norms[k] > 0.0 and dot / norms[k] > threshold:
+                    label = k
+                    break
+            if label == -1:
+                label = n_clusters
+                n_clusters += 1
+            sq_norm = 0.0
+            for d in range(dim):
+                sums[label, d] += embeddings[i, d]
+                sq_norm += sums[label, d] * sums[label, d]
+            norms[label] = np.sqrt(sq_norm)
+            labels[i] = label
+
+        return labels
+
+    _similarity_threshold_labels = _similarity_threshold_labels_jit
+else:
+    _similarity_threshold_labels = _similarity_threshold_labels_numpy
+
+
+class ClusteringService(KeywordExtractor):
     """Advanced clustering service using HDBSCAN with UMAP and keyword extraction."""
 
+    # Exact (Elkan) k-means below this size, mini-batch k-means above it
+    KMEANS_MINIBATCH_MIN_SIZE = 1024
+    # k-means++ restarts for reduced (non-spherical) inputs
+    KMEANS_N_INIT = 10
+
+    # fast_hdbscan's parallel MST is only a win on low-dimensional (UMAP-reduced) input
+    FAST_HDBSCAN_MAX_DIMS = 20
+
+    # Keyword cache keyed by cluster centroid; small clusters are cheap to recompute
+    KEYWORD_CACHE_SIZE = 1024
+    KEYWORD_CACHE_MIN_CLUSTER_SIZE = 5
+
+    # Below this many clusters, worker process start-up outweighs the parallel speedup
+    KEYWORD_PARALLEL_MIN_CLUSTERS = 8
+
+    # Chroma collections up to this size are mirrored in memory and searched
+    # in-process instead of querying the vector store
+    SIMILARITY_INDEX_MAX_ROWS = 50000
+
+    # UMAP's spectral init dominates runtime on small inputs; random init is enough
+    # for HDBSCAN's density estimate. Large inputs need fewer epochs to converge.
+    UMAP_SPECTRAL_INIT_MIN_SIZE = 2000
+    UMAP_REDUCED_EPOCHS_MIN_SIZE = 10000
+
     def __init__(self):
         self.embedding_service = EmbeddingService()
+        self._keyword_cache: "OrderedDict[bytes, List[str]]" = OrderedDict()
+        self._last_batch_hash: Optional[str] = None
         self._initialize_clustering_libs()
 
     def _initialize_clustering_libs(self):
         """Initialize clustering libraries with graceful fallbacks."""
         self.hdbscan_available = False
+        self.fast_hdbscan_available = False
         self.umap_available = False
         self.sklearn_available = False
-        self.yake_available = False
-        self.nltk_available = False
 
         # Try to import HDBSCAN
         try:
@@ -32,6 +147,16 @@ class ClusteringService:
             logger.warning("HDBSCAN not available, will use k-means fallback")
             self.hdbscan = None
 
+        # Try to import fast_hdbscan (Numba-parallel, thread count via NUMBA_NUM_THREADS)
+        try:
+            import fast_hdbscan
+            self.fast_hdbscan = fast_hdbscan
+            self.fast_hdbscan_available = True
+            logger.info("fast_hdbscan initialized successfully")
+        except ImportError:
+            logger.info("fast_hdbscan not available, using reference HDBSCAN")
+            self.fast_hdbscan = None
+
         # Try to import UMAP
         try:
             import umap
@@ -44,11 +169,12 @@ class ClusteringService:
 
         # Try to import sklearn
         try:
-            from sklearn.cluster import KMeans
+            from sklearn.cluster import KMeans, MiniBatchKMeans
             from sklearn.feature_extraction.text import TfidfVectorizer
             from sklearn.metrics.pairwise import cosine_similarity
             self.sklearn = {
                 'KMeans': KMeans,
+                'MiniBatchKMeans': MiniBatchKMeans,
                 'TfidfVectorizer': TfidfVectorizer,
                 'cosine_similarity': cosine_similarity
             }
@@ -58,41 +184,8 @@ class ClusteringService:
             logger.warning("Scikit-learn not available, clustering will be limited")
             self.sklearn = None
 
-        # Try to import YAKE
-        try:
-            import yake
-            self.yake = yake
-            self.yake_available = True
-            logger.info("YAKE initialized successfully")
-        except ImportError:
-            logger.warning("YAKE not available, will use n-gram fallback")
-            self.yake = None
-
-        # Try to import NLTK
-        try:
-            import nltk
-            from nltk.corpus import stopwords
-            from nltk.tokenize import word_tokenize, sent_tokenize
-            # Download required NLTK data if not present
-            try:
-                stopwords.words('english')
-            except LookupError:
-                nltk.download('stopwords', quiet=True)
-            try:
-                word_tokenize('test')
-            except LookupError:
-                nltk.download('punkt', quiet=True)
-
-            self.nltk = {
-                'stopwords': stopwords,
-                'word_tokenize': word_tokenize,
-                'sent_tokenize': sent_tokenize
-            }
-            self.nltk_available = True
-            logger.info("NLTK initialized successfully")
-        except ImportError:
-            logger.warning("NLTK not available, keyword extraction will be limited")
-            self.nltk = None
+        # YAKE and NLTK for keyword extraction
+        self._initialize_keyword_libs()
 
     def generate_embeddings(self, texts: List[str]) -> np.ndarray:
         """Generate embeddings for a list of texts"""
@@ -128,14 +221,13 @@ class ClusteringService:
         if embeddings is None or len(embeddings) == 0:
             return {"cluster_0": list(range(len(texts)))}, np.array([]), None
 
-        # Store in Chroma for later retrieval
-        ids = [f"cluster_doc_{i}" for i in range(len(texts))]
-        self.embedding_service.store_embeddings_chroma(
-            embeddings=embeddings,
-            texts=texts,
-            ids=ids,
-            metadata=[{"source": "clustering"} for _ in texts]
-        )
+        # float32 halves the memory traffic of UMAP/HDBSCAN/k-means over float64
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+
+        # Store in Chroma for later retrieval; an identical batch skips the store entirely
+        batch_hash = hashlib.blake2b(embeddings.tobytes(), digest_size=8).hexdigest()
+        if batch_hash != self._last_batch_hash and self._store_new_documents(embeddings, texts):
+            self._last_batch_hash = batch_hash
 
         # Apply dimensionality reduction if requested and available
         reduced_embeddings = None
@@ -144,13 +236,17 @@ class ClusteringService:
         if use_umap and self.umap_available and len(embeddings) > umap_dims:
             try:
                 logger.info(f"Applying UMAP dimensionality reduction to {umap_dims} dimensions")
+                n_samples = len(embeddings)
                 umap_reducer = self.umap.UMAP(
                     n_components=umap_dims,
-                    n_neighbors=min(15, len(embeddings) - 1),
+                    n_neighbors=min(15, n_samples - 1),
                     min_dist=0.1,
+                    init='random' if n_samples < self.UMAP_SPECTRAL_INIT_MIN_SIZE else 'spectral',
+                    n_epochs=200 if n_samples > self.UMAP_REDUCED_EPOCHS_MIN_SIZE else 500,
+                    low_memory=True,
                     random_state=42
                 )
-                reduced_embeddings = umap_reducer.fit_transform(embeddings)
+                reduced_embeddings = umap_reducer.fit_transform(embeddings).astype(np.float32, copy=False)
                 clustering_embeddings = reduced_embeddings
                 logger.info(f"UMAP reduction completed: {embeddings.shape} -> {reduced_embeddings.shape}")
             except Exception as e:
@@ -158,22 +254,71 @@ class ClusteringService:
                 reduced_embeddings = None
                 clustering_embeddings = embeddings
 
-        # Choose clustering algorithm based on dataset size and availability
+        # Choose clustering algorithm based on dataset size and availability.
+        # UMAP's high-dimensional kNN graph is the only full-dimension neighbour
+        # search; HDBSCAN works on the reduced space, so there is nothing to share.
         if len(texts) < 500 and self.sklearn_available:
             # Use k-means for small datasets
-            clusters = self._cluster_kmeans(clustering_embeddings, n_clusters)
-        elif self.hdbscan_available:
+            clusters = self._cluster_kmeans(
+                clustering_embeddings, n_clusters, spherical=reduced_embeddings is None
+            )
+        elif self.hdbscan_available or self.fast_hdbscan_available:
             # Use HDBSCAN for larger datasets
             clusters = self._cluster_hdbscan(clustering_embeddings)
         elif self.sklearn_available:
             # Fallback to k-means
-            clusters = self._cluster_kmeans(clustering_embeddings, n_clusters)
+            clusters = self._cluster_kmeans(
+                clustering_embeddings, n_clusters, spherical=reduced_embeddings is None
+            )
         else:
             # Ultimate fallback: simple similarity-based clustering
             clusters = self._cluster_similarity_threshold(embeddings)
 
         return clusters, embeddings, reduced_embeddings
 
+    @staticmethod
+    def _document_id(text: str) -> str:
+        """Content-addressed vector store id for a clustered text."""
+        return f"cluster_doc_{hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()}"
+
+    def _store_new_documents(self, embeddings: np.ndarray, texts: List[str]) -> bool:
+        """
+        Store the batch's texts that the vector store does not hold yet.
+
+        Ids come from each text, so repeated texts (within the batch or across
+        overlapping batches) map to one document and are only added once.
+
+        Args:
+            embeddings: Embeddings of the batch
+            texts: Texts of the batch
+
+        Returns:
+            True if the vector store holds every text of the batch afterwards
+        """
+        first_rows: Dict[str, int] = {}
+        for i, text in enumerate(texts):
+            first_rows.setdefault(self._document_id(text), i)
+
+        existing = self.embedding_service.existing_ids(list(first_rows))
+        if existing is None:
+            return False
+
+        new_docs = [(doc_id, i) for doc_id, i in first_rows.items() if doc_id not in existing]
+        if not new_docs:
+            return True
+
+        ids = [doc_id for doc_id, _ in new_docs]
+        rows = [i for _, i in new_docs]
+        new_embeddings = embeddings[rows]
+        new_texts = [texts[i] for i in rows]
+
+        return self.embedding_service.store_embeddings(
+            embeddings=new_embeddings,
+            texts=new_texts,
+            ids=ids,
+            metadata=[{"source": "clustering"} for _ in new_texts]
+        )
+
     def _cluster_hdbscan(self, embeddings: np.ndarray) -> Dict[str, List[int]]:
         """Cluster using HDBSCAN."""
         try:
@@ -183,33 +328,40 @@ class ClusteringService:
             min_cluster_size = max(2, int(len(embeddings) * 0.02))  # 2% of dataset or minimum 2
             min_samples = max(1, min_cluster_size // 2)
 
-            clusterer = self.hdbscan.HDBSCAN(
-                min_cluster_size=min_cluster_size,
-                min_samples=min_samples,
-                cluster_selection_epsilon=0.1,
-                metric='euclidean'
-            )
-
-            cluster_labels = clusterer.fit_predict(embeddings)
+            if self.fast_hdbscan_available and (
+                embeddings.shape[1] <= self.FAST_HDBSCAN_MAX_DIMS or not self.hdbscan_available
+            ):
+                # Euclidean-only, multicore MST + condensing
+                clusterer = self.fast_hdbscan.HDBSCAN(
+                    min_cluster_size=min_cluster_size,
+                    min_samples=min_samples,
+                    cluster_selection_epsilon=0.1
+                )
+            else:
+                clusterer = self.hdbscan.HDBSCAN(
+                    min_cluster_size=min_cluster_size,
+                    min_samples=min_samples,
+                    cluster_selection_epsilon=0.1,
+                    metric='euclidean'
+                )
 
-            # Group by cluster labels (-1 indicates noise)
-            clusters = {}
-            for i, label in enumerate(cluster_labels):
-                if label == -1:
-                    # Assign noise points to their own clusters
-                    cluster_name = f"noise_{i}"
-                else:
-                    cluster_name = f"cluster_{label}"
+            cluster_labels = np.asarray(clusterer.fit_predict(embeddings))
 
-                if cluster_name not in clusters:
-                    clusters[cluster_name] = []
-                clusters[cluster_name].append(i)
+            # Group by cluster labels (-1 indicates noise) with one stable sort
+            order = np.argsort(cluster_labels, kind='stable')
+            sorted_labels = cluster_labels[order]
+            unique_labels, starts = np.unique(sorted_labels, return_index=True)
+            ends = np.append(starts[1:], len(sorted_labels))
 
-            # Remove clusters with only one item (except noise clusters)
+            # Noise points get their own clusters; single-item clusters are dropped
             filtered_clusters = {}
-            for cluster_name, indices in clusters.items():
-                if len(indices) > 1 or cluster_name.startswith("noise_"):
-                    filtered_clusters[cluster_name] = indices
+            for label, start, end in zip(unique_labels.tolist(), starts.tolist(), ends.tolist()):
+                indices = order[start:end].tolist()
+                if label == -1:
+                    for i in indices:
+                        filtered_clusters[f"noise_{i}"] = [i]
+                elif len(indices) > 1:
+                    filtered_clusters[f"cluster_{label}"] = indices
 
             logger.info(f"HDBSCAN found {len(filtered_clusters)} clusters for {len(embeddings)} texts")
             return filtered_clusters
@@ -218,8 +370,22 @@ class ClusteringService:
             logger.error(f"HDBSCAN clustering failed: {e}")
             return self._cluster_similarity_threshold(embeddings)
 
-    def _cluster_kmeans(self, embeddings: np.ndarray, n_clusters: Optional[int] = None) -> Dict[str, List[int]]:
-        """Cluster using k-means."""
+    def _cluster_kmeans(
+        self,
+        embeddings: np.ndarray,
+        n_clusters: Optional[int] = None,
+        spherical: bool = False
+    ) -> Dict[str, List[int]]:
+        """
+        Cluster using k-means.
+
+        Args:
+            embeddings: Points to cluster
+            n_clusters: Number of clusters (estimated from the input size if None)
+            spherical: Whether the input is raw sentence embeddings, which are
+                compared by direction; reduced (UMAP) coordinates keep their
+                radial separation and are clustered as-is
+        """
         try:
             if n_clusters is None:
                 # Estimate number of clusters based on dataset size
@@ -227,21 +393,46 @@ class ClusteringService:
 
             logger.info(f"Clustering with k-means ({n_clusters} clusters)")
 
-            kmeans = self.sklearn['KMeans'](
-                n_clusters=n_clusters,
-                random_state=42,
-                n_init=10
-            )
+            if spherical:
+                # On the unit sphere k-means behaves like spherical k-means, where a
+                # single k-means++ seeding is within noise of best-of-n restarts
+                norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+                norms[norms == 0] = 1.0
+                points = embeddings / norms
+                n_init = 1
+            else:
+                points = embeddings
+                n_init = self.KMEANS_N_INIT
+
+            if len(points) < self.KMEANS_MINIBATCH_MIN_SIZE:
+                # Elkan's triangle-inequality pruning makes exact k-means cheap here
+                kmeans = self.sklearn['KMeans'](
+                    n_clusters=n_clusters,
+                    init='k-means++',
+                    n_init=n_init,
+                    algorithm='elkan',
+                    max_iter=100,
+                    random_state=42
+                )
+            else:
+                # Mini-batch updates converge in far fewer FLOPs than full Lloyd
+                # iterations on large inputs
+                kmeans = self.sklearn['MiniBatchKMeans'](
+                    n_clusters=n_clusters,
+                    init='k-means++',
+                    n_init=n_init,
+                    batch_size=256,
+                    max_iter=100,
+                    random_state=42
+                )
 
-            cluster_labels = kmeans.fit_predict(embeddings)
+            cluster_labels = np.asarray(kmeans.fit_predict(points))
 
             # Group by cluster labels
-            clusters = {}
-            for i, label in enumerate(cluster_labels):
-                cluster_name = f"cluster_{label}"
-                if cluster_name not in clusters:
-                    clusters[cluster_name] = []
-                clusters[cluster_name].append(i)
+            clusters = {
+                f"cluster_{label}": np.flatnonzero(cluster_labels == label).tolist()
+                for label in np.unique(cluster_labels)
+            }
 
             logger.info(f"k-means found {len(clusters)} clusters for {len(embeddings)} texts")
             return clusters
@@ -254,24 +445,19 @@ class ClusteringService:
         """Simple similarity-based clustering as ultimate fallback."""
         logger.info("Using similarity threshold clustering (fallback)")
 
+        if len(embeddings) == 0:
+            return {}
+
+        # Normalize once so cluster similarity reduces to a dot product
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        normalized = np.ascontiguousarray(embeddings / norms, dtype=np.float32)
+
+        labels = _similarity_threshold_labels(normalized, threshold)
+
         clusters = {}
-        cluster_id = 0
-
-        for i, embedding in enumerate(embeddings):
-            assigned = False
-            for cluster_name, indices in clusters.items():
-                # Check similarity with cluster centroid
-                if indices:
-                    centroid = np.mean(embeddings[indices], axis=0)
-                    similarity = np.dot(embedding, centroid) / (np.linalg.norm(embedding) * np.linalg.norm(centroid))
-                    if similarity > threshold:
-                        clusters[cluster_name].append(i)
-                        assigned = True
-                        break
-
-            if not assigned:
-                clusters[f"cluster_{cluster_id}"] = [i]
-                cluster_id += 1
+        for i, label in enumerate(labels.tolist()):
+            clusters.setdefault(f"cluster_{label}", []).append(i)
 
         # Remove clusters with only one item
         filtered_clusters = {k: v for k, v in clusters.items() if len(v) > 1}
@@ -279,163 +465,103 @@ class ClusteringService:
         logger.info(f"Similarity clustering found {len(filtered_clusters)} clusters for {len(embeddings)} texts")
         return filtered_clusters
 
-    def extract_keywords(self, texts: List[str], max_keywords: int = 10) -> List[str]:
-        """
-        Extract keywords from a collection of texts using YAKE or n-gram fallback.
-
-        Args:
-            texts: List of texts to extract keywords from
-            max_keywords: Maximum number of keywords to return
-
-        Returns:
-            List of keywords sorted by relevance
-        """
-        if not texts:
+    def get_similar_texts(self, query: str, n_results: int = 5) -> List[Dict]:
+        """Find similar texts to a query"""
+        # Generate query embedding
+        query_embeddings = self.embedding_service.generate_embeddings([query])
+        if query_embeddings is None:
             return []
 
-        combined_text = " ".join(texts)
-
-        if self.yake_available:
-            return self._extract_keywords_yake(combined_text, max_keywords)
-        elif self.nltk_available and self.sklearn_available:
-            return self._extract_keywords_ngrams(combined_text, max_keywords)
-        else:
-            return self._extract_keywords_simple(combined_text, max_keywords)
-
-    def _extract_keywords_yake(self, text: str, max_keywords: int) -> List[str]:
-        """Extract keywords using YAKE."""
-        try:
-            # Configure YAKE keyword extractor
-            kw_extractor = self.yake.KeywordExtractor(
-                lan="en",
-                n=2,  # n-gram size (1 for unigrams, 2 for bigrams, etc.)
-                dedupLim=0.9,  # deduplication threshold
-                windowsSize=2,  # context window size
-                top=max_keywords * 2  # Extract more candidates
-            )
-
-            # Extract keywords
-            keywords = kw_extractor.extract_keywords(text)
-
-            # Return just the keyword strings (YAKE returns tuples of (keyword, score))
-            result = [kw[0] for kw in keywords[:max_keywords]]
-
-            logger.debug(f"YAKE extracted {len(result)} keywords")
-            return result
-
-        except Exception as e:
-            logger.warning(f"YAKE keyword extraction failed: {e}")
-            return self._extract_keywords_ngrams(text, max_keywords)
-
-    def _extract_keywords_ngrams(self, text: str, max_keywords: int) -> List[str]:
-        """Extract keywords using TF-IDF and n-grams."""
-        try:
-            # Preprocess text
-            text = self._preprocess_text(text)
-
-            # Create TF-IDF vectorizer for n-grams
-            vectorizer = self.sklearn['TfidfVectorizer'](
-                ngram_range=(1, 3),  # unigrams, bigrams, trigrams
-                max_features=1000,
-                stop_words='english',
-                min_df=1
-            )
-
-            # Fit and transform (single document)
-            tfidf_matrix = vectorizer.fit_transform([text])
-
-            # Get feature names and scores
-            feature_names = vectorizer.get_feature_names_out()
-            scores = tfidf_matrix.toarray()[0]
-
-            # Sort by TF-IDF score and filter
-            keyword_candidates = [
-                (feature_names[i], scores[i])
-                for i in range(len(feature_names))
-                if scores[i] > 0
-            ]
-            keyword_candidates.sort(key=lambda x: x[1], reverse=True)
+        query_embedding = query_embeddings[0]
 
-            # Extract keywords, preferring longer n-grams
-            keywords = []
-            seen_words = set()
+        # Small collections are faster to scan in-process than to query through Chroma
+        mirror = self._similarity_mirror()
+        if mirror is not None:
+            return self._search_similarity_mirror(mirror, query_embedding, n_results)
 
-            for keyword, score in keyword_candidates:
-                # Avoid duplicates and very short keywords
-                words = keyword.split()
-                if len(words) >= 1 and not any(word in seen_words for word in words):
-                    keywords.append(keyword)
-                    seen_words.update(words)
+        # Search using embedding service
+        results = self.embedding_service.search_similar(query_embedding, n_results=n_results)
 
-                if len(keywords) >= max_keywords:
-                    break
+        return results
 
-            logger.debug(f"n-gram TF-IDF extracted {len(keywords)} keywords")
-            return keywords[:max_keywords]
+    def _similarity_mirror(self) -> Optional[Tuple[np.ndarray, List[Tuple[str, str, Dict[str, Any]]]]]:
+        """
+        Return the process-wide in-memory copy of the Chroma collection, or None.
 
-        except Exception as e:
-            logger.warning(f"n-gram keyword extraction failed: {e}")
-            return self._extract_keywords_simple(text, max_keywords)
+        The copy is loaded with a single collection.get() while the collection
+        holds at most SIMILARITY_INDEX_MAX_ROWS documents, and reloaded whenever
+        its count differs from the copy's. Documents are only ever added to the
+        collection, so a changed count is how writes from this process or
+        another one sharing the store (e.g. the worker) show up.
+        """
+        if self.embedding_service.vector_store is not None:
+            return None  # The FAISS backend already searches in-process
+        collection = self.embedding_service.chroma_collection
+        if collection is None:
+            return None
 
-    def _extract_keywords_simple(self, text: str, max_keywords: int) -> List[str]:
-        """Simple keyword extraction using frequency analysis."""
         try:
-            # Preprocess text
-            text = self._preprocess_text(text)
-
-            # Simple tokenization and counting
-            words = re.findall(r'\b\w+\b', text.lower())
-            word_counts = Counter(words)
-
-            # Remove stopwords if available
-            if self.nltk_available:
-                stop_words = set(self.nltk['stopwords'].words('english'))
-                word_counts = Counter({
-                    word: count for word, count in word_counts.items()
-                    if word not in stop_words and len(word) > 2
-                })
-
-            # Get most common words
-            keywords = [word for word, _ in word_counts.most_common(max_keywords)]
-
-            logger.debug(f"Simple frequency extracted {len(keywords)} keywords")
-            return keywords
+            count = collection.count()
+        except Exception:
+            return None
 
-        except Exception as e:
-            logger.error(f"Simple keyword extraction failed: {e}")
-            return []
-
-    def _preprocess_text(self, text: str) -> str:
-        """Preprocess text for keyword extraction."""
-        if not text:
-            return ""
-
-        # Convert to lowercase
-        text = text.lower()
-
-        # Remove URLs, emails, mentions (reuse from text processing)
-        text = re.sub(r'https?://\S+', '', text)
-        text = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', '', text)
-        text = re.sub(r'@\w+', '', text)
+        with _similarity_mirrors_lock:
+            mirror = _similarity_mirrors.get(collection.id)
+            if mirror is not None and mirror[0] == count:
+                return mirror[1], mirror[2]
 
-        # Remove punctuation and extra whitespace
-        text = re.sub(r'[^\w\s]', ' ', text)
-        text = re.sub(r'\s+', ' ', text)
+            _similarity_mirrors.pop(collection.id, None)
+            if count == 0 or count > self.SIMILARITY_INDEX_MAX_ROWS:
+                return None
 
-        return text.strip()
-
-    def get_similar_texts(self, query: str, n_results: int = 5) -> List[Dict]:
-        """Find similar texts to a query"""
-        # Generate query embedding
-        query_embeddings = self.embedding_service.generate_embeddings([query])
-        if query_embeddings is None:
+            try:
+                result = collection.get(include=["embeddings", "documents", "metadatas"])
+            except Exception as e:
+                logger.warning(f"Failed to load the Chroma collection into memory: {e}")
+                return None
+
+            vectors = np.asarray(result["embeddings"], dtype=np.float32).reshape(len(result["ids"]), -1)
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            vectors = np.ascontiguousarray(vectors / norms)
+            docs = list(zip(result["ids"], result["documents"], result["metadatas"]))
+
+            # Keyed by what was loaded; a write that landed after count() makes
+            # the next lookup reload
+            _similarity_mirrors[collection.id] = (len(docs), vectors, docs)
+            logger.debug(f"Loaded {len(docs)} Chroma documents into the in-memory similarity index")
+            return vectors, docs
+
+    def _search_similarity_mirror(
+        self,
+        mirror: Tuple[np.ndarray, List[Tuple[str, str, Dict[str, Any]]]],
+        query_embedding: np.ndarray,
+        n_results: int
+    ) -> List[Dict]:
+        """Top-k cosine search over an in-memory collection copy, shaped like search_similar results."""
+        vectors, docs = mirror
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query_norm = np.linalg.norm(query)
+        if query_norm > 0:
+            query = query / query_norm
+
+        scores = vectors @ query
+        k = min(n_results, len(scores))
+        if k <= 0:
             return []
-
-        query_embedding = query_embeddings[0]
-
-        # Search using embedding service
-        results = self.embedding_service.search_similar(query_embedding, n_results=n_results)
-
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+
+        results = []
+        for idx in top.tolist():
+            doc_id, text, metadata = docs[idx]
+            results.append({
+                "id": doc_id,
+                "text": text,
+                # Squared L2 between unit vectors, matching Chroma's default space
+                "distance": float(2.0 - 2.0 * scores[idx]),
+                "metadata": metadata
+            })
         return results
 
     def cluster_texts_with_keywords(
@@ -461,13 +587,26 @@ class ClusteringService:
             texts, n_clusters, use_umap
         )
 
-        # Extract keywords for each cluster
+        cluster_texts_by_name = {
+            cluster_name: [texts[i] for i in indices]
+            for cluster_name, indices in clusters.items()
+        }
+
+        keywords_by_name = None
+        if not self.yake_available and self.nltk_available and self.sklearn_available:
+            # Same TF-IDF method extract_keywords would pick, with the vocabulary fitted once
+            keywords_by_name = self._extract_keywords_shared_tfidf(
+                texts, clusters, cluster_texts_by_name, max_keywords_per_cluster
+            )
+        if keywords_by_name is None:
+            keywords_by_name = self._extract_keywords_per_cluster(
+                clusters, cluster_texts_by_name, embeddings, max_keywords_per_cluster
+            )
+
         cluster_info = {}
         for cluster_name, indices in clusters.items():
-            cluster_texts = [texts[i] for i in indices]
-
-            # Extract keywords for this cluster
-            keywords = self.extract_keywords(cluster_texts, max_keywords_per_cluster)
+            cluster_texts = cluster_texts_by_name[cluster_name]
+            keywords = keywords_by_name[cluster_name]
 
             # Generate cluster label from top keywords
             cluster_label = self._generate_cluster_label(keywords, cluster_texts)
@@ -482,6 +621,109 @@ class ClusteringService:
 
         return cluster_info
 
+    def _extract_keywords_per_cluster(
+        self,
+        clusters: Dict[str, List[int]],
+        cluster_texts_by_name: Dict[str, List[str]],
+        embeddings: np.ndarray,
+        max_keywords: int
+    ) -> Dict[str, List[str]]:
+        """Extract keywords cluster by cluster, using the centroid cache and worker processes."""
+        # Reuse cached results where possible
+        keywords_by_name = {}
+        cache_keys = {}
+        for cluster_name, indices in clusters.items():
+            cluster_embeddings = embeddings[indices] if embeddings.ndim == 2 and len(embeddings) else None
+            cache_key = self._keyword_cache_key(cluster_embeddings, max_keywords)
+            cached = self._get_cached_keywords(cache_key)
+            if cached is not None:
+                keywords_by_name[cluster_name] = cached
+            else:
+                cache_keys[cluster_name] = cache_key
+
+        pending = list(cache_keys)
+        if JOBLIB_AVAILABLE and len(pending) >= self.KEYWORD_PARALLEL_MIN_CLUSTERS:
+            # YAKE and TF-IDF analysis are GIL-bound Python, so use worker processes
+            extracted = Parallel(n_jobs=-1, backend="loky")(
+                delayed(_extract_keywords_worker)(cluster_texts_by_name[name], max_keywords)
+                for name in pending
+            )
+        else:
+            extracted = [
+                self.extract_keywords(cluster_texts_by_name[name], max_keywords)
+                for name in pending
+            ]
+
+        for cluster_name, keywords in zip(pending, extracted):
+            keywords_by_name[cluster_name] = keywords
+            self._cache_keywords(cache_keys[cluster_name], keywords)
+
+        return keywords_by_name
+
+    def _extract_keywords_shared_tfidf(
+        self,
+        texts: List[str],
+        clusters: Dict[str, List[int]],
+        cluster_texts_by_name: Dict[str, List[str]],
+        max_keywords: int
+    ) -> Optional[Dict[str, List[str]]]:
+        """
+        Score n-grams for every cluster from one TF-IDF matrix fitted on all texts.
+
+        Returns None if the shared vocabulary cannot be built (e.g. too few texts),
+        so the caller can fall back to per-cluster extraction.
+        """
+        try:
+            vectorizer = self.sklearn['TfidfVectorizer'](
+                ngram_range=(1, 3),
+                max_features=5000,
+                stop_words='english',
+                min_df=2
+            )
+            doc_term = vectorizer.fit_transform([self._preprocess_text(t) for t in texts])
+        except ValueError as e:
+            logger.debug(f"Shared TF-IDF vocabulary unavailable: {e}")
+            return None
+
+        feature_names = vectorizer.get_feature_names_out()
+        keywords_by_name = {}
+        for cluster_name, indices in clusters.items():
+            columns, cluster_scores = _sparse_column_means(doc_term[indices])
+            keywords = self._select_keywords(feature_names, columns, cluster_scores, max_keywords)
+            if not keywords:
+                # Cluster only has corpus-rare terms; score it on its own
+                keywords = self.extract_keywords(cluster_texts_by_name[cluster_name], max_keywords)
+            keywords_by_name[cluster_name] = keywords
+
+        return keywords_by_name
+
+    def _keyword_cache_key(self, cluster_embeddings: Optional[np.ndarray], max_keywords: int) -> Optional[bytes]:
+        """Hash a cluster centroid into a keyword cache key (None if not worth caching)."""
+        if cluster_embeddings is None or len(cluster_embeddings) < self.KEYWORD_CACHE_MIN_CLUSTER_SIZE:
+            return None
+
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(np.ascontiguousarray(cluster_embeddings.mean(axis=0), dtype=np.float32).tobytes())
+        digest.update(max_keywords.to_bytes(4, "little"))
+        return digest.digest()
+
+    def _get_cached_keywords(self, cache_key: Optional[bytes]) -> Optional[List[str]]:
+        """Look up cached keywords, refreshing their LRU position."""
+        if cache_key is None:
+            return None
+        keywords = self._keyword_cache.get(cache_key)
+        if keywords is not None:
+            self._keyword_cache.move_to_end(cache_key)
+        return keywords
+
+    def _cache_keywords(self, cache_key: Optional[bytes], keywords: List[str]) -> None:
+        """Store keywords in the LRU cache, evicting the oldest entry when full."""
+        if cache_key is None:
+            return
+        self._keyword_cache[cache_key] = keywords
+        if len(self._keyword_cache) > self.KEYWORD_CACHE_SIZE:
+            self._keyword_cache.popitem(last=False)
+
     def _generate_cluster_label(self, keywords: List[str], texts: List[str]) -> str:
         """Generate a human-readable label for a cluster."""
         if not keywords:
@@ -4,11 +4,21 @@ from sqlalchemy.orm import sessionmaker, Session
 from app.models import Base
 from app.config import settings
 
+# psycopg2 batches executemany() INSERTs into multi-row VALUES statements
+_dialect_kwargs = (
+    {"executemany_mode": "values_plus_batch"}
+    if settings.database.url.startswith("postgresql")
+    else {}
+)
+
 engine = create_engine(
     settings.database.url,
     pool_size=settings.database.pool_size,
     max_overflow=settings.database.max_overflow,
-    pool_pre_ping=settings.database.pool_pre_ping
+    pool_pre_ping=settings.database.pool_pre_ping,
+    pool_recycle=settings.database.pool_recycle,
+    query_cache_size=settings.database.query_cache_size,
+    **_dialect_kwargs
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
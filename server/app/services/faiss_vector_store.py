@@ -0,0 +1,339 @@
+"""
+FAISS-backed vector store for large embedding collections.
+Keeps vectors in an HNSW index and documents/metadata in a SQLite sidecar.
+
+The sidecar is the source of truth (it also stores each normalized vector).
+Its rows are inserted under a cross-process file lock, so their autoincrement
+ids grow in commit order and each index covers a prefix of them. A process
+catches up with rows other processes (API server and RQ work-horses) added by
+reading only the ids above its watermark. The index file is a snapshot for
+fast start-up, written at job boundaries and on shutdown (see
+save_faiss_stores), never per add.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+    logger.warning("faiss not available, FAISS vector backend disabled")
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, run a single writer process
+    fcntl = None
+
+
+class FaissVectorStore:
+    """HNSW inner-product index over L2-normalized embeddings with a SQLite sidecar."""
+
+    HNSW_M = 32  # Graph neighbours per node
+    HNSW_EF_SEARCH = 64  # Candidate list size at query time
+    # Keep index vectors as 8-bit scalar-quantized codes (a quarter of the
+    # float32 memory); the sidecar keeps the float vectors either way
+    SCALAR_QUANTIZE = os.getenv("FAISS_SCALAR_QUANTIZE", "false").lower() == "true"
+
+    def __init__(self, dimension: int, path: str):
+        """
+        Open (or create) the index and sidecar stored under ``path``.
+
+        Args:
+            dimension: Embedding dimension
+            path: Directory holding ``index.faiss`` and ``documents.sqlite``
+        """
+        if not FAISS_AVAILABLE:
+            raise RuntimeError("faiss is not installed")
+
+        self.dimension = dimension
+        self.path = path
+        self.index_path = os.path.join(path, "index.faiss")
+        self._lock = threading.Lock()
+        # Highest sidecar int_id in the index; the index holds every row up to it
+        self._max_indexed_id = 0
+        self._unsaved = 0  # Vectors added since the index file was last written
+
+        os.makedirs(path, exist_ok=True)
+        self._lock_file = open(os.path.join(path, "index.lock"), "a")
+
+        self.db = sqlite3.connect(os.path.join(path, "documents.sqlite"), check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            "int_id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "doc_id TEXT UNIQUE NOT NULL, "
+            "text TEXT, "
+            "metadata TEXT, "
+            "embedding BLOB)"
+        )
+        columns = {row[1] for row in self.db.execute("PRAGMA table_info(documents)")}
+        if "embedding" not in columns:
+            # Sidecars created before vectors were stored alongside the documents
+            self.db.execute("ALTER TABLE documents ADD COLUMN embedding BLOB")
+        self.db.commit()
+
+        with self._lock, self._writer_lock():
+            self._load_index()
+
+        logger.info(f"FAISS vector store opened at {path} with {self.index.ntotal} vectors")
+
+    @contextmanager
+    def _writer_lock(self):
+        """Hold the store's exclusive cross-process file lock."""
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _new_index(self):
+        """Create an empty ID-mapped HNSW index."""
+        if not self.SCALAR_QUANTIZE:
+            hnsw = faiss.IndexHNSWFlat(self.dimension, self.HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            return faiss.IndexIDMap2(hnsw)
+
+        hnsw = faiss.IndexHNSWSQ(
+            self.dimension, faiss.ScalarQuantizer.QT_8bit, self.HNSW_M, faiss.METRIC_INNER_PRODUCT
+        )
+        # Components of unit vectors lie in [-1, 1]; training on the two corners
+        # fixes that range for every dimension, so each process builds the same
+        # quantizer without sampling data
+        corners = np.stack([
+            -np.ones(self.dimension, dtype=np.float32), np.ones(self.dimension, dtype=np.float32)
+        ])
+        hnsw.train(corners)
+        return faiss.IndexIDMap2(hnsw)
+
+    def _load_index(self):
+        """
+        Load the saved index and catch up with sidecar rows added after it was written.
+
+        An index file that is not a prefix of the sidecar (written by an older
+        version that could overwrite other processes' vectors), or that was
+        written with the other SCALAR_QUANTIZE setting, is rebuilt from the
+        sidecar. Rows above the watermark without a stored vector (older
+        sidecars) are dropped, so the documents can be added again.
+        """
+        self.index = self._new_index()
+        self._max_indexed_id = 0
+        if os.path.exists(self.index_path):
+            index = faiss.read_index(self.index_path)
+            max_id = int(faiss.vector_to_array(index.id_map).max()) if index.ntotal else 0
+            prefix_rows = self.db.execute(
+                "SELECT COUNT(*) FROM documents WHERE int_id <= ?", (max_id,)
+            ).fetchone()[0]
+            same_type = type(faiss.downcast_index(index.index)) is type(faiss.downcast_index(self.index.index))
+            if prefix_rows == index.ntotal and same_type:
+                self.index = index
+                self._max_indexed_id = max_id
+            else:
+                logger.warning("Saved FAISS index does not match the sidecar, rebuilding it")
+        faiss.downcast_index(self.index.index).hnsw.efSearch = self.HNSW_EF_SEARCH
+
+        orphaned = self.db.execute(
+            "DELETE FROM documents WHERE int_id > ? AND embedding IS NULL", (self._max_indexed_id,)
+        ).rowcount
+        self.db.commit()
+        if orphaned:
+            logger.warning(f"Dropped {orphaned} FAISS documents without stored vectors")
+
+        self._unsaved = 0
+        restored = self._catch_up()
+        if restored:
+            logger.info(f"Indexed {restored} FAISS vectors added since the index was saved")
+
+    def _catch_up(self) -> int:
+        """Index sidecar rows above the watermark; callers hold the lock."""
+        rows = self.db.execute(
+            "SELECT int_id, embedding FROM documents "
+            "WHERE int_id > ? AND embedding IS NOT NULL ORDER BY int_id",
+            (self._max_indexed_id,)
+        ).fetchall()
+        if not rows:
+            return 0
+
+        int_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        vectors = np.frombuffer(b"".join(row[1] for row in rows), dtype=np.float32)
+        self.index.add_with_ids(vectors.reshape(len(rows), self.dimension), int_ids)
+        self._max_indexed_id = int(int_ids[-1])
+        self._unsaved += len(rows)
+        return len(rows)
+
+    def add(
+        self,
+        embeddings: np.ndarray,
+        texts: List[str],
+        ids: List[str],
+        metadata: Optional[List[Dict[str, Any]]] = None
+    ) -> int:
+        """
+        Add embeddings to the sidecar and in-memory index, skipping ids already stored.
+
+        Args:
+            embeddings: Array of shape (n, dimension)
+            texts: Original text documents
+            ids: Unique string IDs for each document
+            metadata: Optional metadata for each document
+
+        Returns:
+            Number of vectors added
+        """
+        metadatas = metadata or [{}] * len(texts)
+        vectors = np.ascontiguousarray(embeddings, dtype=np.float32)
+        faiss.normalize_L2(vectors)
+
+        with self._lock, self._writer_lock():
+            # Index other processes' rows first, so ours extend the indexed prefix
+            self._catch_up()
+
+            existing = self._existing_ids(ids)
+
+            int_ids = []
+            keep = []
+            for i, (doc_id, text, meta) in enumerate(zip(ids, texts, metadatas)):
+                if doc_id in existing:
+                    continue
+                cursor = self.db.execute(
+                    "INSERT INTO documents (doc_id, text, metadata, embedding) VALUES (?, ?, ?, ?)",
+                    (doc_id, text, json.dumps(meta), vectors[i].tobytes())
+                )
+                int_ids.append(cursor.lastrowid)
+                keep.append(i)
+            # Documents carry their vectors, so an index lost with the process
+            # is rebuilt from the sidecar on the next load
+            self.db.commit()
+
+            if not keep:
+                return 0
+
+            self.index.add_with_ids(vectors[keep], np.asarray(int_ids, dtype=np.int64))
+            self._max_indexed_id = int_ids[-1]
+            self._unsaved += len(keep)
+
+        return len(keep)
+
+    def existing_ids(self, ids: List[str]) -> set:
+        """Return which of ``ids`` are already stored."""
+        with self._lock:
+            return self._existing_ids(ids)
+
+    def _existing_ids(self, ids: List[str]) -> set:
+        """Look ``ids`` up in the sidecar; callers hold the lock."""
+        if not ids:
+            return set()
+        placeholders = ",".join("?" * len(ids))
+        return {
+            row[0] for row in self.db.execute(
+                f"SELECT doc_id FROM documents WHERE doc_id IN ({placeholders})", ids
+            )
+        }
+
+    def search(self, query_embedding: np.ndarray, n_results: int = 5) -> List[Dict[str, Any]]:
+        """
+        Find the nearest stored documents to a query.
+
+        Args:
+            query_embedding: Query embedding vector
+            n_results: Number of results to return
+
+        Returns:
+            List of documents with Chroma-compatible (squared L2) distances
+        """
+        query = np.ascontiguousarray(query_embedding, dtype=np.float32).reshape(1, -1)
+        faiss.normalize_L2(query)
+
+        with self._lock:
+            self._catch_up()
+            scores, int_ids = self.index.search(query, n_results)
+            hits = [(int(i), float(s)) for i, s in zip(int_ids[0], scores[0]) if i != -1]
+            if not hits:
+                return []
+
+            placeholders = ",".join("?" * len(hits))
+            rows = {
+                row[0]: row[1:] for row in self.db.execute(
+                    f"SELECT int_id, doc_id, text, metadata FROM documents WHERE int_id IN ({placeholders})",
+                    [i for i, _ in hits]
+                )
+            }
+
+        results = []
+        for int_id, score in hits:
+            if int_id not in rows:
+                continue
+            doc_id, text, meta = rows[int_id]
+            results.append({
+                "id": doc_id,
+                "text": text,
+                # Squared L2 between unit vectors, matching Chroma's default space
+                "distance": 2.0 - 2.0 * score,
+                "metadata": json.loads(meta) if meta else {}
+            })
+        return results
+
+    def count(self) -> int:
+        """Number of stored vectors."""
+        with self._lock:
+            self._catch_up()
+            return int(self.index.ntotal)
+
+    def save(self) -> bool:
+        """
+        Atomically write the index file if it lacks vectors added since the last save.
+
+        Returns:
+            True if the file was written
+        """
+        with self._lock:
+            if not self._unsaved:
+                return False
+            tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            faiss.write_index(self.index, tmp_path)
+            os.replace(tmp_path, self.index_path)
+            logger.debug(f"Saved FAISS index with {self.index.ntotal} vectors ({self._unsaved} new)")
+            self._unsaved = 0
+            return True
+
+
+_stores: Dict[str, FaissVectorStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_faiss_store(dimension: int, path: str) -> FaissVectorStore:
+    """Return the process-wide store for ``path``, opening it on first use."""
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = FaissVectorStore(dimension, path)
+            _stores[path] = store
+        return store
+
+
+def save_faiss_stores() -> None:
+    """
+    Write the index file of every store opened in this process.
+
+    RQ work horses exit with os._exit(), which skips exit hooks, so jobs call
+    this from their finally blocks. A store that is never saved loses no
+    vectors; the next process to open it re-indexes them from the sidecar.
+    """
+    with _stores_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        try:
+            store.save()
+        except Exception as e:
+            logger.error(f"Failed to save FAISS index at {store.path}: {e}")
@@ -0,0 +1,282 @@
+"""
+Keyword extraction for topic clusters (YAKE, TF-IDF n-grams or word frequency).
+
+Kept apart from clustering_service so joblib worker processes can extract
+keywords without importing the embedding and clustering stack.
+"""
+
+import logging
+import re
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r'\b\w+\b')
+# URLs, emails and @mentions are stripped in a single pass
+_NOISE_RE = re.compile(
+    r'https?://\S+'
+    r'|\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+    r'|@\w+'
+)
+_PUNCT_RE = re.compile(r'[^\w\s]')
+_WS_RE = re.compile(r'\s+')
+
+
+def _sparse_column_means(matrix) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Column means of a sparse matrix, restricted to columns with stored entries.
+
+    Returns ascending column indices and their means without densifying the
+    (typically thousands wide) feature axis.
+    """
+    coo = matrix.tocoo()
+    columns, inverse = np.unique(coo.col, return_inverse=True)
+    sums = np.bincount(inverse, weights=coo.data, minlength=columns.size)
+    return columns, sums / max(matrix.shape[0], 1)
+
+
+class KeywordExtractor:
+    """Cluster keyword extraction; ClusteringService builds on it for its clusters."""
+
+    def __init__(self):
+        self.sklearn_available = False
+        # Only the vectorizer is needed here, not the clustering estimators
+        try:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            self.sklearn = {'TfidfVectorizer': TfidfVectorizer}
+            self.sklearn_available = True
+        except ImportError:
+            self.sklearn = None
+        self._initialize_keyword_libs()
+
+    def _initialize_keyword_libs(self):
+        """Initialize YAKE and NLTK with graceful fallbacks."""
+        self.yake_available = False
+        self.nltk_available = False
+        self._en_stopwords = frozenset()
+
+        # Try to import YAKE
+        try:
+            import yake
+            self.yake = yake
+            self.yake_available = True
+            logger.info("YAKE initialized successfully")
+        except ImportError:
+            logger.warning("YAKE not available, will use n-gram fallback")
+            self.yake = None
+
+        # Try to import NLTK
+        try:
+            import nltk
+            from nltk.corpus import stopwords
+            from nltk.tokenize import word_tokenize, sent_tokenize
+            # Download required NLTK data if not present
+            try:
+                stopwords.words('english')
+            except LookupError:
+                nltk.download('stopwords', quiet=True)
+            try:
+                word_tokenize('test')
+            except LookupError:
+                nltk.download('punkt', quiet=True)
+
+            self.nltk = {
+                'stopwords': stopwords,
+                'word_tokenize': word_tokenize,
+                'sent_tokenize': sent_tokenize
+            }
+            # Load the stopword corpus once instead of on every keyword extraction
+            try:
+                self._en_stopwords = frozenset(stopwords.words('english'))
+            except LookupError:
+                logger.warning("NLTK stopwords corpus unavailable")
+            self.nltk_available = True
+            logger.info("NLTK initialized successfully")
+        except ImportError:
+            logger.warning("NLTK not available, keyword extraction will be limited")
+            self.nltk = None
+
+    def extract_keywords(self, texts: List[str], max_keywords: int = 10) -> List[str]:
+        """
+        Extract keywords from a collection of texts using YAKE or n-gram fallback.
+
+        Args:
+            texts: List of texts to extract keywords from
+            max_keywords: Maximum number of keywords to return
+
+        Returns:
+            List of keywords sorted by relevance
+        """
+        if not texts:
+            return []
+
+        combined_text = " ".join(texts)
+
+        if self.yake_available:
+            return self._extract_keywords_yake(combined_text, max_keywords)
+        elif self.nltk_available and self.sklearn_available:
+            return self._extract_keywords_ngrams(combined_text, max_keywords)
+        else:
+            return self._extract_keywords_simple(combined_text, max_keywords)
+
+    def _extract_keywords_yake(self, text: str, max_keywords: int) -> List[str]:
+        """Extract keywords using YAKE."""
+        try:
+            # Configure YAKE keyword extractor
+            kw_extractor = self.yake.KeywordExtractor(
+                lan="en",
+                n=2,  # n-gram size (1 for unigrams, 2 for bigrams, etc.)
+                dedupLim=0.9,  # deduplication threshold
+                windowsSize=2,  # context window size
+                top=max_keywords * 2  # Extract more candidates
+            )
+
+            # Extract keywords
+            keywords = kw_extractor.extract_keywords(text)
+
+            # Return just the keyword strings (YAKE returns tuples of (keyword, score))
+            result = [kw[0] for kw in keywords[:max_keywords]]
+
+            logger.debug(f"YAKE extracted {len(result)} keywords")
+            return result
+
+        except Exception as e:
+            logger.warning(f"YAKE keyword extraction failed: {e}")
+            return self._extract_keywords_ngrams(text, max_keywords)
+
+    def _extract_keywords_ngrams(self, text: str, max_keywords: int) -> List[str]:
+        """Extract keywords using TF-IDF and n-grams."""
+        try:
+            # Preprocess text
+            text = self._preprocess_text(text)
+
+            # Create TF-IDF vectorizer for n-grams
+            vectorizer = self.sklearn['TfidfVectorizer'](
+                ngram_range=(1, 3),  # unigrams, bigrams, trigrams
+                max_features=1000,
+                stop_words='english',
+                min_df=1
+            )
+
+            # Fit and transform (single document)
+            tfidf_matrix = vectorizer.fit_transform([text])
+
+            # Score only the nonzero n-grams, straight from the sparse row
+            feature_names = vectorizer.get_feature_names_out()
+            columns, scores = _sparse_column_means(tfidf_matrix)
+
+            keywords = self._select_keywords(feature_names, columns, scores, max_keywords)
+
+            logger.debug(f"n-gram TF-IDF extracted {len(keywords)} keywords")
+            return keywords
+
+        except Exception as e:
+            logger.warning(f"n-gram keyword extraction failed: {e}")
+            return self._extract_keywords_simple(text, max_keywords)
+
+    def _select_keywords(self, feature_names: np.ndarray, columns: np.ndarray,
+                         scores: np.ndarray, max_keywords: int) -> List[str]:
+        """
+        Pick the highest-scoring n-grams, skipping any that reuse an already chosen word.
+
+        ``columns`` (ascending feature indices) and ``scores`` describe the nonzero
+        entries only. The top ``max_keywords * 5`` candidates (plus ties) are sorted
+        up front; the rest are sorted lazily if overlap filtering exhausts that pool.
+        """
+        positive = scores > 0
+        columns, scores = columns[positive], scores[positive]
+        if columns.size == 0 or max_keywords <= 0:
+            return []
+
+        candidates = np.arange(columns.size)
+        pool_size = min(max_keywords * 5, candidates.size)
+        if pool_size < candidates.size:
+            cutoff = -np.partition(-scores, pool_size - 1)[pool_size - 1]
+            # Everything tied with the cutoff joins the pool so ties break by feature order
+            in_pool = scores >= cutoff
+            pool, rest = candidates[in_pool], candidates[~in_pool]
+        else:
+            pool, rest = candidates, candidates[:0]
+
+        keywords = []
+        seen_words = set()
+        for batch in (pool, rest):
+            for idx in columns[batch[np.argsort(-scores[batch], kind='stable')]].tolist():
+                # Avoid keywords that overlap with words already selected
+                words = feature_names[idx].split()
+                if words and not any(word in seen_words for word in words):
+                    keywords.append(feature_names[idx])
+                    seen_words.update(words)
+                    if len(keywords) >= max_keywords:
+                        return keywords
+
+        return keywords
+
+    def _extract_keywords_simple(self, text: str, max_keywords: int) -> List[str]:
+        """Simple keyword extraction using frequency analysis."""
+        try:
+            # Preprocess text
+            text = self._preprocess_text(text)
+
+            # Simple tokenization and counting
+            words = _WORD_RE.findall(text.lower())
+
+            # Remove stopwords if available
+            if self.nltk_available:
+                stop_words = self._en_stopwords
+                words = [word for word in words if word not in stop_words and len(word) > 2]
+
+            if not words or max_keywords <= 0:
+                return []
+
+            uniq, first_seen, counts = np.unique(
+                np.array(words), return_index=True, return_counts=True
+            )
+
+            # Partition to the k-th largest count, then order the (small) pool by
+            # count and first occurrence so ties match Counter.most_common
+            if len(counts) > max_keywords:
+                kth = np.partition(counts, len(counts) - max_keywords)[len(counts) - max_keywords]
+                pool = np.flatnonzero(counts >= kth)
+            else:
+                pool = np.arange(len(counts))
+            order = pool[np.lexsort((first_seen[pool], -counts[pool]))][:max_keywords]
+            keywords = uniq[order].tolist()
+
+            logger.debug(f"Simple frequency extracted {len(keywords)} keywords")
+            return keywords
+
+        except Exception as e:
+            logger.error(f"Simple keyword extraction failed: {e}")
+            return []
+
+    def _preprocess_text(self, text: str) -> str:
+        """Preprocess text for keyword extraction."""
+        if not text:
+            return ""
+
+        # Convert to lowercase
+        text = text.lower()
+
+        # Remove URLs, emails, mentions (reuse from text processing)
+        text = _NOISE_RE.sub('', text)
+
+        # Remove punctuation and extra whitespace
+        text = _PUNCT_RE.sub(' ', text)
+        text = _WS_RE.sub(' ', text)
+
+        return text.strip()
+
+
+# Per-process keyword extractor used by joblib workers in cluster_texts_with_keywords
+_worker_keyword_extractor: Optional[KeywordExtractor] = None
+
+
+def _extract_keywords_worker(texts: List[str], max_keywords: int) -> List[str]:
+    """Extract keywords inside a worker process, importing only the keyword libraries."""
+    global _worker_keyword_extractor
+    if _worker_keyword_extractor is None:
+        _worker_keyword_extractor = KeywordExtractor()
+    return _worker_keyword_extractor.extract_keywords(texts, max_keywords)
@@ -1,8 +1,11 @@
 from .clustering_service import ClusteringService
 from .sentiment_service import SentimentService
-from ..models.feedback import Feedback, NLPAnnotation
+from ..models.feedback import Feedback, NLPAnnotation, Topic
 from .database import SessionLocal
-from typing import Dict, List
+from sqlalchemy import func, or_
+from sqlalchemy.engine import Row
+from typing import Dict, List, Optional
+import uuid
 
 class QueryService:
     def __init__(self):
@@ -17,8 +20,16 @@ class QueryService:
 
         db = SessionLocal()
         try:
-            # Join Feedback with NLPAnnotation to get sentiment info
-            base_query = db.query(Feedback).join(NLPAnnotation, Feedback.id == NLPAnnotation.feedback_id)
+            # Only the columns the sources need: skips hydrating full Feedback
+            # rows (meta JSONB, normalized text) for every sample
+            base_query = db.query(
+                Feedback.id,
+                Feedback.text,
+                Feedback.created_at,
+                NLPAnnotation.sentiment,
+                Topic.label.label("topic_cluster")
+            ).join(NLPAnnotation, Feedback.id == NLPAnnotation.feedback_id).\
+                outerjoin(Topic, Topic.id == NLPAnnotation.topic_id)
 
             # Parse query intent
             if "positive" in query_lower:
@@ -31,12 +42,12 @@ class QueryService:
                 results = base_query.filter(NLPAnnotation.sentiment == 0).limit(10).all()
                 answer = f"Found {len(results)} neutral feedback items"
             elif "topic" in query_lower or "cluster" in query_lower:
-                # Get topic distribution by joining with annotations
-                from ..models.feedback import Topic
-                topic_query = db.query(Topic.label, db.func.count(NLPAnnotation.id)).\
+                # Count per topic in SQL; only the top five rows come back
+                annotation_count = func.count(NLPAnnotation.id)
+                topic_query = db.query(Topic.label, annotation_count).\
                     join(NLPAnnotation, Topic.id == NLPAnnotation.topic_id).\
                     group_by(Topic.id, Topic.label).\
-                    order_by(db.func.count(NLPAnnotation.id).desc()).\
+                    order_by(annotation_count.desc()).\
                     limit(5).all()
 
                 top_topics = [(label, count) for label, count in topic_query]
@@ -45,12 +56,7 @@ class QueryService:
             else:
                 # Default: find similar items using vector search
                 similar_texts = self.clustering_service.get_similar_texts(query, 5)
-                results = []
-                for item in similar_texts:
-                    # Find matching feedback items
-                    feedback = base_query.filter(Feedback.text.contains(item['text'][:100])).first()
-                    if feedback:
-                        results.append(feedback)
+                results = self._fetch_similar_feedback(base_query, similar_texts)
 
                 answer = f"Found {len(results)} relevant feedback items similar to your query"
 
@@ -73,3 +79,45 @@ class QueryService:
 
         finally:
             db.close()
+
+    def _fetch_similar_feedback(self, base_query, similar_texts: List[Dict]) -> List[Row]:
+        """Load the feedback rows behind vector-search hits in one query, keeping hit order."""
+        hit_ids: List[Optional[uuid.UUID]] = [self._feedback_id_for_hit(item) for item in similar_texts]
+        prefixes = [item['text'][:100] for item, hit_id in zip(similar_texts, hit_ids) if hit_id is None]
+
+        conditions = []
+        if any(hit_ids):
+            conditions.append(Feedback.id.in_([hit_id for hit_id in hit_ids if hit_id]))
+        # Anchored prefixes can use an index, unlike a %substring% scan
+        conditions.extend(Feedback.text.startswith(prefix, autoescape=True) for prefix in prefixes)
+        if not conditions:
+            return []
+
+        rows = base_query.filter(or_(*conditions)).all()
+        by_id = {row.id: row for row in rows}
+
+        results = []
+        seen = set()
+        for item, hit_id in zip(similar_texts, hit_ids):
+            if hit_id is not None:
+                feedback = by_id.get(hit_id)
+            else:
+                prefix = item['text'][:100]
+                feedback = next((row for row in rows if row.text.startswith(prefix)), None)
+            if feedback is not None and feedback.id not in seen:
+                seen.add(feedback.id)
+                results.append(feedback)
+        return results
+
+    @staticmethod
+    def _feedback_id_for_hit(item: Dict) -> Optional[uuid.UUID]:
+        """Feedback id stored with a vector-search hit, if any."""
+        raw_id = (item.get('metadata') or {}).get('feedback_id')
+        if raw_id is None and str(item.get('id', '')).startswith('feedback_'):
+            raw_id = item['id'][len('feedback_'):]
+        if raw_id is None:
+            return None
+        try:
+            return uuid.UUID(str(raw_id))
+        except ValueError:
+            return None
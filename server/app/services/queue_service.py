@@ -125,20 +125,36 @@ class QueueService:
     def get_queue_stats(self) -> Dict[str, Dict[str, Any]]:
         """Get statistics for all queues."""
         stats = {}
+        if not self.queues:
+            return stats
 
-        for queue_name, queue in self.queues.items():
-            try:
-                stats[queue_name] = {
-                    "name": queue_name,
-                    "job_count": len(queue),
-                    "started_jobs": queue.started_job_registry.count,
-                    "finished_jobs": queue.finished_job_registry.count,
-                    "failed_jobs": queue.failed_job_registry.count,
-                    "deferred_jobs": queue.deferred_job_registry.count
-                }
-            except Exception as e:
-                logger.warning(f"Failed to get stats for queue '{queue_name}': {e}")
-                stats[queue_name] = {"name": queue_name, "error": str(e)}
+        # Queue lengths and registry sizes for every queue in a single round trip.
+        # Registries are not cleaned up first (workers do that periodically).
+        count_fields = ("started_jobs", "finished_jobs", "failed_jobs", "deferred_jobs")
+        try:
+            pipe = self.redis_conn.pipeline(transaction=False)
+            for queue in self.queues.values():
+                pipe.llen(queue.key)
+                pipe.zcard(queue.started_job_registry.key)
+                pipe.zcard(queue.finished_job_registry.key)
+                pipe.zcard(queue.failed_job_registry.key)
+                pipe.zcard(queue.deferred_job_registry.key)
+            counts = pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to get queue stats: {e}")
+            return {
+                queue_name: {"name": queue_name, "error": str(e)}
+                for queue_name in self.queues
+            }
+
+        per_queue = 1 + len(count_fields)
+        for i, queue_name in enumerate(self.queues):
+            queue_counts = counts[i * per_queue:(i + 1) * per_queue]
+            stats[queue_name] = {
+                "name": queue_name,
+                "job_count": queue_counts[0],
+                **dict(zip(count_fields, queue_counts[1:]))
+            }
 
         return stats
 
@@ -1,27 +1,246 @@
 import os
 import logging
-from typing import Tuple, List, Optional
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple, List, Optional
 import random
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import weakref
 import numpy as np
 
+from ..cpu_threads import configure_torch_threads
+
 logger = logging.getLogger(__name__)
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# The DistilRoBERTa pipeline is loaded once and shared by every SentimentService
+_roberta_pipeline = None
+_roberta_lock = threading.Lock()
+
+# Per-analyzer LRU of text -> (sentiment, confidence); scoring is deterministic,
+# so repeated feedback ("Great service!", "N/A") skips the analyzer entirely
+_result_caches: "weakref.WeakKeyDictionary[Any, OrderedDict]" = weakref.WeakKeyDictionary()
+_result_cache_lock = threading.Lock()
+
+# Process pool for large VADER batches (VADER is pure Python, so threads would
+# serialize on the GIL); each process keeps its own analyzer. Only long-lived
+# processes (the API server) call enable_vader_pool(): spawning workers costs
+# more than serially scoring a whole upload batch, so short-lived processes
+# such as RQ work horses score in-process
+_vader_pool_enabled = False
+_vader_pool: Optional[ProcessPoolExecutor] = None
+_vader_pool_lock = threading.Lock()
+_process_vader_analyzer = None
+
+
+def _vader_compounds_chunk(texts: List[str]) -> List[float]:
+    """Compound scores for a chunk of texts, run inside a VADER pool process."""
+    global _process_vader_analyzer
+    if _process_vader_analyzer is None:
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+        _process_vader_analyzer = SentimentIntensityAnalyzer()
+    return [_process_vader_analyzer.polarity_scores(text)['compound'] for text in texts]
+
+
+def enable_vader_pool() -> None:
+    """Let large VADER batches in this process use the shared pool; call once at start-up."""
+    global _vader_pool_enabled
+    _vader_pool_enabled = True
+
+
+def _get_vader_pool(processes: int) -> ProcessPoolExecutor:
+    """
+    Return the shared VADER process pool, creating it on first use.
+
+    Workers are spawned rather than forked so they never inherit the parent's
+    torch/OpenMP thread pools or held locks, and the pool never grows past
+    OMP_NUM_THREADS so it does not oversubscribe the cores inference uses.
+    """
+    global _vader_pool
+    with _vader_pool_lock:
+        if _vader_pool is None:
+            thread_limit = int(os.getenv("OMP_NUM_THREADS", str(processes)))
+            _vader_pool = ProcessPoolExecutor(
+                max_workers=max(1, min(processes, thread_limit)),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _vader_pool
+
+
+def shutdown_vader_pool() -> None:
+    """Shut down the shared VADER process pool, if one was started."""
+    global _vader_pool
+    with _vader_pool_lock:
+        pool, _vader_pool = _vader_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+def _classify_compound_numpy(
+    compounds: np.ndarray, sentiments_out: np.ndarray, confidences_out: np.ndarray
+) -> None:
+    """
+    Threshold VADER compound scores into sentiments and confidences.
+
+    Uses the same thresholds as ``SentimentService._score_vader_text``:
+    >= 0.05 is positive, <= -0.05 negative, anything between neutral.
+    """
+    sentiments_out[:] = np.select([compounds >= 0.05, compounds <= -0.05], [1, -1], default=0)
+    np.minimum(np.abs(compounds), 1.0, out=confidences_out)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _classify_compound_jit(compounds, sentiments_out, confidences_out):
+        for i in range(compounds.shape[0]):
+            c = compounds[i]
+            if c >= 0.05:
+                sentiments_out[i] = 1
+            elif c <= -0.05:
+                sentiments_out[i] = -1
+            else:
+                sentiments_out[i] = 0
+            confidences_out[i] = min(abs(c), 1.0)
+
+    classify_compound = _classify_compound_jit
+else:
+    classify_compound = _classify_compound_numpy
+
+
+class MiniLMSentimentHead:
+    """3-class logistic head over MiniLM sentence embeddings.
+
+    Classes are ordered negative, neutral, positive, so the predicted index
+    minus one is the sentiment. Weights are trained offline (see ``fit``),
+    typically on labels produced by the DistilRoBERTa strategy.
+    """
+
+    def __init__(self, weights: np.ndarray, bias: np.ndarray):
+        self.weights = np.asarray(weights, dtype=np.float32)  # (3, embedding_dim)
+        self.bias = np.asarray(bias, dtype=np.float32)  # (3,)
+
+    @staticmethod
+    def _normalize(embeddings: np.ndarray) -> np.ndarray:
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-12)
+
+    def predict(self, embeddings: np.ndarray) -> List[Tuple[int, float]]:
+        """
+        Score embeddings.
+
+        Args:
+            embeddings: Array of shape (n, embedding_dim)
+
+        Returns:
+            List of (sentiment, confidence) tuples
+        """
+        logits = self._normalize(embeddings) @ self.weights.T + self.bias
+        logits -= logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        probs /= probs.sum(axis=1, keepdims=True)
+        labels = probs.argmax(axis=1)
+        confidences = probs[np.arange(len(labels)), labels]
+        return [(label - 1, confidence) for label, confidence in zip(labels.tolist(), confidences.tolist())]
+
+    @classmethod
+    def fit(
+        cls,
+        embeddings: np.ndarray,
+        sentiments: List[int],
+        epochs: int = 300,
+        learning_rate: float = 1.0,
+        l2: float = 1e-4
+    ) -> "MiniLMSentimentHead":
+        """
+        Train a head with full-batch gradient descent on softmax cross-entropy.
+
+        Args:
+            embeddings: Array of shape (n, embedding_dim)
+            sentiments: Target labels in {-1, 0, 1}
+            epochs: Gradient steps
+            learning_rate: Step size
+            l2: Weight decay
+
+        Returns:
+            Trained head
+        """
+        features = cls._normalize(embeddings)
+        targets = np.eye(3, dtype=np.float32)[np.asarray(sentiments) + 1]
+        weights = np.zeros((3, features.shape[1]), dtype=np.float32)
+        bias = np.zeros(3, dtype=np.float32)
+
+        for _ in range(epochs):
+            logits = features @ weights.T + bias
+            logits -= logits.max(axis=1, keepdims=True)
+            probs = np.exp(logits)
+            probs /= probs.sum(axis=1, keepdims=True)
+            error = (probs - targets) / len(features)
+            weights -= learning_rate * (error.T @ features + l2 * weights)
+            bias -= learning_rate * error.sum(axis=0)
+
+        return cls(weights, bias)
+
+    @classmethod
+    def load(cls, path: str) -> "MiniLMSentimentHead":
+        """Load a head saved with ``save``."""
+        with np.load(path) as data:
+            return cls(data["weights"], data["bias"])
+
+    def save(self, path: str):
+        """Save the head as a small .npz file."""
+        np.savez(path, weights=self.weights, bias=self.bias)
+
+
 class SentimentService:
     """Sentiment analysis service with multiple strategies.
 
-    Supports two strategies:
+    Supports three strategies:
     1. VADER: Fast rule-based sentiment analysis
     2. DistilRoBERTa: Transformer-based sentiment analysis
+    3. MiniLM head: Logistic head over the embeddings EmbeddingService produces
 
     Choose strategy via SENTIMENT_STRATEGY env var:
     - "vader" (default): Fast rule-based analysis
     - "distilroberta": More accurate transformer model
+    - "minilm_head": Reuses MiniLM embeddings; weights from SENTIMENT_HEAD_PATH
     """
 
-    def __init__(self):
+    ROBERTA_BATCH_SIZE = int(os.getenv("SENTIMENT_BATCH_SIZE", "32"))  # Texts per forward pass in analyze_batch
+    SENTIMENT_CACHE_SIZE = int(os.getenv("SENTIMENT_CACHE_SIZE", "50000"))  # Cached results per analyzer
+    # Distinct VADER texts above which a batch is split across VADER_PROCESSES processes
+    VADER_PARALLEL_MIN_BATCH = int(os.getenv("VADER_PARALLEL_MIN_BATCH", "1000"))
+    VADER_PROCESSES = int(os.getenv("VADER_PROCESSES", str(os.cpu_count() or 1)))
+    ROBERTA_MODEL = "j-hartmann/emotion-english-distilroberta-base"
+    # Emotion labels of ROBERTA_MODEL, in the order the pipeline emits them
+    EMOTION_LABELS = ("anger", "disgust", "fear", "joy", "neutral", "sadness", "surprise")
+    # Emotions averaged into the negative score
+    NEGATIVE_EMOTIONS = ("anger", "disgust", "fear", "sadness")
+    # Column positions of EMOTION_LABELS, resolved once rather than per batch
+    _EMOTION_INDEX = {label: i for i, label in enumerate(EMOTION_LABELS)}
+    _NEGATIVE_COLUMNS = list(map(EMOTION_LABELS.index, NEGATIVE_EMOTIONS))
+    ROBERTA_MAX_LENGTH = 128  # Token cap; feedback rarely runs longer
+
+    # Trained MiniLMSentimentHead weights for the "minilm_head" strategy
+    HEAD_PATH = os.getenv("SENTIMENT_HEAD_PATH", "models/sentiment_head.npz")
+
+    def __init__(self, embedding_service: Optional[Any] = None):
+        """
+        Args:
+            embedding_service: EmbeddingService used by the "minilm_head"
+                strategy to embed texts; created on demand if omitted
+        """
         self.strategy = os.getenv("SENTIMENT_STRATEGY", "vader").lower()
         self.vader_analyzer = None
         self.roberta_analyzer = None
+        self.sentiment_head: Optional[MiniLMSentimentHead] = None
+        self.embedding_service = embedding_service
 
         # Set deterministic seed for reproducible results
         seed = int(os.getenv("SENTIMENT_SEED", "42"))
@@ -34,6 +253,8 @@ class SentimentService:
             self._initialize_vader()
         elif self.strategy == "distilroberta":
             self._initialize_roberta()
+        elif self.strategy == "minilm_head":
+            self._initialize_minilm_head()
         else:
             logger.warning(f"Unknown sentiment strategy '{self.strategy}', falling back to VADER")
             self.strategy = "vader"
@@ -51,6 +272,7 @@ class SentimentService:
 
     def _initialize_roberta(self):
         """Initialize DistilRoBERTa sentiment analyzer."""
+        global _roberta_pipeline
         try:
             from transformers import pipeline, set_seed
 
@@ -58,17 +280,127 @@ class SentimentService:
             seed = int(os.getenv("SENTIMENT_SEED", "42"))
             set_seed(seed)
 
-            self.roberta_analyzer = pipeline(
-                "sentiment-analysis",
-                model="j-hartmann/emotion-english-distilroberta-base",
-                device="cpu",  # Force CPU usage
-                return_all_scores=True
-            )
+            with _roberta_lock:
+                if _roberta_pipeline is None:
+                    _roberta_pipeline = self._load_roberta_pipeline(pipeline)
+            self.roberta_analyzer = _roberta_pipeline
             logger.info("DistilRoBERTa sentiment analyzer initialized successfully")
         except ImportError:
             logger.error("Transformers not available. Install with: pip install transformers torch")
             raise
 
+    def _load_roberta_pipeline(self, pipeline):
+        """Build the DistilRoBERTa pipeline on ONNX Runtime if requested, else PyTorch."""
+        if os.getenv("SENTIMENT_BACKEND", "torch").lower() == "onnx":
+            try:
+                model, tokenizer = self._load_roberta_onnx()
+                logger.info("Using ONNX Runtime INT8 backend for DistilRoBERTa")
+                return pipeline(
+                    "sentiment-analysis",
+                    model=model,
+                    tokenizer=tokenizer,
+                    return_all_scores=True,
+                    batch_size=self.ROBERTA_BATCH_SIZE
+                )
+            except Exception as e:
+                logger.warning(f"ONNX sentiment backend unavailable ({e}), falling back to PyTorch")
+
+        return self._load_roberta_torch(pipeline)
+
+    def _load_roberta_torch(self, pipeline):
+        """
+        Build the PyTorch pipeline with CPU threading and weight dtype tuned for inference.
+
+        Intra-op threads follow OMP_NUM_THREADS (one inter-op thread), oneDNN
+        kernels are enabled, and weights are bfloat16 on CPUs with AVX-512 BF16
+        (SENTIMENT_DTYPE=fp32|bf16 overrides). intel-extension-for-pytorch is
+        applied when installed.
+        """
+        kwargs = {}
+        try:
+            import torch
+        except ImportError:
+            torch = None
+
+        if torch is not None:
+            configure_torch_threads()
+            torch.backends.mkldnn.enabled = True
+            kwargs["torch_dtype"] = torch.bfloat16 if self._use_bf16(torch) else torch.float32
+
+        analyzer = pipeline(
+            "sentiment-analysis",
+            model=self.ROBERTA_MODEL,
+            device="cpu",  # Force CPU usage
+            return_all_scores=True,
+            batch_size=self.ROBERTA_BATCH_SIZE,
+            **kwargs
+        )
+
+        if torch is not None:
+            try:
+                import intel_extension_for_pytorch as ipex
+                analyzer.model = ipex.optimize(analyzer.model.eval(), dtype=kwargs["torch_dtype"])
+                logger.info("Applied intel-extension-for-pytorch optimizations to DistilRoBERTa")
+            except ImportError:
+                pass
+
+        return analyzer
+
+    @staticmethod
+    def _use_bf16(torch) -> bool:
+        """Whether to load DistilRoBERTa weights in bfloat16."""
+        requested = os.getenv("SENTIMENT_DTYPE", "auto").lower()
+        if requested in ("fp32", "bf16"):
+            return requested == "bf16"
+        try:
+            return bool(torch.cpu._is_avx512_bf16_supported())
+        except Exception:
+            return False
+
+    def _load_roberta_onnx(self):
+        """
+        Load the graph-optimized, dynamically INT8-quantized ONNX export of the model.
+
+        The export is built on first use and cached under SENTIMENT_ONNX_PATH.
+
+        Returns:
+            Tuple of (ORTModelForSequenceClassification, tokenizer)
+        """
+        from optimum.onnxruntime import ORTModelForSequenceClassification, ORTOptimizer, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig, OptimizationConfig
+        from transformers import AutoTokenizer
+
+        onnx_path = os.getenv("SENTIMENT_ONNX_PATH", "models/sentiment_onnx")
+        quantized_file = "model_optimized_quantized.onnx"
+
+        if not os.path.exists(os.path.join(onnx_path, quantized_file)):
+            logger.info(f"Exporting {self.ROBERTA_MODEL} to ONNX at {onnx_path}")
+            model = ORTModelForSequenceClassification.from_pretrained(self.ROBERTA_MODEL, export=True)
+            AutoTokenizer.from_pretrained(self.ROBERTA_MODEL).save_pretrained(onnx_path)
+
+            # Fuse attention/LayerNorm/GELU, then quantize weights to INT8 (VNNI)
+            ORTOptimizer.from_pretrained(model).optimize(
+                save_dir=onnx_path,
+                optimization_config=OptimizationConfig(optimization_level=99)
+            )
+            ORTQuantizer.from_pretrained(onnx_path, file_name="model_optimized.onnx").quantize(
+                save_dir=onnx_path,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            )
+
+        model = ORTModelForSequenceClassification.from_pretrained(onnx_path, file_name=quantized_file)
+        return model, AutoTokenizer.from_pretrained(onnx_path)
+
+    def _initialize_minilm_head(self):
+        """Load the MiniLM sentiment head, falling back to VADER if it is missing."""
+        try:
+            self.sentiment_head = MiniLMSentimentHead.load(self.HEAD_PATH)
+            logger.info(f"MiniLM sentiment head loaded from {self.HEAD_PATH}")
+        except (OSError, KeyError) as e:
+            logger.warning(f"MiniLM sentiment head unavailable ({e}), falling back to VADER")
+            self.strategy = "vader"
+            self._initialize_vader()
+
     def analyze_sentiment(self, text: str) -> Tuple[int, float]:
         """
         Analyze sentiment of text and return normalized results.
@@ -85,6 +417,8 @@ class SentimentService:
             return self._analyze_vader(text)
         elif self.strategy == "distilroberta":
             return self._analyze_roberta(text)
+        elif self.strategy == "minilm_head":
+            return self.analyze_batch([text])[0]
         else:
             logger.error(f"Unknown strategy: {self.strategy}")
             return 0, 0.0
@@ -94,6 +428,12 @@ class SentimentService:
         if not self.vader_analyzer:
             raise RuntimeError("VADER analyzer not initialized")
 
+        return self._cached_scores(
+            self.vader_analyzer, [text], lambda missing: [self._score_vader_text(missing[0])]
+        )[0]
+
+    def _score_vader_text(self, text: str) -> Tuple[int, float]:
+        """Uncached VADER scoring of a single text."""
         scores = self.vader_analyzer.polarity_scores(text)
         compound = scores['compound']
 
@@ -112,39 +452,213 @@ class SentimentService:
 
     def _analyze_roberta(self, text: str) -> Tuple[int, float]:
         """Analyze sentiment using DistilRoBERTa (transformer-based)."""
-        if not self.roberta_analyzer:
-            raise RuntimeError("RoBERTa analyzer not initialized")
+        # Same truncation and result cache as analyze_batch, so a text gets the
+        # same label whichever path scores it
+        return self._analyze_roberta_batch([text])[0]
+
+    def _emotions_to_sentiment(self, results: List[dict]) -> Tuple[int, float]:
+        """Collapse DistilRoBERTa emotion scores into a (sentiment, confidence) pair."""
+        return self._emotions_to_sentiment_batch([results])[0]
+
+    def _emotions_to_sentiment_batch(self, outputs: List[List[dict]]) -> List[Tuple[int, float]]:
+        """
+        Collapse emotion scores for a batch of texts into (sentiment, confidence) pairs.
+
+        The negative score is the mean of the negative emotions; the dominant of
+        negative/neutral/joy gives the sentiment and its score the confidence.
+        """
+        label_index = self._EMOTION_INDEX
+        n_labels = len(self.EMOTION_LABELS)
+        if (
+            outputs
+            and tuple(result['label'] for result in outputs[0]) == self.EMOTION_LABELS
+            and all(len(results) == n_labels for results in outputs)
+        ):
+            # The pipeline emits every label in the model's fixed order, so scores
+            # can be read positionally without a label lookup per entry
+            emotion_scores = np.array(
+                [[result['score'] for result in results] for results in outputs], dtype=np.float64
+            )
+        else:
+            emotion_scores = np.zeros((len(outputs), n_labels))
+            for row, results in enumerate(outputs):
+                for result in results:
+                    column = label_index.get(result['label'])
+                    if column is not None:
+                        emotion_scores[row, column] = result['score']
+
+        negative = emotion_scores[:, self._NEGATIVE_COLUMNS].sum(axis=1) / 4
+        scores = np.column_stack([
+            negative,
+            emotion_scores[:, label_index['neutral']],
+            emotion_scores[:, label_index['joy']]
+        ])
 
-        # Get all scores for emotion analysis
-        results = self.roberta_analyzer(text)[0]
+        # argmax keeps the first maximum, as before; index 0..2 maps to -1..1
+        sentiment_idx = scores.argmax(axis=1)
+        confidences = scores[np.arange(len(outputs)), sentiment_idx]
+        return list(zip((sentiment_idx - 1).tolist(), confidences.tolist()))
 
-        # Map emotions to sentiment
-        # The model outputs: anger, disgust, fear, joy, neutral, sadness, surprise
-        emotion_scores = {result['label']: result['score'] for result in results}
+    def analyze_batch(
+        self, texts: List[str], embeddings: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Analyze sentiment for a batch of texts.
+
+        Args:
+            texts: Texts to score
+            embeddings: MiniLM embeddings of ``texts``, if already computed; only
+                the "minilm_head" strategy uses them
+
+        Returns:
+            List of (sentiment, confidence) tuples
+        """
+        if self.strategy == "minilm_head":
+            return self._analyze_minilm_head(texts, embeddings)
+        if self.strategy == "distilroberta":
+            return self._analyze_roberta_batch(texts)
+        return self._analyze_vader_batch(texts)
+
+    def _cached_scores(
+        self,
+        analyzer: Any,
+        texts: List[str],
+        scorer: Callable[[List[str]], List[Tuple[int, float]]]
+    ) -> List[Tuple[int, float]]:
+        """
+        Look texts up in the analyzer's result cache and score only distinct misses.
+
+        Args:
+            analyzer: Analyzer the results belong to (cache owner)
+            texts: Texts to score
+            scorer: Scores a list of distinct texts, returning results in order
 
-        # Calculate sentiment scores
-        positive_score = emotion_scores.get('joy', 0.0)
-        negative_score = (
-            emotion_scores.get('anger', 0.0) +
-            emotion_scores.get('disgust', 0.0) +
-            emotion_scores.get('fear', 0.0) +
-            emotion_scores.get('sadness', 0.0)
-        ) / 4  # Average of negative emotions
-        neutral_score = emotion_scores.get('neutral', 0.0)
+        Returns:
+            (sentiment, confidence) for each text
+        """
+        with _result_cache_lock:
+            cache = _result_caches.setdefault(analyzer, OrderedDict())
+
+        results: List[Optional[Tuple[int, float]]] = [None] * len(texts)
+        missing: Dict[str, List[int]] = {}
+        with _result_cache_lock:
+            for i, text in enumerate(texts):
+                cached = cache.get(text)
+                if cached is not None:
+                    cache.move_to_end(text)
+                    results[i] = cached
+                else:
+                    missing.setdefault(text, []).append(i)
+
+        if missing:
+            scored = scorer(list(missing))
+            with _result_cache_lock:
+                for (text, positions), result in zip(missing.items(), scored):
+                    for i in positions:
+                        results[i] = result
+                    cache[text] = result
+                    cache.move_to_end(text)
+                while len(cache) > self.SENTIMENT_CACHE_SIZE:
+                    cache.popitem(last=False)
+
+        return results
+
+    @staticmethod
+    def _score_non_empty(
+        texts: List[str], scorer: Callable[[List[int]], List[Tuple[int, float]]]
+    ) -> List[Tuple[int, float]]:
+        """Run ``scorer`` on the positions of non-empty texts; empty texts stay neutral."""
+        results: List[Tuple[int, float]] = [(0, 0.0)] * len(texts)
+        positions = [i for i, text in enumerate(texts) if text and text.strip()]
+        if positions:
+            for i, prediction in zip(positions, scorer(positions)):
+                results[i] = prediction
+        return results
+
+    def _analyze_vader_batch(self, texts: List[str]) -> List[Tuple[int, float]]:
+        """Score a batch with VADER, thresholding all compound scores at once."""
+        if not self.vader_analyzer:
+            raise RuntimeError("VADER analyzer not initialized")
+
+        def score(unique_texts: List[str]) -> List[Tuple[int, float]]:
+            # float64 keeps confidences identical to the single-text path
+            compounds = np.fromiter(
+                self._vader_compounds(unique_texts),
+                dtype=np.float64,
+                count=len(unique_texts)
+            )
+            # Same thresholds as _analyze_vader, applied in one pass over the batch
+            sentiments = np.empty(len(compounds), dtype=np.int8)
+            confidences = np.empty(len(compounds), dtype=np.float64)
+            classify_compound(compounds, sentiments, confidences)
+            return list(zip(sentiments.tolist(), confidences.tolist()))
+
+        return self._score_non_empty(
+            texts,
+            lambda positions: self._cached_scores(self.vader_analyzer, [texts[i] for i in positions], score)
+        )
+
+    def _vader_compounds(self, texts: List[str]):
+        """
+        VADER compound scores for ``texts``, in order.
+
+        Large batches are split into one chunk per process of the shared pool
+        when this process enabled it; smaller ones are scored in-process, where
+        pool overhead would dominate.
+        """
+        processes = self.VADER_PROCESSES
+        if not _vader_pool_enabled or len(texts) <= self.VADER_PARALLEL_MIN_BATCH or processes < 2:
+            return (self.vader_analyzer.polarity_scores(text)['compound'] for text in texts)
+
+        try:
+            chunk_size = -(-len(texts) // processes)
+            chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+            # map() returns chunk results in submission order
+            chunk_compounds = list(_get_vader_pool(processes).map(_vader_compounds_chunk, chunks))
+            return (compound for compounds in chunk_compounds for compound in compounds)
+        except Exception as e:
+            logger.warning(f"Parallel VADER scoring failed ({e}), scoring in-process")
+            return (self.vader_analyzer.polarity_scores(text)['compound'] for text in texts)
+
+    def _analyze_roberta_batch(self, texts: List[str]) -> List[Tuple[int, float]]:
+        """Score a batch with DistilRoBERTa in a single pipeline call."""
+        if not self.roberta_analyzer:
+            raise RuntimeError("RoBERTa analyzer not initialized")
+
+        def score(unique_texts: List[str]) -> List[Tuple[int, float]]:
+            # One pipeline call tokenizes and pads per batch instead of per text
+            outputs = self.roberta_analyzer(
+                unique_texts,
+                batch_size=self.ROBERTA_BATCH_SIZE,
+                truncation=True,
+                max_length=self.ROBERTA_MAX_LENGTH
+            )
+            return self._emotions_to_sentiment_batch(outputs)
 
-        # Determine dominant sentiment
-        scores = [negative_score, neutral_score, positive_score]
-        max_score = max(scores)
-        sentiment_idx = scores.index(max_score)
+        return self._score_non_empty(
+            texts,
+            lambda positions: self._cached_scores(self.roberta_analyzer, [texts[i] for i in positions], score)
+        )
 
-        # Map to {-1, 0, 1}
-        sentiment = sentiment_idx - 1  # 0->-1, 1->0, 2->1
+    def _analyze_minilm_head(
+        self, texts: List[str], embeddings: Optional[np.ndarray]
+    ) -> List[Tuple[int, float]]:
+        """Score texts with the MiniLM head, embedding them only if needed."""
+        if not self.sentiment_head:
+            raise RuntimeError("MiniLM sentiment head not initialized")
 
-        return sentiment, max_score
+        def score(positions: List[int]) -> List[Tuple[int, float]]:
+            if embeddings is not None:
+                return self.sentiment_head.predict(np.asarray(embeddings)[positions])
+            if self.embedding_service is None:
+                from .embedding_service import EmbeddingService
+                self.embedding_service = EmbeddingService()
+            generated = self.embedding_service.generate_embeddings([texts[i] for i in positions])
+            if generated is None:
+                raise RuntimeError("Embedding model not available for MiniLM sentiment head")
+            return self.sentiment_head.predict(generated)
 
-    def analyze_batch(self, texts: List[str]) -> List[Tuple[int, float]]:
-        """Analyze sentiment for a batch of texts."""
-        return [self.analyze_sentiment(text) for text in texts]
+        return self._score_non_empty(texts, score)
 
     def get_sentiment_label(self, sentiment: int) -> str:
         """Convert numeric sentiment to human-readable label."""
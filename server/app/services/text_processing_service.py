@@ -4,7 +4,10 @@ Text processing service for normalization and language detection.
 
 import re
 import logging
-from typing import Optional, Tuple
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import os
 
 logger = logging.getLogger(__name__)
@@ -16,10 +19,42 @@ except ImportError:
     FASTTEXT_AVAILABLE = False
     logger.warning("fasttext not available, language detection disabled")
 
+# Compiled once; normalize_text runs for every ingested row.
+# URLs, emails and @mentions are stripped in a single pass; alternatives are
+# tried in that order, so an email is never half-removed as a mention
+_STRIP_RE = re.compile(
+    r'https?://(?:[-\w.])+(?:[:\d]+)?(?:/(?:[\w/_.])*(?:\?(?:[\w&=%.])*)?(?:#(?:\w*))*)?'
+    r'|\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+    r'|@\w+',
+    re.IGNORECASE
+)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Short ASCII texts containing at least two of these words are taken as English
+# without running fasttext. Only words that are not also common in other
+# Latin-script languages belong here: "is"/"was" are Dutch/German, "are" is
+# Romanian, "no"/"a"/"in" are everywhere and "ok" is universal
+_ENGLISH_MARKERS = frozenset((
+    "the", "and", "this", "that", "with", "you", "your", "have", "not", "but",
+    "very", "it's", "i'm", "don't", "thanks", "thank", "please", "great", "good",
+    "what", "would", "could", "should", "they", "really"
+))
+_ENGLISH_WORD_RE = re.compile(r"[a-z']+")
+
+# Detected languages per loaded fasttext model, keyed by normalized text; shared
+# across service instances so duplicate feedback ("ok", "thanks") skips inference
+_language_caches: "weakref.WeakKeyDictionary[Any, OrderedDict]" = weakref.WeakKeyDictionary()
+_language_cache_lock = threading.Lock()
+
 
 class TextProcessingService:
     """Service for text normalization and language detection."""
 
+    LANGUAGE_CONFIDENCE_THRESHOLD = 0.5  # Minimum fasttext confidence to report a language
+    LANGUAGE_CACHE_SIZE = int(os.getenv("LANGUAGE_CACHE_SIZE", "100000"))  # Cached detections per model
+    ENGLISH_FAST_PATH_MAX_LENGTH = 40  # Longer texts always go through fasttext
+    ENGLISH_FAST_PATH_MIN_MARKERS = 2  # Distinct English marker words needed to skip fasttext
+
     def __init__(self):
         self.language_detector = None
         self._initialize_language_detector()
@@ -60,22 +95,11 @@ class TextProcessingService:
         if not text or not isinstance(text, str):
             return ""
 
-        # Convert to lowercase
-        normalized = text.lower()
-
-        # Remove URLs
-        normalized = self._remove_urls(normalized)
-
-        # Remove email addresses
-        normalized = self._remove_emails(normalized)
-
-        # Remove user mentions (@username)
-        normalized = self._remove_mentions(normalized)
-
-        # Remove extra whitespace
-        normalized = self._clean_whitespace(normalized)
+        # Lowercase, then drop URLs, email addresses and user mentions in one pass
+        normalized = _STRIP_RE.sub('', text.lower())
 
-        return normalized.strip()
+        # Collapse whitespace
+        return _WHITESPACE_RE.sub(' ', normalized).strip()
 
     def detect_language(self, text: str) -> Optional[str]:
         """
@@ -90,25 +114,129 @@ class TextProcessingService:
         if not self.language_detector or not text or not isinstance(text, str):
             return None
 
+        if self._is_obvious_english(text):
+            return 'en'
+
         try:
-            # Fasttext returns predictions as tuples of (label, confidence)
-            predictions = self.language_detector.predict(text, k=1)
+            return self._cached_languages([text], lambda missing: [self._predict_language(missing[0])])[0]
+        except Exception as e:
+            logger.error(f"Language detection failed: {e}")
 
-            if predictions and len(predictions[0]) > 0:
-                # Label format is '__label__<lang_code>'
-                label = predictions[0][0]
-                confidence = predictions[1][0]
+        return None
 
-                # Only return language if confidence is above threshold
-                if confidence > 0.5:  # 50% confidence threshold
-                    lang_code = label.replace('__label__', '')
-                    return lang_code
+    def detect_languages_batch(self, texts: List[str]) -> List[Optional[str]]:
+        """
+        Detect the language of many texts with a single fasttext call.
 
+        Args:
+            texts: Input texts to analyze
+
+        Returns:
+            ISO 639-1 language code (or None) for each text, in input order
+        """
+        languages: List[Optional[str]] = [None] * len(texts)
+        if not self.language_detector:
+            return languages
+
+        positions = []
+        for i, text in enumerate(texts):
+            if not text or not isinstance(text, str):
+                continue
+            if self._is_obvious_english(text):
+                languages[i] = 'en'
+            else:
+                positions.append(i)
+        if not positions:
+            return languages
+
+        try:
+            detected = self._cached_languages([texts[i] for i in positions], self._predict_languages)
+            for i, lang in zip(positions, detected):
+                languages[i] = lang
         except Exception as e:
-            logger.error(f"Language detection failed: {e}")
+            logger.error(f"Batch language detection failed: {e}")
+
+        return languages
+
+    def _is_obvious_english(self, text: str) -> bool:
+        """Cheap pre-check: short, pure-ASCII text containing several English-only words."""
+        # str.isascii() is a single C-level scan of the string's bytes
+        if len(text) >= self.ENGLISH_FAST_PATH_MAX_LENGTH or not text.isascii():
+            return False
+        markers = _ENGLISH_MARKERS.intersection(_ENGLISH_WORD_RE.findall(text.lower()))
+        return len(markers) >= self.ENGLISH_FAST_PATH_MIN_MARKERS
+
+    def _predict_language(self, text: str) -> Optional[str]:
+        """Run fasttext on a single text."""
+        # Fasttext returns predictions as tuples of (label, confidence)
+        predictions = self.language_detector.predict(text, k=1)
+
+        if predictions and len(predictions[0]) > 0:
+            # Label format is '__label__<lang_code>'
+            label = predictions[0][0]
+            confidence = predictions[1][0]
+
+            # Only return language if confidence is above threshold
+            if confidence > self.LANGUAGE_CONFIDENCE_THRESHOLD:
+                return label.replace('__label__', '')
 
         return None
 
+    def _predict_languages(self, texts: List[str]) -> List[Optional[str]]:
+        """Run fasttext once over a list of texts."""
+        # fasttext rejects newlines in list input
+        labels, confidences = self.language_detector.predict(
+            [text.replace('\n', ' ') for text in texts], k=1
+        )
+        languages: List[Optional[str]] = []
+        for label, confidence in zip(labels, confidences):
+            if len(label) > 0 and confidence[0] > self.LANGUAGE_CONFIDENCE_THRESHOLD:
+                languages.append(label[0].replace('__label__', ''))
+            else:
+                languages.append(None)
+        return languages
+
+    def _cached_languages(
+        self,
+        texts: List[str],
+        detect: Callable[[List[str]], List[Optional[str]]]
+    ) -> List[Optional[str]]:
+        """
+        Look texts up in the detector's language cache and detect only distinct misses.
+
+        Args:
+            texts: Normalized texts to look up
+            detect: Detects a list of distinct texts, returning languages in order
+
+        Returns:
+            Detected language (or None) for each text
+        """
+        with _language_cache_lock:
+            cache = _language_caches.setdefault(self.language_detector, OrderedDict())
+
+        languages: List[Optional[str]] = [None] * len(texts)
+        missing: Dict[str, List[int]] = {}
+        with _language_cache_lock:
+            for i, text in enumerate(texts):
+                if text in cache:
+                    cache.move_to_end(text)
+                    languages[i] = cache[text]
+                else:
+                    missing.setdefault(text, []).append(i)
+
+        if missing:
+            detected = detect(list(missing))
+            with _language_cache_lock:
+                for (text, positions), lang in zip(missing.items(), detected):
+                    for i in positions:
+                        languages[i] = lang
+                    cache[text] = lang
+                    cache.move_to_end(text)
+                while len(cache) > self.LANGUAGE_CACHE_SIZE:
+                    cache.popitem(last=False)
+
+        return languages
+
     def process_text(self, text: str, skip_non_english: bool = True) -> Tuple[str, Optional[str], bool]:
         """
         Process text with normalization and optional language filtering.
@@ -135,24 +263,32 @@ class TextProcessingService:
 
         return normalized, detected_lang, True
 
-    def _remove_urls(self, text: str) -> str:
-        """Remove URLs from text."""
-        # Match various URL patterns
-        url_pattern = r'https?://(?:[-\w.])+(?:[:\d]+)?(?:/(?:[\w/_.])*(?:\?(?:[\w&=%.])*)?(?:#(?:\w*))*)?'
-        return re.sub(url_pattern, '', text, flags=re.IGNORECASE)
-
-    def _remove_emails(self, text: str) -> str:
-        """Remove email addresses from text."""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        return re.sub(email_pattern, '', text)
-
-    def _remove_mentions(self, text: str) -> str:
-        """Remove user mentions (@username) from text."""
-        mention_pattern = r'@\w+'
-        return re.sub(mention_pattern, '', text)
-
-    def _clean_whitespace(self, text: str) -> str:
-        """Clean up whitespace in text."""
-        # Replace multiple spaces with single space
-        text = re.sub(r'\s+', ' ', text)
-        return text.strip()
+    def process_texts(
+        self, texts: List[str], skip_non_english: bool = True
+    ) -> List[Tuple[str, Optional[str], bool]]:
+        """
+        Batch version of process_text; language detection runs once for all texts.
+
+        Args:
+            texts: Input texts to process
+            skip_non_english: Whether to skip non-English text
+
+        Returns:
+            (normalized_text, detected_language, should_process) for each text
+        """
+        normalized_texts = [self.normalize_text(text) for text in texts]
+        languages = self.detect_languages_batch(normalized_texts)
+
+        results = []
+        for normalized, detected_lang in zip(normalized_texts, languages):
+            if not normalized:
+                results.append((normalized, None, False))
+            elif skip_non_english and detected_lang and detected_lang != 'en':
+                results.append((normalized, detected_lang, False))
+            else:
+                results.append((normalized, detected_lang, True))
+
+        skipped = sum(1 for normalized, lang, keep in results if normalized and not keep)
+        if skipped:
+            logger.info(f"Skipping {skipped} non-English texts")
+        return results
@@ -1,6 +1,11 @@
+import asyncio
+import glob
+import os
+import time
+import numpy as np
 import pandas as pd
-import uuid
 from datetime import datetime
+from typing import Any, BinaryIO, Dict, List
 from ..models.feedback import Feedback
 from .database import SessionLocal
 from .sentiment_service import SentimentService
@@ -8,7 +13,36 @@ from .clustering_service import ClusteringService
 import redis
 import rq
 
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+def _uuid4_strings(count: int) -> List[str]:
+    """Generate ``count`` random (version 4) UUID strings from a single urandom read."""
+    raw = np.frombuffer(os.urandom(16 * count), dtype=np.uint8).reshape(count, 16).copy()
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40  # Version 4
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80  # RFC 4122 variant
+    digits = raw.tobytes().hex()
+    return [
+        f"{digits[i:i + 8]}-{digits[i + 8:i + 12]}-{digits[i + 12:i + 16]}-"
+        f"{digits[i + 16:i + 20]}-{digits[i + 20:i + 32]}"
+        for i in range(0, 32 * count, 32)
+    ]
+
+
 class UploadService:
+    # Rows per CSV chunk; each chunk is enqueued as its own processing job
+    UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", "2000"))
+    # "arrow" hands chunks to workers as Arrow IPC files in UPLOAD_SHM_DIR (workers must
+    # share that directory, e.g. /dev/shm on the same host); "pickle" sends the data itself
+    UPLOAD_HANDOFF = os.getenv("UPLOAD_HANDOFF", "pickle").lower()
+    UPLOAD_SHM_DIR = os.getenv("UPLOAD_SHM_DIR", "/dev/shm")
+    # Arrow chunk files older than this are assumed orphaned (their job failed for good
+    # or was deleted) and are removed on the next arrow upload
+    UPLOAD_SHM_TTL_SECONDS = int(os.getenv("UPLOAD_SHM_TTL_SECONDS", "86400"))
+
     def __init__(self):
         self.sentiment_service = SentimentService()
         self.clustering_service = ClusteringService()
@@ -18,30 +52,118 @@ class UploadService:
     async def process_upload(self, file):
         """Process uploaded CSV file containing customer feedback"""
         try:
-            # Read CSV
-            df = pd.read_csv(file.file)
+            # Parsing and enqueueing block, so keep them off the event loop
+            return await asyncio.to_thread(self._enqueue_csv_chunks, file.file)
+
+        except Exception as e:
+            raise Exception(f"Failed to process upload: {str(e)}")
+
+    def _enqueue_csv_chunks(self, csv_file: BinaryIO) -> Dict[str, Any]:
+        """
+        Stream the CSV in UPLOAD_CHUNK_SIZE-row chunks and enqueue one job per chunk.
+
+        The whole file is validated before the first job is queued, so a bad
+        row late in the file never leaves a partially ingested upload behind.
+
+        Args:
+            csv_file: Binary file object with the uploaded CSV
+
+        Returns:
+            Upload summary with the queued job ids
+        """
+        self._validate_csv(csv_file)
+        csv_file.seek(0)
+
+        created_at = datetime.utcnow()
+        job_ids = []
+        processed_count = 0
+        use_arrow = self.UPLOAD_HANDOFF == "arrow" and PYARROW_AVAILABLE
+        if use_arrow:
+            self._remove_stale_arrow_chunks()
 
+        for chunk in pd.read_csv(csv_file, chunksize=self.UPLOAD_CHUNK_SIZE):
+            # Add metadata in one assign (a single copy instead of three column inserts)
+            chunk = chunk.assign(
+                id=_uuid4_strings(len(chunk)),
+                created_at=created_at,
+                source='csv_upload'
+            )
+
+            # Queue processing job; workers start on early chunks while later ones are read
+            if use_arrow:
+                # Only the file path goes through Redis; the worker memory-maps the file
+                job = self.queue.enqueue(
+                    'worker.tasks.process_feedback_batch_arrow',
+                    self._write_arrow_chunk(chunk)
+                )
+            else:
+                # Columns go as one list each: no per-row dicts or repeated keys in the payload
+                job = self.queue.enqueue(
+                    'worker.tasks.process_feedback_batch',
+                    chunk.to_dict('list')
+                )
+            job_ids.append(job.id)
+            processed_count += len(chunk)
+
+        return {
+            "job_id": job_ids[0] if job_ids else None,
+            "job_ids": job_ids,
+            "processed_count": processed_count,
+            "status": "queued"
+        }
+
+    def _validate_csv(self, csv_file: BinaryIO) -> None:
+        """
+        Parse the whole CSV chunk by chunk, without keeping it, to check it can be ingested.
+
+        Args:
+            csv_file: Binary file object with the uploaded CSV
+
+        Raises:
+            ValueError: If required columns are missing
+            pandas.errors.ParserError: If any row is malformed
+        """
+        required_columns = ['text']
+        for chunk in pd.read_csv(csv_file, chunksize=self.UPLOAD_CHUNK_SIZE):
             # Validate required columns
-            required_columns = ['text']
-            if not all(col in df.columns for col in required_columns):
+            if not all(col in chunk.columns for col in required_columns):
                 raise ValueError(f"CSV must contain columns: {required_columns}")
 
-            # Add metadata
-            df['id'] = [str(uuid.uuid4()) for _ in range(len(df))]
-            df['created_at'] = datetime.utcnow()
-            df['source'] = 'csv_upload'
+    def _write_arrow_chunk(self, chunk: pd.DataFrame) -> str:
+        """
+        Write a chunk to an Arrow IPC file for zero-copy reading by a worker.
 
-            # Queue processing job
-            job = self.queue.enqueue(
-                'worker.tasks.process_feedback_batch',
-                df.to_dict('records')
-            )
+        Args:
+            chunk: Enriched CSV chunk
 
-            return {
-                "job_id": job.id,
-                "processed_count": len(df),
-                "status": "queued"
-            }
+        Returns:
+            Path of the written file; the worker deletes it once processed
+        """
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        path = os.path.join(self.UPLOAD_SHM_DIR, f"feedback_{_uuid4_strings(1)[0]}.arrow")
+        with pa.OSFile(path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        return path
 
-        except Exception as e:
-            raise Exception(f"Failed to process upload: {str(e)}")
+    def _remove_stale_arrow_chunks(self) -> int:
+        """
+        Delete Arrow chunk files older than UPLOAD_SHM_TTL_SECONDS.
+
+        Workers keep a chunk file when its job fails so the job can be retried;
+        this removes the ones no job will come back for.
+
+        Returns:
+            Number of files removed
+        """
+        cutoff = time.time() - self.UPLOAD_SHM_TTL_SECONDS
+        removed = 0
+        for path in glob.glob(os.path.join(self.UPLOAD_SHM_DIR, "feedback_*.arrow")):
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except FileNotFoundError:
+                # Finished (or swept) by another process in the meantime
+                continue
+        return removed
@@ -18,8 +18,10 @@ from app.metrics import (
     increment_worker_jobs,
     observe_worker_job_duration,
     get_metrics,
-    increment_feedback_processed,
     set_service_health,
+    worker_jobs_total,
+    worker_job_duration_seconds,
+    feedback_processed_total,
 )
 
 
@@ -104,11 +106,16 @@ def demo_worker_job_logging():
     # Calculate total duration
     total_duration = time.time() - start_time
 
-    # Update metrics
-    observe_worker_job_duration("feedback_batch", total_duration)
-    increment_worker_jobs("feedback_batch", "success")
-    increment_feedback_processed("api", "success")
-    set_service_health("worker", True)
+    # Update metrics. Per-job code should resolve label children once (as
+    # worker/app/tasks.py does) instead of calling the helper functions, which
+    # look the labels up on every call; service health is set at startup
+    job_duration = worker_job_duration_seconds.labels(job_type="feedback_batch")
+    jobs_succeeded = worker_jobs_total.labels(job_type="feedback_batch", status="success")
+    feedback_processed = feedback_processed_total.labels(source="api", status="success")
+
+    job_duration.observe(total_duration)
+    jobs_succeeded.inc()
+    feedback_processed.inc(25)
 
     # Log job completion
     log.info("Feedback batch processing completed successfully", extra={
@@ -204,7 +211,7 @@ def main():
     print("🚀 Logging and Metrics Integration Demo")
     print("=" * 60)
     print(f"Started at: {datetime.now().isoformat()}")
-    print(f"Environment: {os.getenv('ENVIRONMENT', 'development')}")
+    print(f"Environment: {os.getenv('ENVIRONMENT', 'unset')}")
     print(f"Log level: {os.getenv('LOG_LEVEL', 'INFO')}")
 
     try:
@@ -6,9 +6,9 @@ Run with: python scripts/seed_database.py
 
 import sys
 import os
-from datetime import datetime, timedelta
-import random
+from datetime import datetime
 import uuid
+import numpy as np
 from faker import Faker
 
 # Add the parent directory to the Python path
@@ -49,6 +49,39 @@ SOURCES = ["website", "mobile_app", "email", "social_media", "survey", "support_
 # Sample customer IDs
 CUSTOMER_IDS = [f"CUST_{i:04d}" for i in range(1, 101)] + [None] * 50  # 50% anonymous
 
+# Feedback templates per sentiment (-1 negative, 0 neutral, 1 positive)
+TEMPLATES = {
+    1: [
+        "I absolutely love this product! The {feature} is amazing.",
+        "Great experience overall. The {feature} exceeded my expectations.",
+        "Highly recommend! The {feature} makes all the difference.",
+        "Fantastic service and quality. Really impressed with the {feature}."
+    ],
+    0: [
+        "It's okay. The {feature} is neither good nor bad.",
+        "Average experience. The {feature} works as expected.",
+        "Decent product. Nothing special about the {feature}.",
+        "It's fine. The {feature} meets basic requirements."
+    ],
+    -1: [
+        "Very disappointed with the {feature}. It doesn't work well.",
+        "Poor quality. The {feature} is frustrating to use.",
+        "Not satisfied. The {feature} has many issues.",
+        "Terrible experience. The {feature} is completely broken."
+    ]
+}
+FEATURES = ["design", "performance", "reliability", "support", "pricing", "delivery"]
+TAGS = ["urgent", "complaint", "praise", "suggestion", "bug"]
+
+# Object arrays so whole columns can be gathered with one fancy-index per column
+SOURCES_ARR = np.array(SOURCES, dtype=object)
+CUSTOMER_IDS_ARR = np.array(CUSTOMER_IDS, dtype=object)
+FEATURES_ARR = np.array(FEATURES, dtype=object)
+TEMPLATES_ARR = np.array([TEMPLATES[-1], TEMPLATES[0], TEMPLATES[1]], dtype=object)  # row = sentiment + 1
+
+EMBEDDING_DIMENSION = 384
+SEED = 42
+
 def create_topics(db):
     """Create sample topics"""
     topics = []
@@ -64,112 +97,100 @@ def create_topics(db):
     print(f"Created {len(topics)} topics")
     return topics
 
-def generate_fake_feedback():
-    """Generate fake feedback data"""
-    # Generate random dates within the last 30 days
-    days_ago = random.randint(0, 30)
-    created_at = datetime.utcnow() - timedelta(days=days_ago)
-
-    # Random source
-    source = random.choice(SOURCES)
-
-    # Random customer (50% chance of being anonymous)
-    customer_id = random.choice(CUSTOMER_IDS)
-
-    # Generate fake feedback text based on sentiment
-    sentiment_options = [-1, 0, 1]  # negative, neutral, positive
-    sentiment_weights = [0.2, 0.3, 0.5]  # 20% negative, 30% neutral, 50% positive
-    sentiment = random.choices(sentiment_options, weights=sentiment_weights)[0]
-
-    if sentiment == 1:
-        templates = [
-            "I absolutely love this product! The {feature} is amazing.",
-            "Great experience overall. The {feature} exceeded my expectations.",
-            "Highly recommend! The {feature} makes all the difference.",
-            "Fantastic service and quality. Really impressed with the {feature}."
-        ]
-    elif sentiment == 0:
-        templates = [
-            "It's okay. The {feature} is neither good nor bad.",
-            "Average experience. The {feature} works as expected.",
-            "Decent product. Nothing special about the {feature}.",
-            "It's fine. The {feature} meets basic requirements."
-        ]
-    else:  # negative
-        templates = [
-            "Very disappointed with the {feature}. It doesn't work well.",
-            "Poor quality. The {feature} is frustrating to use.",
-            "Not satisfied. The {feature} has many issues.",
-            "Terrible experience. The {feature} is completely broken."
-        ]
-
-    features = ["design", "performance", "reliability", "support", "pricing", "delivery"]
-    text = random.choice(templates).format(feature=random.choice(features))
-
-    # Generate metadata
-    meta = {
-        "rating": random.randint(1, 5) if random.random() > 0.3 else None,
-        "channel": source,
-        "verified": random.choice([True, False]),
-        "tags": random.sample(["urgent", "complaint", "praise", "suggestion", "bug"], random.randint(0, 2))
-    }
-
-    return {
-        "id": uuid.uuid4(),
-        "source": source,
-        "created_at": created_at,
-        "customer_id": customer_id,
-        "text": text,
-        "meta": meta,
-        "sentiment": sentiment
-    }
+def generate_fake_feedback(rng, count):
+    """Generate fake feedback data for ``count`` rows, drawing every random field in bulk"""
+    now = datetime.utcnow()
+
+    # Random dates within the last 30 days, sources and customers (a third anonymous)
+    days_ago = rng.integers(0, 31, size=count)
+    created_col = (np.datetime64(now, 'us') - days_ago.astype('timedelta64[D]')).tolist()
+    source_col = SOURCES_ARR[rng.integers(0, len(SOURCES), size=count)]
+    customer_col = CUSTOMER_IDS_ARR[rng.integers(0, len(CUSTOMER_IDS), size=count)]
+
+    # 20% negative, 30% neutral, 50% positive
+    sentiments = rng.choice([-1, 0, 1], size=count, p=[0.2, 0.3, 0.5])
+    template_col = TEMPLATES_ARR[sentiments + 1, rng.integers(0, TEMPLATES_ARR.shape[1], size=count)]
+    feature_col = FEATURES_ARR[rng.integers(0, len(FEATURES), size=count)]
+    text_col = [template.format(feature=feature) for template, feature in zip(template_col, feature_col)]
+
+    # Metadata
+    ratings = np.where(rng.random(count) > 0.3, rng.integers(1, 6, size=count), 0)
+    verified = rng.random(count) < 0.5
+    # 0-2 distinct tags per row: the first k columns of a random permutation
+    tag_counts = rng.integers(0, 3, size=count)
+    tag_order = np.argsort(rng.random((count, len(TAGS))), axis=1)
+
+    rows = []
+    for i in range(count):
+        source = source_col[i]
+        rows.append({
+            "id": uuid.uuid4(),
+            "source": source,
+            "created_at": created_col[i],
+            "customer_id": customer_col[i],
+            "text": text_col[i],
+            "meta": {
+                "rating": int(ratings[i]) or None,
+                "channel": source,
+                "verified": bool(verified[i]),
+                "tags": [TAGS[t] for t in tag_order[i, :tag_counts[i]]]
+            },
+            "sentiment": int(sentiments[i])
+        })
+    return rows
 
 def create_feedback_and_annotations(db, topics, num_feedback=100):
     """Create feedback entries with NLP annotations"""
-    feedback_items = []
-
-    for _ in range(num_feedback):
-        feedback_data = generate_fake_feedback()
-
-        # Create feedback entry
-        feedback = Feedback(
-            id=feedback_data["id"],
-            source=feedback_data["source"],
-            created_at=feedback_data["created_at"],
-            customer_id=feedback_data["customer_id"],
-            text=feedback_data["text"],
-            meta=feedback_data["meta"]
-        )
-
-        db.add(feedback)
-
-        # Create NLP annotation
-        sentiment = feedback_data["sentiment"]
-        sentiment_score = random.uniform(0.1, 0.9) if sentiment == 0 else (
-            random.uniform(0.6, 0.95) if sentiment == 1 else random.uniform(0.05, 0.4)
-        )
-
-        # Assign topic (70% chance)
-        topic = random.choice(topics) if random.random() > 0.3 else None
-
-        # Generate fake embedding (simplified as list of floats)
-        embedding = [random.uniform(-1, 1) for _ in range(384)] if random.random() > 0.2 else None
-
-        annotation = NLPAnnotation(
-            feedback_id=feedback.id,
-            sentiment=sentiment,
-            sentiment_score=round(sentiment_score, 4),
-            topic_id=topic.id if topic else None,
-            toxicity_score=round(random.uniform(0, 0.8), 4) if random.random() > 0.6 else None,
-            embedding=embedding
-        )
-
-        db.add(annotation)
-        feedback_items.append(feedback)
-
+    rng = np.random.default_rng(SEED)
+    feedback_rows = generate_fake_feedback(rng, num_feedback)
+    sentiments = np.array([row["sentiment"] for row in feedback_rows])
+
+    # Sentiment scores: neutral 0.1-0.9, positive 0.6-0.95, negative 0.05-0.4
+    low = np.select([sentiments == 1, sentiments == -1], [0.6, 0.05], default=0.1)
+    high = np.select([sentiments == 1, sentiments == -1], [0.95, 0.4], default=0.9)
+    sentiment_scores = np.round(rng.uniform(low, high), 4)
+
+    # Assign topic (70% chance)
+    has_topic = rng.random(num_feedback) > 0.3
+    topic_idx = rng.integers(0, len(topics), size=num_feedback)
+
+    toxicity_scores = np.round(rng.uniform(0, 0.8, size=num_feedback), 4)
+    has_toxicity = rng.random(num_feedback) > 0.6
+
+    # Fake embeddings for 80% of rows, generated as one block
+    has_embedding = rng.random(num_feedback) > 0.2
+    embeddings = rng.uniform(-1, 1, size=(int(has_embedding.sum()), EMBEDDING_DIMENSION)).astype(np.float32)
+    embedding_rows = np.cumsum(has_embedding) - 1
+
+    # Plain dicts for Core bulk inserts (multi-row VALUES, no ORM unit of work);
+    # every row carries the same keys so executemany can batch them
+    feedback_insert_rows = []
+    annotation_rows = []
+    for i, feedback_data in enumerate(feedback_rows):
+        feedback_insert_rows.append({
+            "id": feedback_data["id"],
+            "source": feedback_data["source"],
+            "created_at": feedback_data["created_at"],
+            "customer_id": feedback_data["customer_id"],
+            "text": feedback_data["text"],
+            "meta": feedback_data["meta"]
+        })
+
+        annotation_rows.append({
+            "feedback_id": feedback_data["id"],
+            "sentiment": feedback_data["sentiment"],
+            "sentiment_score": float(sentiment_scores[i]),
+            "topic_id": topics[topic_idx[i]].id if has_topic[i] else None,
+            "toxicity_score": float(toxicity_scores[i]) if has_toxicity[i] else None,
+            "embedding": embeddings[embedding_rows[i]] if has_embedding[i] else None
+        })
+
+    # Both inserts run in the session's transaction and commit together
+    db.execute(Feedback.__table__.insert(), feedback_insert_rows)
+    db.execute(NLPAnnotation.__table__.insert(), annotation_rows)
     db.commit()
-    print(f"Created {len(feedback_items)} feedback entries with annotations")
-    return feedback_items
+    print(f"Created {len(feedback_insert_rows)} feedback entries with annotations")
+    return feedback_insert_rows
 
 def main():
     """Main seeding function"""
@@ -4,181 +4,188 @@ Manual test script for ingestion endpoint.
 Run this after starting the server to test the ingestion functionality.
 """
 
-import requests
-import time
+import asyncio
 import os
+import sys
+from typing import List
+
+import httpx
 
 # Server URL - adjust if running on different port
 BASE_URL = "http://localhost:8001"
 
-def test_csv_ingestion():
-    """Test CSV file ingestion."""
-    print("Testing CSV ingestion...")
-
-    csv_file_path = os.path.join(os.path.dirname(__file__), "test_data", "sample_feedback.csv")
-
-    if not os.path.exists(csv_file_path):
-        print(f"❌ CSV test file not found: {csv_file_path}")
-        return
-
-    with open(csv_file_path, 'rb') as f:
-        files = {'file': ('sample_feedback.csv', f, 'text/csv')}
-        data = {'source': 'test_csv', 'process_async': 'true'}
-
-        try:
-            response = requests.post(f"{BASE_URL}/ingest/", files=files, data=data)
-            print(f"Status: {response.status_code}")
-
-            if response.status_code == 200:
-                result = response.json()
-                print("✅ CSV ingestion successful!"                print(f"   Batch ID: {result['batch_id']}")
-                print(f"   Processed: {result['processed_count']}")
-                print(f"   Created: {result['created_count']}")
-                print(f"   Duplicates: {result['duplicate_count']}")
-                print(f"   Errors: {result['error_count']}")
-                if result.get('job_id'):
-                    print(f"   Job ID: {result['job_id']}")
-            else:
-                print(f"❌ CSV ingestion failed: {response.text}")
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "test_data")
+CSV_FILE_PATH = os.path.join(TEST_DATA_DIR, "sample_feedback.csv")
+JSONL_FILE_PATH = os.path.join(TEST_DATA_DIR, "sample_feedback.jsonl")
+
+
+def _emit(lines: List[str]):
+    """Write a section's report lines with a single write call."""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def _client() -> httpx.AsyncClient:
+    """One pooled keep-alive client for the whole run, so requests reuse connections."""
+    return httpx.AsyncClient(
+        base_url=BASE_URL,
+        timeout=60,
+        headers={"User-Agent": "ingestion-test"},
+        # Retries cover connection failures only, never a request the server received
+        transport=httpx.AsyncHTTPTransport(
+            retries=2,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=8)
+        )
+    )
+
+async def _post_file(client: httpx.AsyncClient, path: str, content_type: str,
+                     source: str, process_async: bool) -> httpx.Response:
+    """Upload a file to the ingest endpoint."""
+    with open(path, 'rb') as f:
+        files = {'file': (os.path.basename(path), f.read(), content_type)}
+    data = {'source': source, 'process_async': 'true' if process_async else 'false'}
+    return await client.post("/ingest/", files=files, data=data)
+
+async def _ingest_file(client: httpx.AsyncClient, label: str, path: str,
+                       content_type: str, source: str) -> str:
+    """Upload a test file and return its report, so concurrent runs print in order."""
+    lines = [f"Testing {label} ingestion..."]
+
+    if not os.path.exists(path):
+        lines.append(f"❌ {label} test file not found: {path}")
+        return "\n".join(lines)
 
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Request failed: {e}")
+    try:
+        response = await _post_file(client, path, content_type, source, True)
+    except httpx.HTTPError as e:
+        lines.append(f"❌ Request failed: {e}")
+        return "\n".join(lines)
+
+    lines.append(f"Status: {response.status_code}")
+    if response.status_code == 200:
+        result = response.json()
+        lines.append(f"✅ {label} ingestion successful!")
+        lines.append(f"   Batch ID: {result['batch_id']}")
+        lines.append(f"   Processed: {result['processed_count']}")
+        lines.append(f"   Created: {result['created_count']}")
+        lines.append(f"   Duplicates: {result['duplicate_count']}")
+        lines.append(f"   Errors: {result['error_count']}")
+        if result.get('job_id'):
+            lines.append(f"   Job ID: {result['job_id']}")
+    else:
+        lines.append(f"❌ {label} ingestion failed: {response.text}")
+    return "\n".join(lines)
+
+async def test_csv_ingestion(client: httpx.AsyncClient) -> str:
+    """Test CSV file ingestion."""
+    return await _ingest_file(client, "CSV", CSV_FILE_PATH, 'text/csv', 'test_csv')
 
-def test_jsonl_ingestion():
+async def test_jsonl_ingestion(client: httpx.AsyncClient) -> str:
     """Test JSONL file ingestion."""
-    print("\nTesting JSONL ingestion...")
-
-    jsonl_file_path = os.path.join(os.path.dirname(__file__), "test_data", "sample_feedback.jsonl")
-
-    if not os.path.exists(jsonl_file_path):
-        print(f"❌ JSONL test file not found: {jsonl_file_path}")
-        return
-
-    with open(jsonl_file_path, 'rb') as f:
-        files = {'file': ('sample_feedback.jsonl', f, 'application/json')}
-        data = {'source': 'test_jsonl', 'process_async': 'true'}
-
-        try:
-            response = requests.post(f"{BASE_URL}/ingest/", files=files, data=data)
-            print(f"Status: {response.status_code}")
-
-            if response.status_code == 200:
-                result = response.json()
-                print("✅ JSONL ingestion successful!"                print(f"   Batch ID: {result['batch_id']}")
-                print(f"   Processed: {result['processed_count']}")
-                print(f"   Created: {result['created_count']}")
-                print(f"   Duplicates: {result['duplicate_count']}")
-                print(f"   Errors: {result['error_count']}")
-                if result.get('job_id'):
-                    print(f"   Job ID: {result['job_id']}")
-            else:
-                print(f"❌ JSONL ingestion failed: {response.text}")
+    return await _ingest_file(client, "JSONL", JSONL_FILE_PATH, 'application/json', 'test_jsonl')
 
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Request failed: {e}")
-
-def test_duplicate_detection():
+async def test_duplicate_detection(client: httpx.AsyncClient) -> List[str]:
     """Test duplicate detection by uploading the same file twice."""
-    print("\nTesting duplicate detection...")
-
-    csv_file_path = os.path.join(os.path.dirname(__file__), "test_data", "sample_feedback.csv")
+    lines = ["", "Testing duplicate detection..."]
 
-    if not os.path.exists(csv_file_path):
-        print(f"❌ CSV test file not found: {csv_file_path}")
-        return
+    if not os.path.exists(CSV_FILE_PATH):
+        lines.append(f"❌ CSV test file not found: {CSV_FILE_PATH}")
+        return lines
 
     # First upload
-    print("First upload:")
-    with open(csv_file_path, 'rb') as f:
-        files = {'file': ('sample_feedback.csv', f, 'text/csv')}
-        data = {'source': 'test_duplicates', 'process_async': 'false'}
-
-        try:
-            response = requests.post(f"{BASE_URL}/ingest/", files=files, data=data)
-            if response.status_code == 200:
-                result = response.json()
-                print(f"   Created: {result['created_count']}, Duplicates: {result['duplicate_count']}")
-            else:
-                print(f"❌ First upload failed: {response.status_code}")
-                return
-        except requests.exceptions.RequestException as e:
-            print(f"❌ First upload request failed: {e}")
-            return
-
-    # Second upload (should detect duplicates)
-    print("Second upload (should detect duplicates):")
-    with open(csv_file_path, 'rb') as f:
-        files = {'file': ('sample_feedback.csv', f, 'text/csv')}
-        data = {'source': 'test_duplicates', 'process_async': 'false'}
-
-        try:
-            response = requests.post(f"{BASE_URL}/ingest/", files=files, data=data)
-            if response.status_code == 200:
-                result = response.json()
-                print(f"   Created: {result['created_count']}, Duplicates: {result['duplicate_count']}")
-
-                if result['duplicate_count'] > 0:
-                    print("✅ Duplicate detection working!")
-                else:
-                    print("⚠️  No duplicates detected (might be expected if data was modified)")
-            else:
-                print(f"❌ Second upload failed: {response.status_code}")
-
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Second upload request failed: {e}")
-
-def test_health_check():
-    """Test health check endpoints."""
-    print("\nTesting health checks...")
-
-    # Test /healthz
+    lines.append("First upload:")
     try:
-        response = requests.get(f"{BASE_URL}/healthz")
-        if response.status_code == 200 and response.text == "ok":
-            print("✅ /healthz endpoint working")
+        response = await _post_file(client, CSV_FILE_PATH, 'text/csv', 'test_duplicates', False)
+        if response.status_code == 200:
+            result = response.json()
+            lines.append(f"   Created: {result['created_count']}, Duplicates: {result['duplicate_count']}")
         else:
-            print(f"❌ /healthz endpoint failed: {response.status_code} - {response.text}")
-    except requests.exceptions.RequestException as e:
-        print(f"❌ /healthz request failed: {e}")
-
-    # Test /health
+            lines.append(f"❌ First upload failed: {response.status_code}")
+            return lines
+    except httpx.HTTPError as e:
+        lines.append(f"❌ First upload request failed: {e}")
+        return lines
+
+    # Second upload (should detect duplicates); it has to follow the first one
+    lines.append("Second upload (should detect duplicates):")
     try:
-        response = requests.get(f"{BASE_URL}/health")
+        response = await _post_file(client, CSV_FILE_PATH, 'text/csv', 'test_duplicates', False)
         if response.status_code == 200:
-            data = response.json()
-            if data.get("status") == "healthy":
-                print("✅ /health endpoint working")
+            result = response.json()
+            lines.append(f"   Created: {result['created_count']}, Duplicates: {result['duplicate_count']}")
+
+            if result['duplicate_count'] > 0:
+                lines.append("✅ Duplicate detection working!")
             else:
-                print(f"❌ /health endpoint returned unexpected data: {data}")
+                lines.append("⚠️  No duplicates detected (might be expected if data was modified)")
         else:
-            print(f"❌ /health endpoint failed: {response.status_code}")
-    except requests.exceptions.RequestException as e:
-        print(f"❌ /health request failed: {e}")
-
-def main():
-    """Run all ingestion tests."""
-    print("🚀 Starting ingestion endpoint tests...")
-    print(f"Server URL: {BASE_URL}")
-    print("=" * 50)
-
-    # Test health endpoints first
-    test_health_check()
+            lines.append(f"❌ Second upload failed: {response.status_code}")
 
-    # Test CSV ingestion
-    test_csv_ingestion()
+    except httpx.HTTPError as e:
+        lines.append(f"❌ Second upload request failed: {e}")
 
-    # Test JSONL ingestion
-    test_jsonl_ingestion()
+    return lines
 
-    # Test duplicate detection
-    test_duplicate_detection()
+async def _check_healthz(client: httpx.AsyncClient) -> str:
+    """Check /healthz and return the report line."""
+    try:
+        response = await client.get("/healthz")
+    except httpx.HTTPError as e:
+        return f"❌ /healthz request failed: {e}"
+    if response.status_code == 200 and response.text == "ok":
+        return "✅ /healthz endpoint working"
+    return f"❌ /healthz endpoint failed: {response.status_code} - {response.text}"
+
+async def _check_health(client: httpx.AsyncClient) -> str:
+    """Check /health and return the report line."""
+    try:
+        response = await client.get("/health")
+    except httpx.HTTPError as e:
+        return f"❌ /health request failed: {e}"
+    if response.status_code != 200:
+        return f"❌ /health endpoint failed: {response.status_code}"
+    data = response.json()
+    if data.get("status") == "healthy":
+        return "✅ /health endpoint working"
+    return f"❌ /health endpoint returned unexpected data: {data}"
+
+async def test_health_check(client: httpx.AsyncClient) -> List[str]:
+    """Test health check endpoints."""
+    # Both endpoints are checked at once
+    results = await asyncio.gather(_check_healthz(client), _check_health(client))
+    return ["", "Testing health checks...", *results]
 
-    print("\n" + "=" * 50)
-    print("✨ Ingestion tests completed!")
-    print("\nNext steps:")
-    print("1. Check the database for inserted feedback")
-    print("2. Monitor RQ worker for background processing jobs")
-    print("3. Check analytics endpoints for processed data")
+async def main():
+    """Run all ingestion tests."""
+    _emit([
+        "🚀 Starting ingestion endpoint tests...",
+        f"Server URL: {BASE_URL}",
+        "=" * 50
+    ])
+
+    async with _client() as client:
+        # Test health endpoints first
+        _emit(await test_health_check(client))
+
+        # CSV and JSONL uploads are independent (different sources), so they run
+        # concurrently; reports are written afterwards in a fixed order
+        csv_report, jsonl_report = await asyncio.gather(
+            test_csv_ingestion(client),
+            test_jsonl_ingestion(client)
+        )
+        _emit([csv_report, "", jsonl_report])
+
+        # Test duplicate detection; its two uploads stay sequential
+        _emit(await test_duplicate_detection(client))
+
+    _emit([
+        "",
+        "=" * 50,
+        "✨ Ingestion tests completed!",
+        "",
+        "Next steps:",
+        "1. Check the database for inserted feedback",
+        "2. Monitor RQ worker for background processing jobs",
+        "3. Check analytics endpoints for processed data"
+    ])
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -5,9 +5,12 @@ Simple test script to verify logging and metrics integration.
 import sys
 import os
 import json
+import re
 from io import StringIO
 import time
 
+from prometheus_client import generate_latest
+
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(__file__))
 
@@ -19,8 +22,12 @@ from app.metrics import (
     observe_worker_job_duration,
     get_metrics,
     is_development_mode,
+    build_metrics,
 )
 
+# Every exposition line (samples and HELP/TYPE comments) naming the histogram
+WORKER_JOB_DURATION_LINES = re.compile(rb"^.*worker_job_duration_seconds.*$", re.MULTILINE)
+
 
 def test_structured_logging():
     """Test structured JSON logging."""
@@ -64,7 +71,6 @@ def test_metrics_collection():
 
     # Get metrics
     metrics_data = get_metrics()
-    metrics_str = metrics_data.decode('utf-8')
 
     # Verify metrics are present
     assert b"http_requests_total" in metrics_data
@@ -73,7 +79,8 @@ def test_metrics_collection():
     assert b"worker_job_duration_seconds" in metrics_data
 
     print("✓ Metrics collection working")
-    print(f"✓ Generated {len(metrics_str.splitlines())} metric lines")
+    line_count = metrics_data.count(b"\n")
+    print(f"✓ Generated {line_count} metric lines")
 
 
 def test_development_mode_detection():
@@ -100,12 +107,8 @@ def test_development_mode_detection():
         else:
             os.environ["ENVIRONMENT"] = env_value
 
-        # Reload the module to pick up new env var
-        import importlib
-        import app.metrics
-        importlib.reload(app.metrics)
-
-        result = app.metrics.is_development_mode()
+        # is_development_mode reads ENVIRONMENT per call, so no module reload is needed
+        result = is_development_mode()
         assert result == expected, f"Expected {expected} for ENVIRONMENT={env_value}, got {result}"
 
     # Restore original environment
@@ -121,29 +124,24 @@ def test_worker_job_duration_histogram():
     """Test worker job duration histogram specifically."""
     print("Testing worker job duration histogram...")
 
-    # Clear any existing metrics by reloading
-    import importlib
-    import app.metrics
-    importlib.reload(app.metrics)
-
-    # Import after reload
-    from app.metrics import observe_worker_job_duration, get_metrics
+    # An isolated set of collectors, so observations from other tests don't leak in
+    metrics = build_metrics()
 
     # Add some duration observations
     durations = [1.2, 5.6, 12.3, 45.6, 120.5, 300.1]
     for duration in durations:
-        observe_worker_job_duration("feedback_batch", duration)
+        observe_worker_job_duration("feedback_batch", duration, metrics=metrics)
 
     # Get metrics and verify histogram is present
-    metrics_data = get_metrics()
-    metrics_str = metrics_data.decode('utf-8')
+    metrics_data = generate_latest(metrics.registry)
 
     assert b"worker_job_duration_seconds" in metrics_data
     assert b'job_type="feedback_batch"' in metrics_data
 
-    # Count histogram buckets
-    histogram_lines = [line for line in metrics_str.splitlines() if b"worker_job_duration_seconds" in line.encode()]
+    # Count histogram buckets with one scan over the raw bytes
+    histogram_lines = WORKER_JOB_DURATION_LINES.findall(metrics_data)
     assert len(histogram_lines) > 0, "Histogram metrics not found"
+    assert b'worker_job_duration_seconds_count{job_type="feedback_batch"} 6.0' in metrics_data
 
     print(f"✓ Worker job duration histogram working with {len(histogram_lines)} metric lines")
 
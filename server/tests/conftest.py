@@ -1,37 +1,111 @@
 """
 Pytest configuration and shared fixtures for server tests.
 """
+import hashlib
+import os
+import shutil
+import tempfile
+import numpy as np
 import pytest
 import uuid
 from datetime import datetime, timezone
 from unittest.mock import MagicMock
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateIndex, CreateTable
 
+from app.models import Topic
 from app.models.feedback import Base
+from app.repositories import TopicRepository
 from app.services.database import SessionLocal
 
 
+def _schema_fingerprint() -> str:
+    """Hash of the SQLite DDL that Base.metadata compiles to."""
+    dialect = sqlite.dialect()
+    digest = hashlib.blake2b(digest_size=8)
+    for table in Base.metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=dialect)).encode())
+        for index in sorted(table.indexes, key=lambda index: index.name or ""):
+            digest.update(str(CreateIndex(index).compile(dialect=dialect)).encode())
+    return digest.hexdigest()
+
+
+def _schema_template(db_dir: str) -> str:
+    """
+    Return a SQLite file holding the empty test schema, building it if needed.
+
+    The file name carries a hash of the compiled DDL, so any model change
+    (in any module registered on Base.metadata) gets a fresh template and test
+    sessions otherwise copy a ready-made file instead of re-running the DDL.
+    """
+    template = os.path.join(db_dir, f"test_schema_template_{_schema_fingerprint()}.db")
+    if not os.path.exists(template):
+        # Build under a unique name and rename into place, so concurrent
+        # (xdist) sessions never copy a half-written template
+        building = f"{template}.{uuid.uuid4().hex}"
+        build_engine = create_engine(f"sqlite:///{building}")
+        try:
+            Base.metadata.create_all(bind=build_engine)
+        except Exception:
+            build_engine.dispose()
+            if os.path.exists(building):
+                os.unlink(building)
+            raise
+        build_engine.dispose()
+        os.replace(building, template)
+    return template
+
+
 @pytest.fixture(scope="session")
 def engine():
-    """Create an in-memory SQLite database for testing."""
-    # Use SQLite for testing instead of PostgreSQL for simplicity
+    """Create a file-backed SQLite database (on tmpfs when available) for testing."""
+    # Use SQLite for testing instead of PostgreSQL for simplicity. A file with a
+    # regular connection pool (rather than :memory: behind StaticPool) lets
+    # connections work concurrently; each xdist worker gets its own file
+    db_dir = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    db_path = os.path.join(db_dir, f"test_{uuid.uuid4().hex}.db")
+    shutil.copyfile(_schema_template(db_dir), db_path)
     engine = create_engine(
-        "sqlite:///:memory:",
+        f"sqlite:///{db_path}",
         connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
     )
-    Base.metadata.create_all(bind=engine)
-    return engine
+
+    @event.listens_for(engine, "connect")
+    def _configure_sqlite(dbapi_connection, connection_record):
+        # Let SQLAlchemy emit BEGIN itself so SAVEPOINTs work with pysqlite
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.unlink(db_path + suffix)
 
 
 @pytest.fixture(scope="function")
 def db_session(engine):
-    """Create a database session for each test function."""
+    """Create a database session for each test function.
+
+    The session works inside a SAVEPOINT of an outer transaction that is rolled
+    back afterwards, so tests share the schema but never see each other's rows.
+    """
     connection = engine.connect()
     transaction = connection.begin()
-    session = SessionLocal(bind=connection)
+    session = SessionLocal(bind=connection, join_transaction_mode="create_savepoint")
 
     yield session
 
@@ -129,9 +203,9 @@ def mock_clustering_service():
 def mock_embedding_service():
     """Mock embedding service for testing."""
     service = MagicMock()
-    # Return mock embeddings (384 dimensions)
-    mock_embedding = [0.1] * 384
-    service.encode_batch.return_value = [mock_embedding] * 5
+    # Return mock embeddings (384 dimensions) as float32 arrays, like the real service
+    mock_embedding = np.full(384, 0.1, dtype=np.float32)
+    service.encode_batch.return_value = np.tile(mock_embedding, (5, 1))
     service.encode_single.return_value = mock_embedding
     return service
 
@@ -155,3 +229,63 @@ def feedback_with_topics():
     """Load feedback organized by topics."""
     from .sample_data_fixtures import get_feedback_with_topics
     return get_feedback_with_topics()
+
+
+# Session's attribute names, resolved once; each mock then uses the list as its
+# spec instead of introspecting the Session class again. A shared prototype
+# can't be copied instead, since copies would share child mocks and call state
+_SESSION_ATTRIBUTES = dir(Session)
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Test client fixture, built once and shared by every test."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+    return TestClient(app)
+
+
+@pytest.fixture
+def mock_db_session():
+    """Mock database session fixture."""
+    session = MagicMock(spec=_SESSION_ATTRIBUTES)
+    # Keep isinstance(session, Session) true, as with spec=Session
+    session.__class__ = Session
+    return session
+
+
+@pytest.fixture
+def topic_repo(mock_db_session):
+    """Topic repository fixture."""
+    return TopicRepository(mock_db_session)
+
+
+@pytest.fixture
+def mock_topic_repo(monkeypatch):
+    """Mock TopicRepository installed for the duration of one test."""
+    repo = MagicMock()
+    monkeypatch.setattr("app.repositories.TopicRepository", lambda *args, **kwargs: repo)
+    return repo
+
+
+@pytest.fixture(scope="module")
+def sample_topic():
+    """Existing topic shared by tests that only read it (built once per module)."""
+    return Topic(
+        id=1,
+        label="Old Label",
+        keywords=["old"],
+        updated_at=datetime.utcnow()
+    )
+
+
+@pytest.fixture(scope="session")
+def valid_token():
+    """Valid JWT token for testing, signed once per session (the payload is fixed)."""
+    from app.services.auth_service import auth_service
+    token_data = {
+        "sub": "admin",
+        "is_admin": True,
+        "role": "admin"
+    }
+    return auth_service.create_access_token(token_data)
@@ -1,35 +1,99 @@
 """
 Factory Boy factories for creating test data.
 """
+import random
 import uuid
 from datetime import datetime, timezone
 from typing import List, Optional
 
 import factory
+import numpy as np
 from factory.alchemy import SQLAlchemyModelFactory
+from faker import Faker
+from sqlalchemy.orm import Session
 
 from app.models.feedback import Feedback, NLPAnnotation, Topic, TopicAuditLog
 
+# One seeded Faker and stdlib RNG shared by every factory; fields call their
+# bound methods directly instead of going through factory.Faker's per-call
+# provider lookup
+_fake = Faker()
+_fake.seed_instance(0)
+_random = random.Random(0)
+
+_SOURCES = ("website", "mobile_app", "support_ticket", "survey", "social_media")
+_SENTIMENTS = (-1, 0, 1)
+_AUDIT_ACTIONS = ("create", "update", "delete")
+# Distinct words drawn once, so keyword lists are cheap samples without repeats
+_WORDS = list(dict.fromkeys(_fake.words(nb=1024)))
+# Feedback texts drawn once and reused
+_SENTENCES = [_fake.sentence(nb_words=12) for _ in range(256)]
+
+
+def _word() -> str:
+    return _random.choice(_WORDS)
+
+
+def _words(count: int) -> List[str]:
+    return _random.sample(_WORDS, count)
+
+
+def _date_this_year() -> datetime:
+    return _fake.date_time_this_year(tzinfo=timezone.utc)
+
+
+def _uuid4_str() -> str:
+    return str(uuid.uuid4())
+
+
+def _sentence() -> str:
+    return _SENTENCES[_random.randrange(len(_SENTENCES))]
+
+
+def _feedback_meta() -> dict:
+    return {
+        "user_agent": _fake.user_agent(),
+        "ip_address": _fake.ipv4(),
+        "session_id": _uuid4_str()
+    }
+
+
+def make_feedback(**overrides) -> Feedback:
+    """Construct a Feedback directly, without factory_boy or a session.
+
+    For tests that only need plain in-memory instances; any column can be
+    overridden by keyword.
+    """
+    fields = {
+        "id": uuid.uuid4(),
+        "source": _random.choice(_SOURCES),
+        "created_at": _date_this_year(),
+        "customer_id": _uuid4_str(),
+        "text": _sentence(),
+        "detected_language": _fake.language_code(),
+        "meta": _feedback_meta()
+    }
+    fields.update(overrides)
+    if "normalized_text" not in fields:
+        fields["normalized_text"] = fields["text"].lower() if fields["text"] else None
+    return Feedback(**fields)
+
 
 class FeedbackFactory(SQLAlchemyModelFactory):
     """Factory for creating Feedback instances."""
 
     class Meta:
         model = Feedback
-        sqlalchemy_session_persistence = "commit"
+        sqlalchemy_session_persistence = "flush"
 
     id = factory.LazyFunction(uuid.uuid4)
-    source = factory.Faker("random_element", elements=["website", "mobile_app", "support_ticket", "survey", "social_media"])
-    created_at = factory.Faker("date_time_this_year", tzinfo=timezone.utc)
-    customer_id = factory.Faker("uuid4")
-    text = factory.Faker("sentence", nb_words=12)
+    source = factory.LazyFunction(lambda: _random.choice(_SOURCES))
+    created_at = factory.LazyFunction(_date_this_year)
+    customer_id = factory.LazyFunction(_uuid4_str)
+    text = factory.LazyFunction(_sentence)
     normalized_text = factory.LazyAttribute(lambda obj: obj.text.lower() if obj.text else None)
-    detected_language = factory.Faker("language_code")
-    meta = factory.Dict({
-        "user_agent": factory.Faker("user_agent"),
-        "ip_address": factory.Faker("ipv4"),
-        "session_id": factory.Faker("uuid4")
-    })
+    detected_language = factory.LazyFunction(_fake.language_code)
+    meta = factory.LazyFunction(_feedback_meta)
 
 
 class TopicFactory(SQLAlchemyModelFactory):
@@ -37,16 +101,11 @@ class TopicFactory(SQLAlchemyModelFactory):
 
     class Meta:
         model = Topic
-        sqlalchemy_session_persistence = "commit"
+        sqlalchemy_session_persistence = "flush"
 
-    label = factory.Faker("word")
-    keywords = factory.List([
-        factory.Faker("word"),
-        factory.Faker("word"),
-        factory.Faker("word"),
-        factory.Faker("word")
-    ])
-    updated_at = factory.Faker("date_time_this_year", tzinfo=timezone.utc)
+    label = factory.LazyFunction(_word)
+    keywords = factory.LazyFunction(lambda: _words(4))
+    updated_at = factory.LazyFunction(_date_this_year)
 
 
 class NLPAnnotationFactory(SQLAlchemyModelFactory):
@@ -54,13 +113,13 @@ class NLPAnnotationFactory(SQLAlchemyModelFactory):
 
     class Meta:
         model = NLPAnnotation
-        sqlalchemy_session_persistence = "commit"
+        sqlalchemy_session_persistence = "flush"
 
     feedback = factory.SubFactory(FeedbackFactory)
-    sentiment = factory.Faker("random_element", elements=[-1, 0, 1])
-    sentiment_score = factory.Faker("pyfloat", min_value=0.0, max_value=1.0)
+    sentiment = factory.LazyFunction(lambda: _random.choice(_SENTIMENTS))
+    sentiment_score = factory.LazyFunction(_random.random)
     topic = factory.SubFactory(TopicFactory)
-    toxicity_score = factory.Faker("pyfloat", min_value=0.0, max_value=1.0)
+    toxicity_score = factory.LazyFunction(_random.random)
     # Note: embedding field is handled separately as it depends on pgvector availability
 
 
@@ -69,51 +128,80 @@ class TopicAuditLogFactory(SQLAlchemyModelFactory):
 
     class Meta:
         model = TopicAuditLog
-        sqlalchemy_session_persistence = "commit"
+        sqlalchemy_session_persistence = "flush"
 
     topic = factory.SubFactory(TopicFactory)
-    action = factory.Faker("random_element", elements=["create", "update", "delete"])
-    old_label = factory.Faker("word")
-    new_label = factory.Faker("word")
-    old_keywords = factory.List([
-        factory.Faker("word"),
-        factory.Faker("word")
-    ])
-    new_keywords = factory.List([
-        factory.Faker("word"),
-        factory.Faker("word"),
-        factory.Faker("word")
-    ])
-    changed_by = factory.Faker("email")
-    changed_at = factory.Faker("date_time_this_year", tzinfo=timezone.utc)
-    ip_address = factory.Faker("ipv4")
-    user_agent = factory.Faker("user_agent")
+    action = factory.LazyFunction(lambda: _random.choice(_AUDIT_ACTIONS))
+    old_label = factory.LazyFunction(_word)
+    new_label = factory.LazyFunction(_word)
+    old_keywords = factory.LazyFunction(lambda: _words(2))
+    new_keywords = factory.LazyFunction(lambda: _words(3))
+    changed_by = factory.LazyFunction(_fake.email)
+    changed_at = factory.LazyFunction(_date_this_year)
+    ip_address = factory.LazyFunction(_fake.ipv4)
+    user_agent = factory.LazyFunction(_fake.user_agent)
 
 
 # Convenience functions for creating test data
-def create_feedback_batch(count: int = 5) -> List[Feedback]:
-    """Create a batch of feedback items for testing."""
-    return FeedbackFactory.create_batch(count)
+def create_feedback_batch(
+    count: int = 5,
+    session: Optional[Session] = None,
+    persist: bool = True
+) -> List[Feedback]:
+    """Create a batch of feedback items for testing.
+
+    Instances are built in memory, added to ``session`` in one add_all and
+    written with a single commit, so the returned objects are persistent and
+    bound to that session. With ``persist=False`` they are plain unsaved
+    models from make_feedback and no session is needed.
+    """
+    if not persist:
+        return [make_feedback() for _ in range(count)]
+    if session is None:
+        raise ValueError("create_feedback_batch needs a session to persist feedback")
+
+    feedback_items = FeedbackFactory.build_batch(count)
+    session.add_all(feedback_items)
+    session.commit()
+    return feedback_items
 
 
 def create_topics_with_feedback(
+    session: Session,
     topic_count: int = 3,
     feedback_per_topic: int = 5
 ) -> tuple[List[Topic], List[Feedback]]:
-    """Create topics and associated feedback for testing."""
-    topics = TopicFactory.create_batch(topic_count)
-
-    all_feedback = []
-    for topic in topics:
-        # Create feedback and annotations linked to this topic
-        feedback_items = FeedbackFactory.create_batch(feedback_per_topic)
-        for feedback in feedback_items:
-            NLPAnnotationFactory.create(
+    """Create topics and associated feedback for testing.
+
+    Everything is built in memory, linked through the ORM relationships and
+    added to ``session`` together, then written with a single commit.
+    """
+    topics = TopicFactory.build_batch(topic_count)
+
+    # Draw every annotation value up front instead of evaluating factory
+    # declarations per instance
+    rng = np.random.default_rng(42)
+    shape = (topic_count, feedback_per_topic)
+    sentiments = rng.choice([-1, 0, 1], size=shape).tolist()
+    sentiment_scores = rng.random(size=shape).tolist()
+    toxicity_scores = rng.random(size=shape).tolist()
+
+    all_feedback = FeedbackFactory.build_batch(topic_count * feedback_per_topic)
+    annotations = []
+    for i, topic in enumerate(topics):
+        topic_feedback = all_feedback[i * feedback_per_topic:(i + 1) * feedback_per_topic]
+        for j, feedback in enumerate(topic_feedback):
+            annotations.append(NLPAnnotation(
                 feedback=feedback,
                 topic=topic,
-                sentiment=factory.Faker("random_element", elements=[-1, 0, 1]),
-                sentiment_score=factory.Faker("pyfloat", min_value=0.0, max_value=1.0)
-            )
-        all_feedback.extend(feedback_items)
+                sentiment=sentiments[i][j],
+                sentiment_score=sentiment_scores[i][j],
+                toxicity_score=toxicity_scores[i][j]
+            ))
+
+    session.add_all(topics)
+    session.add_all(all_feedback)
+    session.add_all(annotations)
+    session.commit()
 
     return topics, all_feedback
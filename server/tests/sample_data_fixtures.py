@@ -2,28 +2,96 @@
 Sample data fixtures for testing.
 """
 import json
-import csv
 import os
-from typing import List, Dict, Any
+from functools import lru_cache
+from itertools import islice
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple
 from datetime import datetime, timezone
 
+import pandas as pd
 
-def load_sample_feedback_from_jsonl(file_path: str = None) -> List[Dict[str, Any]]:
-    """Load sample feedback data from JSONL file."""
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import ciso8601
+    CISO8601_AVAILABLE = True
+except ImportError:
+    CISO8601_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+CSV_STRING_COLUMNS = ("source", "text", "customer_id", "user_agent", "ip_address")
+
+
+@lru_cache(maxsize=4096)
+def _parse_timestamp(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp, accepting a trailing 'Z' for UTC.
+
+    Cached, since fixture timestamps repeat heavily; datetimes are immutable
+    so sharing them between items is safe.
+    """
+    if CISO8601_AVAILABLE:
+        return ciso8601.parse_datetime(value)
+    if value.endswith('Z'):
+        return datetime.fromisoformat(value[:-1] + '+00:00')
+    return datetime.fromisoformat(value)
+
+
+def load_sample_feedback_from_jsonl(
+    file_path: str = None,
+    fields: Optional[Set[str]] = None
+) -> Iterator[Dict[str, Any]]:
+    """Stream sample feedback data from JSONL file, keeping only ``fields`` if given."""
     if file_path is None:
         file_path = os.path.join(os.path.dirname(__file__), "test_data", "sample_feedback.jsonl")
 
-    feedback_items = []
-    with open(file_path, 'r', encoding='utf-8') as f:
+    with open(file_path, 'rb') as f:
         for line in f:
-            if line.strip():
-                item = json.loads(line.strip())
-                # Parse the created_at string to datetime
-                if isinstance(item.get('created_at'), str):
-                    item['created_at'] = datetime.fromisoformat(item['created_at'].replace('Z', '+00:00'))
-                feedback_items.append(item)
+            if not line.strip():
+                continue
+            # Parsed per line (orjson when installed)
+            item = _json_loads(line)
+            if fields is not None:
+                item = {key: item[key] for key in fields if key in item}
+
+            # Parse the created_at string to datetime
+            if isinstance(item.get('created_at'), str):
+                item['created_at'] = _parse_timestamp(item['created_at'])
+
+            yield item
+
+
+def _read_csv_columns_arrow(file_path: str) -> Dict[str, List[Any]]:
+    """Parse the CSV into columns with pyarrow, reading the file through a memory map."""
+    convert_options = pa_csv.ConvertOptions(
+        column_types={
+            "created_at": pa.timestamp("us", tz="UTC"),
+            **{name: pa.string() for name in CSV_STRING_COLUMNS}
+        }
+    )
+    with pa.memory_map(file_path, "r") as source:
+        table = pa_csv.read_csv(source, convert_options=convert_options)
+    return {name: table[name].to_pylist() for name in ("created_at",) + CSV_STRING_COLUMNS}
 
-    return feedback_items
+
+def _read_csv_columns_pandas(file_path: str) -> Dict[str, List[Any]]:
+    """Parse the CSV into columns with pandas, converting all timestamps in one call."""
+    # Keep every field but created_at as the raw string
+    df = pd.read_csv(file_path, dtype=str, keep_default_na=False, encoding='utf-8')
+    columns = {name: df[name].tolist() for name in CSV_STRING_COLUMNS}
+    columns["created_at"] = list(
+        pd.to_datetime(df['created_at'], utc=True, format='ISO8601').array.to_pydatetime()
+    )
+    return columns
 
 
 def load_sample_feedback_from_csv(file_path: str = None) -> List[Dict[str, Any]]:
@@ -31,134 +99,161 @@ def load_sample_feedback_from_csv(file_path: str = None) -> List[Dict[str, Any]]
     if file_path is None:
         file_path = os.path.join(os.path.dirname(__file__), "test_data", "sample_feedback.csv")
 
-    feedback_items = []
-    with open(file_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Convert CSV fields to match expected format
-            item = {
-                'source': row['source'],
-                'text': row['text'],
-                'customer_id': row['customer_id'],
-                'created_at': datetime.fromisoformat(row['created_at'].replace('Z', '+00:00')),
-                'meta': {
-                    'user_agent': row['user_agent'],
-                    'ip_address': row['ip_address']
-                }
+    # Columnar parse in C (pyarrow when installed, else pandas), then one zip into rows
+    if PYARROW_AVAILABLE:
+        columns = _read_csv_columns_arrow(file_path)
+    else:
+        columns = _read_csv_columns_pandas(file_path)
+
+    # Convert CSV fields to match expected format
+    return [
+        {
+            'source': source,
+            'text': text,
+            'customer_id': customer_id,
+            'created_at': created,
+            'meta': {
+                'user_agent': user_agent,
+                'ip_address': ip_address
             }
-            feedback_items.append(item)
+        }
+        for source, text, customer_id, created, user_agent, ip_address in zip(
+            columns['source'], columns['text'], columns['customer_id'],
+            columns['created_at'], columns['user_agent'], columns['ip_address']
+        )
+    ]
 
-    return feedback_items
+
+def _copy_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a sample item, including its nested meta dict (datetimes are immutable)."""
+    copied = dict(item)
+    if "meta" in copied:
+        copied["meta"] = dict(copied["meta"])
+    return copied
+
+
+@lru_cache(maxsize=2)
+def _cached_sample_feedback(format: str) -> Tuple[Dict[str, Any], ...]:
+    """Parse a bundled sample file once; later batches are sliced from it."""
+    if format == "csv":
+        return tuple(load_sample_feedback_from_csv())
+    return tuple(load_sample_feedback_from_jsonl())
 
 
 def get_sample_feedback_batch(size: int = 10, format: str = "jsonl") -> List[Dict[str, Any]]:
     """Get a batch of sample feedback data."""
-    if format == "csv":
-        data = load_sample_feedback_from_csv()
-    else:
-        data = load_sample_feedback_from_jsonl()
+    rows = _cached_sample_feedback("csv" if format == "csv" else "jsonl")
+    return [_copy_item(item) for item in islice(rows, size)]
 
-    return data[:size]
 
+# Built once at import; the getters hand out copies, so no call reconstructs
+# the literals and no test can modify another test's data
+_DIVERSE_FEEDBACK = (
+    {
+        "source": "website",
+        "text": "This product exceeded my expectations! The quality is outstanding.",
+        "customer_id": "positive_001",
+        "created_at": datetime(2024, 1, 15, 10, 30, 0, tzinfo=timezone.utc),
+        "meta": {"rating": 5}
+    },
+    {
+        "source": "mobile_app",
+        "text": "Terrible experience. App crashes constantly and customer service is unresponsive.",
+        "customer_id": "negative_001",
+        "created_at": datetime(2024, 1, 15, 11, 45, 0, tzinfo=timezone.utc),
+        "meta": {"rating": 1}
+    },
+    {
+        "source": "survey",
+        "text": "It's okay, nothing special but it gets the job done.",
+        "customer_id": "neutral_001",
+        "created_at": datetime(2024, 1, 15, 14, 20, 0, tzinfo=timezone.utc),
+        "meta": {"rating": 3}
+    },
+    {
+        "source": "support_ticket",
+        "text": "Great support! They helped me immediately and were very knowledgeable.",
+        "customer_id": "positive_002",
+        "created_at": datetime(2024, 1, 15, 16, 10, 0, tzinfo=timezone.utc),
+        "meta": {"resolution_time": "5min"}
+    },
+    {
+        "source": "social_media",
+        "text": "Overpriced for what you get. Not worth the money.",
+        "customer_id": "negative_002",
+        "created_at": datetime(2024, 1, 15, 18, 30, 0, tzinfo=timezone.utc),
+        "meta": {"platform": "twitter"}
+    }
+)
 
-def get_diverse_feedback_sample() -> List[Dict[str, Any]]:
-    """Get a diverse sample of feedback for comprehensive testing."""
-    return [
+_FEEDBACK_BY_TOPIC = {
+    "product_quality": [
         {
             "source": "website",
-            "text": "This product exceeded my expectations! The quality is outstanding.",
-            "customer_id": "positive_001",
-            "created_at": datetime(2024, 1, 15, 10, 30, 0, tzinfo=timezone.utc),
-            "meta": {"rating": 5}
+            "text": "The build quality is excellent, feels very premium.",
+            "customer_id": "pq_001",
+            "created_at": datetime(2024, 1, 15, 10, 0, 0, tzinfo=timezone.utc)
         },
+        {
+            "source": "survey",
+            "text": "Product durability is impressive, still works perfectly after years.",
+            "customer_id": "pq_002",
+            "created_at": datetime(2024, 1, 15, 11, 0, 0, tzinfo=timezone.utc)
+        }
+    ],
+    "technical_issues": [
         {
             "source": "mobile_app",
-            "text": "Terrible experience. App crashes constantly and customer service is unresponsive.",
-            "customer_id": "negative_001",
-            "created_at": datetime(2024, 1, 15, 11, 45, 0, tzinfo=timezone.utc),
-            "meta": {"rating": 1}
+            "text": "App keeps freezing and crashing randomly.",
+            "customer_id": "ti_001",
+            "created_at": datetime(2024, 1, 15, 12, 0, 0, tzinfo=timezone.utc)
         },
         {
-            "source": "survey",
-            "text": "It's okay, nothing special but it gets the job done.",
-            "customer_id": "neutral_001",
-            "created_at": datetime(2024, 1, 15, 14, 20, 0, tzinfo=timezone.utc),
-            "meta": {"rating": 3}
+            "source": "support_ticket",
+            "text": "Software has multiple bugs that prevent normal usage.",
+            "customer_id": "ti_002",
+            "created_at": datetime(2024, 1, 15, 13, 0, 0, tzinfo=timezone.utc)
+        }
+    ],
+    "customer_service": [
+        {
+            "source": "social_media",
+            "text": "Customer service was amazing, resolved my issue quickly.",
+            "customer_id": "cs_001",
+            "created_at": datetime(2024, 1, 15, 14, 0, 0, tzinfo=timezone.utc)
         },
         {
-            "source": "support_ticket",
-            "text": "Great support! They helped me immediately and were very knowledgeable.",
-            "customer_id": "positive_002",
-            "created_at": datetime(2024, 1, 15, 16, 10, 0, tzinfo=timezone.utc),
-            "meta": {"resolution_time": "5min"}
+            "source": "survey",
+            "text": "Support team is knowledgeable and very helpful.",
+            "customer_id": "cs_002",
+            "created_at": datetime(2024, 1, 15, 15, 0, 0, tzinfo=timezone.utc)
+        }
+    ],
+    "pricing": [
+        {
+            "source": "website",
+            "text": "Great value for money, competitive pricing.",
+            "customer_id": "pr_001",
+            "created_at": datetime(2024, 1, 15, 16, 0, 0, tzinfo=timezone.utc)
         },
         {
             "source": "social_media",
-            "text": "Overpriced for what you get. Not worth the money.",
-            "customer_id": "negative_002",
-            "created_at": datetime(2024, 1, 15, 18, 30, 0, tzinfo=timezone.utc),
-            "meta": {"platform": "twitter"}
+            "text": "Too expensive compared to similar products.",
+            "customer_id": "pr_002",
+            "created_at": datetime(2024, 1, 15, 17, 0, 0, tzinfo=timezone.utc)
         }
     ]
+}
+
+
+def get_diverse_feedback_sample() -> List[Dict[str, Any]]:
+    """Get a diverse sample of feedback for comprehensive testing."""
+    return [_copy_item(item) for item in _DIVERSE_FEEDBACK]
 
 
 def get_feedback_with_topics() -> Dict[str, List[Dict[str, Any]]]:
     """Get sample feedback organized by topics for topic modeling tests."""
     return {
-        "product_quality": [
-            {
-                "source": "website",
-                "text": "The build quality is excellent, feels very premium.",
-                "customer_id": "pq_001",
-                "created_at": datetime(2024, 1, 15, 10, 0, 0, tzinfo=timezone.utc)
-            },
-            {
-                "source": "survey",
-                "text": "Product durability is impressive, still works perfectly after years.",
-                "customer_id": "pq_002",
-                "created_at": datetime(2024, 1, 15, 11, 0, 0, tzinfo=timezone.utc)
-            }
-        ],
-        "technical_issues": [
-            {
-                "source": "mobile_app",
-                "text": "App keeps freezing and crashing randomly.",
-                "customer_id": "ti_001",
-                "created_at": datetime(2024, 1, 15, 12, 0, 0, tzinfo=timezone.utc)
-            },
-            {
-                "source": "support_ticket",
-                "text": "Software has multiple bugs that prevent normal usage.",
-                "customer_id": "ti_002",
-                "created_at": datetime(2024, 1, 15, 13, 0, 0, tzinfo=timezone.utc)
-            }
-        ],
-        "customer_service": [
-            {
-                "source": "social_media",
-                "text": "Customer service was amazing, resolved my issue quickly.",
-                "customer_id": "cs_001",
-                "created_at": datetime(2024, 1, 15, 14, 0, 0, tzinfo=timezone.utc)
-            },
-            {
-                "source": "survey",
-                "text": "Support team is knowledgeable and very helpful.",
-                "customer_id": "cs_002",
-                "created_at": datetime(2024, 1, 15, 15, 0, 0, tzinfo=timezone.utc)
-            }
-        ],
-        "pricing": [
-            {
-                "source": "website",
-                "text": "Great value for money, competitive pricing.",
-                "customer_id": "pr_001",
-                "created_at": datetime(2024, 1, 15, 16, 0, 0, tzinfo=timezone.utc)
-            },
-            {
-                "source": "social_media",
-                "text": "Too expensive compared to similar products.",
-                "customer_id": "pr_002",
-                "created_at": datetime(2024, 1, 15, 17, 0, 0, tzinfo=timezone.utc)
-            }
-        ]
+        topic: [_copy_item(item) for item in items]
+        for topic, items in _FEEDBACK_BY_TOPIC.items()
     }
@@ -3,47 +3,14 @@ Unit tests for admin endpoints - topic relabeling and audit logging.
 """
 
 import pytest
-from unittest.mock import Mock, MagicMock, patch
+from unittest.mock import Mock, MagicMock
 from datetime import datetime
-from fastapi.testclient import TestClient
 from fastapi import FastAPI
-from sqlalchemy.orm import Session
 
-from app.main import app
 from app.models import Topic, TopicAuditLog
-from app.repositories import TopicRepository
 from app.services.auth_service import auth_service
 
 
-@pytest.fixture
-def client():
-    """Test client fixture."""
-    return TestClient(app)
-
-
-@pytest.fixture
-def mock_db_session():
-    """Mock database session fixture."""
-    return MagicMock(spec=Session)
-
-
-@pytest.fixture
-def topic_repo(mock_db_session):
-    """Topic repository fixture."""
-    return TopicRepository(mock_db_session)
-
-
-@pytest.fixture
-def valid_token():
-    """Valid JWT token for testing."""
-    token_data = {
-        "sub": "admin",
-        "is_admin": True,
-        "role": "admin"
-    }
-    return auth_service.create_access_token(token_data)
-
-
 class TestAdminAuthentication:
     """Test admin authentication endpoints."""
 
@@ -103,7 +70,7 @@ class TestTopicRepository:
 
     def test_update_topic_label_success(self, topic_repo, mock_db_session):
         """Test successful topic label update with audit logging."""
-        # Mock existing topic
+        # Mock existing topic; built here rather than shared, since the update mutates it
         mock_topic = Topic(
             id=1,
             label="Old Label",
@@ -211,118 +178,98 @@ class TestTopicRepository:
 class TestAdminEndpoints:
     """Test admin API endpoints."""
 
-    def test_relabel_topic_success(self, client, valid_token, mock_db_session):
+    def test_relabel_topic_success(self, client, valid_token, mock_db_session, mock_topic_repo, sample_topic):
         """Test successful topic relabeling."""
-        # Mock topic
-        mock_topic = Topic(
+        # Mock repository
+        mock_topic_repo.get_topic_by_id.return_value = sample_topic
+        mock_topic_repo.update_topic_label.return_value = Topic(
             id=1,
-            label="Old Label",
-            keywords=["old"],
+            label="New Label",
+            keywords=["new"],
             updated_at=datetime.utcnow()
         )
 
-        # Mock repository
-        with patch('app.repositories.TopicRepository') as mock_repo_class:
-            mock_repo = MagicMock()
-            mock_repo.get_topic_by_id.return_value = mock_topic
-            mock_repo.update_topic_label.return_value = Topic(
-                id=1,
-                label="New Label",
-                keywords=["new"],
-                updated_at=datetime.utcnow()
-            )
-            mock_repo_class.return_value = mock_repo
-
-            response = client.post(
-                "/admin/relabel-topic",
-                headers={"Authorization": f"Bearer {valid_token}"},
-                json={
-                    "topic_id": 1,
-                    "new_label": "New Label",
-                    "new_keywords": ["new", "keywords"]
-                }
-            )
+        response = client.post(
+            "/admin/relabel-topic",
+            headers={"Authorization": f"Bearer {valid_token}"},
+            json={
+                "topic_id": 1,
+                "new_label": "New Label",
+                "new_keywords": ["new", "keywords"]
+            }
+        )
 
-            assert response.status_code == 200
-            data = response.json()
-            assert data["topic_id"] == 1
-            assert data["old_label"] == "Old Label"
-            assert data["new_label"] == "New Label"
-            assert data["old_keywords"] == ["old"]
-            assert data["new_keywords"] == ["new"]
+        assert response.status_code == 200
+        data = response.json()
+        assert data["topic_id"] == 1
+        assert data["old_label"] == "Old Label"
+        assert data["new_label"] == "New Label"
+        assert data["old_keywords"] == ["old"]
+        assert data["new_keywords"] == ["new"]
 
-    def test_relabel_topic_not_found(self, client, valid_token):
+    def test_relabel_topic_not_found(self, client, valid_token, mock_topic_repo):
         """Test relabeling non-existent topic."""
-        with patch('app.repositories.TopicRepository') as mock_repo_class:
-            mock_repo = MagicMock()
-            mock_repo.get_topic_by_id.return_value = None
-            mock_repo_class.return_value = mock_repo
-
-            response = client.post(
-                "/admin/relabel-topic",
-                headers={"Authorization": f"Bearer {valid_token}"},
-                json={
-                    "topic_id": 999,
-                    "new_label": "New Label",
-                    "new_keywords": ["new"]
-                }
-            )
+        mock_topic_repo.get_topic_by_id.return_value = None
 
-            assert response.status_code == 404
-            assert "not found" in response.json()["detail"]
+        response = client.post(
+            "/admin/relabel-topic",
+            headers={"Authorization": f"Bearer {valid_token}"},
+            json={
+                "topic_id": 999,
+                "new_label": "New Label",
+                "new_keywords": ["new"]
+            }
+        )
 
-    def test_get_topic_audit_history(self, client, valid_token):
+        assert response.status_code == 404
+        assert "not found" in response.json()["detail"]
+
+    def test_get_topic_audit_history(self, client, valid_token, mock_topic_repo):
         """Test getting topic audit history."""
-        with patch('app.repositories.TopicRepository') as mock_repo_class:
-            mock_repo = MagicMock()
-            mock_repo.get_topic_audit_history.return_value = [
-                {
-                    "id": 1,
-                    "action": "update",
-                    "old_label": "Old",
-                    "new_label": "New",
-                    "changed_by": "admin",
-                    "changed_at": "2024-01-01T00:00:00"
-                }
-            ]
-            mock_repo_class.return_value = mock_repo
-
-            response = client.get(
-                "/admin/topic-audit/1",
-                headers={"Authorization": f"Bearer {valid_token}"}
-            )
+        mock_topic_repo.get_topic_audit_history.return_value = [
+            {
+                "id": 1,
+                "action": "update",
+                "old_label": "Old",
+                "new_label": "New",
+                "changed_by": "admin",
+                "changed_at": "2024-01-01T00:00:00"
+            }
+        ]
+
+        response = client.get(
+            "/admin/topic-audit/1",
+            headers={"Authorization": f"Bearer {valid_token}"}
+        )
 
-            assert response.status_code == 200
-            data = response.json()
-            assert data["topic_id"] == 1
-            assert len(data["audit_logs"]) == 1
-            assert data["audit_logs"][0]["action"] == "update"
+        assert response.status_code == 200
+        data = response.json()
+        assert data["topic_id"] == 1
+        assert len(data["audit_logs"]) == 1
+        assert data["audit_logs"][0]["action"] == "update"
 
-    def test_get_recent_audit_logs(self, client, valid_token):
+    def test_get_recent_audit_logs(self, client, valid_token, mock_topic_repo):
         """Test getting recent audit logs."""
-        with patch('app.repositories.TopicRepository') as mock_repo_class:
-            mock_repo = MagicMock()
-            mock_repo.get_recent_audit_logs.return_value = [
-                {
-                    "id": 1,
-                    "topic_id": 1,
-                    "topic_label": "Test Topic",
-                    "action": "update",
-                    "changed_by": "admin",
-                    "changed_at": "2024-01-01T00:00:00"
-                }
-            ]
-            mock_repo_class.return_value = mock_repo
-
-            response = client.get(
-                "/admin/topic-audit",
-                headers={"Authorization": f"Bearer {valid_token}"}
-            )
+        mock_topic_repo.get_recent_audit_logs.return_value = [
+            {
+                "id": 1,
+                "topic_id": 1,
+                "topic_label": "Test Topic",
+                "action": "update",
+                "changed_by": "admin",
+                "changed_at": "2024-01-01T00:00:00"
+            }
+        ]
+
+        response = client.get(
+            "/admin/topic-audit",
+            headers={"Authorization": f"Bearer {valid_token}"}
+        )
 
-            assert response.status_code == 200
-            data = response.json()
-            assert len(data) == 1
-            assert data[0]["topic_label"] == "Test Topic"
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) == 1
+        assert data[0]["topic_label"] == "Test Topic"
 
 
 class TestAuthService:
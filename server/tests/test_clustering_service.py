@@ -5,7 +5,15 @@ Unit tests for clustering service - HDBSCAN, UMAP, keyword extraction.
 import pytest
 import numpy as np
 from unittest.mock import Mock, patch, MagicMock
-from app.services.clustering_service import ClusteringService
+from app.services.clustering_service import ClusteringService, _similarity_mirrors
+
+
+@pytest.fixture(autouse=True)
+def clear_similarity_mirrors():
+    """Start every test without collections mirrored by earlier tests."""
+    _similarity_mirrors.clear()
+    yield
+    _similarity_mirrors.clear()
 
 
 class TestClusteringService:
@@ -210,6 +218,21 @@ class TestClusteringService:
         assert "keywords" in result["cluster_0"]
         assert "label" in result["cluster_0"]
 
+    def test_cluster_keywords_cached_by_centroid(self):
+        """Test keywords are reused for a repeated cluster centroid."""
+        service = ClusteringService()
+        service.nltk_available = False
+
+        mock_clusters = {"cluster_0": [0, 1, 2, 3, 4, 5]}
+        service.cluster_texts = Mock(return_value=(mock_clusters, np.random.rand(6, 384), None))
+        service.extract_keywords = Mock(return_value=["keyword1", "keyword2"])
+
+        first = service.cluster_texts_with_keywords(["text"] * 6)
+        second = service.cluster_texts_with_keywords(["text"] * 6)
+
+        assert service.extract_keywords.call_count == 1
+        assert first["cluster_0"]["keywords"] == second["cluster_0"]["keywords"]
+
     def test_preprocess_text(self):
         """Test text preprocessing for keyword extraction."""
         service = ClusteringService()
@@ -263,6 +286,48 @@ class TestClusteringService:
             assert reduced.shape == (10, 5)
             mock_umap_instance.fit_transform.assert_called_once()
 
+    def test_overlapping_batches_store_each_text_once(self):
+        """Test document ids come from each text and already stored texts are skipped."""
+        service = ClusteringService()
+        stored_ids = set()
+
+        def store(embeddings, texts, ids, metadata):
+            assert len(embeddings) == len(texts) == len(ids)
+            stored_ids.update(ids)
+            return True
+
+        service.embedding_service.existing_ids = Mock(side_effect=lambda ids: stored_ids & set(ids))
+        service.embedding_service.store_embeddings = Mock(side_effect=store)
+
+        embeddings = np.random.rand(3, 8).astype(np.float32)
+        assert service._store_new_documents(embeddings, ["a", "b", "a"])
+        first_ids = service.embedding_service.store_embeddings.call_args.kwargs["ids"]
+        assert first_ids == [service._document_id("a"), service._document_id("b")]
+
+        assert service._store_new_documents(np.random.rand(2, 8).astype(np.float32), ["b", "c"])
+        assert service.embedding_service.store_embeddings.call_args.kwargs["ids"] == [service._document_id("c")]
+
+        # Nothing new: no write at all
+        assert service._store_new_documents(embeddings, ["c", "a"])
+        assert service.embedding_service.store_embeddings.call_count == 2
+
+    def test_kmeans_normalizes_only_raw_embeddings(self):
+        """Test k-means clusters raw embeddings on the unit sphere but UMAP output as-is."""
+        service = ClusteringService()
+        mock_kmeans = Mock()
+        mock_kmeans.fit_predict.side_effect = lambda points: np.arange(len(points)) % 2
+        service.sklearn = {'KMeans': Mock(return_value=mock_kmeans)}
+
+        points = np.array([[3.0, 4.0], [0.5, 0.0], [0.0, 2.0], [6.0, 8.0]])
+
+        service._cluster_kmeans(points, n_clusters=2, spherical=True)
+        np.testing.assert_allclose(np.linalg.norm(mock_kmeans.fit_predict.call_args[0][0], axis=1), 1.0)
+        assert service.sklearn['KMeans'].call_args.kwargs['n_init'] == 1
+
+        service._cluster_kmeans(points, n_clusters=2)
+        np.testing.assert_array_equal(mock_kmeans.fit_predict.call_args[0][0], points)
+        assert service.sklearn['KMeans'].call_args.kwargs['n_init'] == service.KMEANS_N_INIT
+
     def test_fallback_strategies(self):
         """Test graceful fallback when algorithms are unavailable."""
         service = ClusteringService()
@@ -283,6 +348,103 @@ class TestClusteringService:
         assert len(clusters) > 0
         assert embeddings.shape == (5, 384)
 
+    def test_similarity_threshold_clustering(self):
+        """Test similarity fallback groups near-duplicate embeddings together."""
+        service = ClusteringService()
+
+        base = np.eye(3, 384)
+        embeddings = np.vstack([base[0], base[0] * 2, base[1], base[1] + 0.01, base[2]])
+
+        clusters = service._cluster_similarity_threshold(embeddings)
+
+        assert clusters == {"cluster_0": [0, 1], "cluster_1": [2, 3]}
+
+    def test_similarity_threshold_matches_mean_centroids(self):
+        """Test running-sum centroids give the same clusters as recomputed means."""
+        service = ClusteringService()
+        rng = np.random.default_rng(0)
+        embeddings = np.repeat(rng.normal(size=(4, 32)), 10, axis=0) + rng.normal(scale=0.3, size=(40, 32))
+        embeddings = embeddings[rng.permutation(40)]
+
+        normalized = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+        expected = []
+        for i, embedding in enumerate(normalized):
+            for members in expected:
+                centroid = np.mean(normalized[members], axis=0)
+                if np.dot(embedding, centroid) / np.linalg.norm(centroid) > 0.7:
+                    members.append(i)
+                    break
+            else:
+                expected.append([i])
+
+        clusters = service._cluster_similarity_threshold(embeddings, threshold=0.7)
+
+        assert sorted(clusters.values()) == sorted(m for m in expected if len(m) > 1)
+
+    def _mirrored_collection(self, embeddings, texts):
+        """Mock Chroma collection holding ``embeddings``/``texts`` as feedback documents."""
+        collection = Mock()
+        collection.count.return_value = len(texts)
+        collection.get.return_value = {
+            "ids": [f"feedback_{i}" for i in range(len(texts))],
+            "embeddings": embeddings,
+            "documents": list(texts),
+            "metadatas": [{"feedback_id": str(i)} for i in range(len(texts))],
+        }
+        return collection
+
+    def test_get_similar_texts_in_memory_index(self):
+        """Test similarity search loads small collections once per process and searches in memory."""
+        embeddings = np.eye(3, 8, dtype=np.float32)
+        collection = self._mirrored_collection(embeddings, ["a", "b", "c"])
+        query = embeddings[[1]] + 0.5 * embeddings[[0]]
+
+        # QueryService builds a new ClusteringService for every request
+        for _ in range(2):
+            service = ClusteringService()
+            service.embedding_service.vector_store = None
+            service.embedding_service.chroma_collection = collection
+            service.embedding_service.generate_embeddings = Mock(return_value=query)
+            service.embedding_service.search_similar = Mock(return_value=[])
+
+            results = service.get_similar_texts("query", n_results=2)
+
+            service.embedding_service.search_similar.assert_not_called()
+            assert [r["id"] for r in results] == ["feedback_1", "feedback_0"]
+            assert results[0]["metadata"] == {"feedback_id": "1"}
+            assert results[0]["distance"] < results[1]["distance"]
+
+        collection.get.assert_called_once_with(include=["embeddings", "documents", "metadatas"])
+
+    def test_similarity_index_reloaded_when_count_changes(self):
+        """Test documents stored by another process (e.g. the worker) are picked up on the next search."""
+        embeddings = np.eye(4, 8, dtype=np.float32)
+        collection = self._mirrored_collection(embeddings[:3], ["a", "b", "c"])
+        service = ClusteringService()
+        service.embedding_service.vector_store = None
+        service.embedding_service.chroma_collection = collection
+        service.embedding_service.generate_embeddings = Mock(return_value=embeddings[[3]])
+
+        assert service.get_similar_texts("query", n_results=1)[0]["id"] != "feedback_3"
+
+        collection.get.return_value = self._mirrored_collection(embeddings, ["a", "b", "c", "d"]).get.return_value
+        collection.count.return_value = 4
+
+        assert service.get_similar_texts("query", n_results=1)[0]["id"] == "feedback_3"
+        assert collection.get.call_count == 2
+
+    def test_similarity_index_skipped_for_large_collection(self):
+        """Test collections above SIMILARITY_INDEX_MAX_ROWS are searched through the vector store."""
+        service = ClusteringService()
+        service.embedding_service.vector_store = None
+        service.embedding_service.chroma_collection = Mock()
+        service.embedding_service.chroma_collection.count.return_value = ClusteringService.SIMILARITY_INDEX_MAX_ROWS + 1
+        service.embedding_service.generate_embeddings = Mock(return_value=np.eye(1, 8, dtype=np.float32))
+        service.embedding_service.search_similar = Mock(return_value=[{"id": "feedback_1"}])
+
+        assert service.get_similar_texts("query") == [{"id": "feedback_1"}]
+        service.embedding_service.chroma_collection.get.assert_not_called()
+
     def test_error_handling_clustering(self):
         """Test error handling in clustering algorithms."""
         service = ClusteringService()
@@ -346,3 +508,24 @@ class TestClusteringService:
             assert "https://" not in keyword
             assert "@" not in keyword
             assert "#" not in keyword
+
+    def test_keyword_worker_skips_embedding_stack(self):
+        """Test the joblib keyword worker module imports without the embedding/clustering services."""
+        import subprocess
+        import sys
+
+        code = (
+            "import sys\n"
+            "from app.services.keyword_extraction import _extract_keywords_worker\n"
+            "print(_extract_keywords_worker(['login page crash', 'login crash again'], 2))\n"
+            "print(any(name in sys.modules for name in ("
+            "'app.services.embedding_service', 'app.services.clustering_service')))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        keywords, heavy_imported = result.stdout.strip().splitlines()
+        service = ClusteringService()
+        assert keywords == str(service.extract_keywords(['login page crash', 'login crash again'], 2))
+        assert heavy_imported == "False"
@@ -7,7 +7,7 @@ import numpy as np
 from unittest.mock import Mock, patch, MagicMock
 import tempfile
 import os
-from app.services.embedding_service import EmbeddingService
+from app.services.embedding_service import EmbeddingService, _embedding_caches
 
 
 class TestEmbeddingService:
@@ -120,6 +120,169 @@ class TestEmbeddingService:
             assert call_args[1]['documents'] == texts
             assert call_args[1]['ids'] == ids
 
+    def test_store_embeddings_chroma_chunked(self):
+        """Test ChromaDB inserts are split into CHROMA_ADD_BATCH_SIZE chunks."""
+        with patch('app.services.embedding_service.SENTENCE_TRANSFORMERS_AVAILABLE', False), \
+             patch('app.services.embedding_service.CHROMA_AVAILABLE', False):
+            service = EmbeddingService()
+        service.chroma_collection = Mock()
+        service.CHROMA_ADD_BATCH_SIZE = 2
+
+        texts = [f"text{i}" for i in range(5)]
+        ids = [f"id{i}" for i in range(5)]
+        result = service.store_embeddings_chroma(np.random.rand(5, 384), texts, ids)
+
+        assert result is True
+        calls = service.chroma_collection.add.call_args_list
+        assert [call[1]['ids'] for call in calls] == [["id0", "id1"], ["id2", "id3"], ["id4"]]
+        assert [len(call[1]['embeddings']) for call in calls] == [2, 2, 1]
+
+    def test_search_similar_query_passthrough(self):
+        """Test the query reaches ChromaDB as an array when the client accepts one."""
+        with patch('app.services.embedding_service.SENTENCE_TRANSFORMERS_AVAILABLE', False), \
+             patch('app.services.embedding_service.CHROMA_AVAILABLE', False):
+            service = EmbeddingService()
+        service.chroma_collection = Mock()
+        service.chroma_collection.query.return_value = {
+            'documents': [["doc"]], 'distances': [[0.0]], 'metadatas': [[{}]], 'ids': [["id1"]]
+        }
+        query = np.random.rand(384).astype(np.float32)
+
+        with patch('app.services.embedding_service.CHROMA_ACCEPTS_NDARRAY', True):
+            service.search_similar(query, n_results=1)
+        sent = service.chroma_collection.query.call_args[1]['query_embeddings']
+        assert isinstance(sent, np.ndarray) and sent.shape == (1, 384)
+        np.testing.assert_array_equal(sent[0], query)
+
+        with patch('app.services.embedding_service.CHROMA_ACCEPTS_NDARRAY', False):
+            service.search_similar(query, n_results=1)
+        assert service.chroma_collection.query.call_args[1]['query_embeddings'] == sent.tolist()
+
+    def test_store_and_search_use_faiss_backend(self):
+        """Test storage and search go to the FAISS store when it is configured."""
+        with patch('app.services.embedding_service.SENTENCE_TRANSFORMERS_AVAILABLE', False), \
+             patch('app.services.embedding_service.CHROMA_AVAILABLE', False):
+            service = EmbeddingService()
+        service.vector_store = Mock()
+        service.vector_store.add.return_value = 2
+        service.vector_store.search.return_value = [{"id": "id1", "distance": 0.1}]
+        service.chroma_collection = Mock()
+
+        embeddings = np.random.rand(2, 384)
+        assert service.store_embeddings(embeddings, ["text1", "text2"], ["id1", "id2"]) is True
+        results = service.search_similar(embeddings[0], n_results=1)
+
+        service.vector_store.add.assert_called_once()
+        service.chroma_collection.add.assert_not_called()
+        assert results == [{"id": "id1", "distance": 0.1}]
+
+    def test_model_shared_between_instances(self):
+        """Test the model is loaded once per process and reused by later instances."""
+        with patch('app.services.embedding_service.SENTENCE_TRANSFORMERS_AVAILABLE', True), \
+             patch('app.services.embedding_service.CHROMA_AVAILABLE', False), \
+             patch('app.services.embedding_service.SentenceTransformer', create=True) as mock_model_class, \
+             patch.dict('app.services.embedding_service._shared_models', clear=True), \
+             patch.dict(os.environ, {"EMBEDDING_BACKEND": "torch", "EMBED_DTYPE": "fp32"}):
+
+            first = EmbeddingService()
+            second = EmbeddingService()
+
+            assert mock_model_class.call_count == 1
+            assert first.model is second.model
+
+    def test_torch_compile_warmup_and_fallback(self):
+        """Test the encoder is compiled and warmed up, and restored if compilation fails."""
+        with patch('app.services.embedding_service.SENTENCE_TRANSFORMERS_AVAILABLE', False), \
+             patch('app.services.embedding_service.CHROMA_AVAILABLE', False):
+            service = EmbeddingService()
+
+        transformer = Mock()
+        eager = transformer.auto_model
+        model = MagicMock()
+        model.__getitem__.return_value = transformer
+        mock_torch = Mock()
+
+        with patch.dict('sys.modules', {'torch': mock_torch}):
+            service._compile_torch_model(model)
+
+            assert transformer.auto_model is mock_torch.compile.return_value
+            assert model.encode.call_count == sum(
+                length <= service.MAX_SEQ_LENGTH for length in service.TORCH_COMPILE_WARMUP_LENGTHS
+            )
+
+            transformer.auto_model = eager
+            model.encode.side_effect = RuntimeError("inductor failed")
+            service._compile_torch_model(model)
+
+            assert transformer.auto_model is eager
+
+    def test_generate_embeddings_cached(self):
+        """Test repeated texts are encoded once and served from the cache."""
+        with patch('app.services.embedding_service.SENTENCE_TRANSFORMERS_AVAILABLE', False), \
+             patch('app.services.embedding_service.CHROMA_AVAILABLE', False):
+            service = EmbeddingService()
+
+        mock_model = Mock()
+        mock_model.encode.side_effect = lambda texts, **kwargs: np.random.rand(len(texts), 384)
+        service.model = mock_model
+
+        first = service.generate_embeddings(["a", "b", "a"])
+        second = service.generate_embeddings(["b", "c"])
+
+        assert mock_model.encode.call_args_list[0][0][0] == ["a", "b"]
+        assert mock_model.encode.call_args_list[1][0][0] == ["c"]
+        np.testing.assert_array_equal(first[0], first[2])
+        np.testing.assert_array_equal(first[1], second[0])
+        assert first.dtype == np.float32 and second.dtype == np.float32
+
+        # Cached rows own their data rather than viewing the encoded batch
+        cache = _embedding_caches[mock_model]
+        assert all(vector.base is None for vector in cache.values())
+
+    def test_generate_embeddings_uncached_dedupes_batch(self):
+        """Test duplicate texts are encoded once even with the cache disabled."""
+        with patch('app.services.embedding_service.SENTENCE_TRANSFORMERS_AVAILABLE', False), \
+             patch('app.services.embedding_service.CHROMA_AVAILABLE', False):
+            service = EmbeddingService()
+
+        mock_model = Mock()
+        mock_model.encode.side_effect = lambda texts, **kwargs: np.random.rand(len(texts), 384)
+        service.model = mock_model
+
+        embeddings = service.generate_embeddings(["a", "b", "a", "c", "b"], use_cache=False)
+
+        assert mock_model.encode.call_args[0][0] == ["a", "b", "c"]
+        assert embeddings.shape == (5, 384)
+        np.testing.assert_array_equal(embeddings[0], embeddings[2])
+        np.testing.assert_array_equal(embeddings[1], embeddings[4])
+
+    def test_configure_cpu_threads_keeps_explicit_settings(self):
+        """Test entry-point thread setup fills in defaults without overriding the environment."""
+        from app.cpu_threads import configure_cpu_threads, default_thread_count
+
+        with patch.dict(os.environ, {"OMP_NUM_THREADS": "3"}, clear=True):
+            configure_cpu_threads()
+            assert os.environ["OMP_NUM_THREADS"] == "3"
+            assert os.environ["MKL_NUM_THREADS"] == "3"
+            assert os.environ["TOKENIZERS_PARALLELISM"] == "false"
+
+        with patch.dict(os.environ, {}, clear=True):
+            configure_cpu_threads()
+            assert os.environ["OMP_NUM_THREADS"] == str(default_thread_count())
+
+    def test_resolve_torch_dtype_override(self):
+        """Test EMBED_DTYPE selects the model dtype, with no float16 on CPU."""
+        with patch('app.services.embedding_service.SENTENCE_TRANSFORMERS_AVAILABLE', False), \
+             patch('app.services.embedding_service.CHROMA_AVAILABLE', False):
+            service = EmbeddingService()
+
+        with patch.dict(os.environ, {"EMBED_DTYPE": "bf16"}):
+            assert service._resolve_torch_dtype("cpu") == "bfloat16"
+
+        with patch.dict(os.environ, {"EMBED_DTYPE": "fp16"}):
+            assert service._resolve_torch_dtype("cpu") == "float32"
+            assert service._resolve_torch_dtype("cuda") == "float16"
+
     @patch('app.services.embedding_service.CHROMA_AVAILABLE', True)
     def test_store_embeddings_chroma_no_collection(self):
         """Test ChromaDB storage when collection is not available."""
@@ -224,28 +387,22 @@ class TestEmbeddingService:
              patch('sentence_transformers.SentenceTransformer') as mock_model_class:
 
             mock_model = Mock()
-            # Mock encode to return different results for different batch sizes
-            def mock_encode(texts, **kwargs):
-                batch_size = len(texts)
-                return np.random.rand(batch_size, 384)
-
-            mock_model.encode = mock_encode
+            mock_model.encode.side_effect = lambda texts, **kwargs: np.random.rand(len(texts), 384)
             mock_model_class.return_value = mock_model
 
             service = EmbeddingService()
             service.model = mock_model
 
-            # Test with different batch sizes
             texts = ["text"] * 100
 
-            # Should process in batches of 32 (default)
             embeddings = service.generate_embeddings(texts, batch_size=32)
 
             assert embeddings is not None
             assert embeddings.shape == (100, 384)
 
-            # Should have been called multiple times for batching
-            assert mock_model.encode.call_count > 1
+            # Batching is delegated to a single encode call so it can sort by length
+            mock_model.encode.assert_called_once()
+            assert mock_model.encode.call_args[1]['batch_size'] == 32
 
     def test_truncation_handling(self):
         """Test that long texts are properly truncated."""
@@ -303,3 +460,89 @@ class TestEmbeddingService:
             result = service.store_embeddings_chroma(embeddings, ["text"], ["id"])
 
             assert result is False
+
+
+class TestFaissVectorStore:
+    """Test FAISS store persistence across processes and restarts."""
+
+    @pytest.fixture(autouse=True)
+    def _require_faiss(self):
+        pytest.importorskip("faiss")
+
+    def test_add_persists_without_explicit_save(self):
+        """Test vectors added by one store are found by a store opened later."""
+        from app.services.faiss_vector_store import FaissVectorStore
+
+        with tempfile.TemporaryDirectory() as path:
+            embeddings = np.random.rand(3, 8).astype(np.float32)
+            FaissVectorStore(8, path).add(embeddings, ["a", "b", "c"], ["id0", "id1", "id2"])
+
+            reopened = FaissVectorStore(8, path)
+            assert reopened.count() == 3
+            assert reopened.search(embeddings[1], n_results=1)[0]["id"] == "id1"
+
+    def test_concurrent_writers_keep_each_others_vectors(self):
+        """Test two stores on one directory (as in server and worker) don't overwrite each other."""
+        from app.services.faiss_vector_store import FaissVectorStore
+
+        with tempfile.TemporaryDirectory() as path:
+            first = FaissVectorStore(8, path)
+            second = FaissVectorStore(8, path)
+            first.add(np.random.rand(2, 8), ["a", "b"], ["id0", "id1"])
+            second.add(np.random.rand(2, 8), ["c", "d"], ["id2", "id3"])
+
+            assert first.count() == 4
+            assert FaissVectorStore(8, path).count() == 4
+
+    def test_add_does_not_rewrite_index_file(self):
+        """Test adds only touch the sidecar and the in-memory index until the store is saved."""
+        from app.services.faiss_vector_store import FaissVectorStore
+
+        with tempfile.TemporaryDirectory() as path:
+            store = FaissVectorStore(8, path)
+            store.add(np.random.rand(2, 8), ["a", "b"], ["id0", "id1"])
+            assert not os.path.exists(store.index_path)
+
+            assert store.save()
+            assert not store.save()
+            saved_at = os.stat(store.index_path).st_mtime_ns
+            store.add(np.random.rand(1, 8), ["c"], ["id2"])
+            assert os.stat(store.index_path).st_mtime_ns == saved_at
+
+    def test_unsaved_vectors_restored_on_load(self):
+        """Test vectors added after the last save are re-indexed from the sidecar."""
+        from app.services.faiss_vector_store import FaissVectorStore
+
+        with tempfile.TemporaryDirectory() as path:
+            embeddings = np.random.rand(3, 8).astype(np.float32)
+            store = FaissVectorStore(8, path)
+            store.add(embeddings[:2], ["a", "b"], ["id0", "id1"])
+            store.save()
+            store.add(embeddings[2:], ["c"], ["id2"])
+
+            reopened = FaissVectorStore(8, path)
+            assert reopened.count() == 3
+            assert reopened.search(embeddings[2], n_results=1)[0]["id"] == "id2"
+
+            # A lost index file is rebuilt from the sidecar as well
+            os.remove(store.index_path)
+            assert FaissVectorStore(8, path).count() == 3
+
+    def test_scalar_quantized_index_rebuilt_when_setting_changes(self):
+        """Test the int8 HNSW index searches like the float one and switching settings rebuilds it."""
+        import faiss
+        from app.services.faiss_vector_store import FaissVectorStore
+
+        with tempfile.TemporaryDirectory() as path:
+            embeddings = np.random.rand(20, 8).astype(np.float32) - 0.5
+            with patch.object(FaissVectorStore, 'SCALAR_QUANTIZE', True):
+                store = FaissVectorStore(8, path)
+                store.add(embeddings, [str(i) for i in range(20)], [f"id{i}" for i in range(20)])
+                assert isinstance(faiss.downcast_index(store.index.index), faiss.IndexHNSWSQ)
+                assert store.search(embeddings[7], n_results=1)[0]["id"] == "id7"
+                store.save()
+
+            reopened = FaissVectorStore(8, path)
+            assert isinstance(faiss.downcast_index(reopened.index.index), faiss.IndexHNSWFlat)
+            assert reopened.count() == 20
+            assert reopened.search(embeddings[7], n_results=1)[0]["id"] == "id7"
@@ -284,6 +284,37 @@ class TestBatchProcessing:
             assert len(result["created"]) == 1
             assert len(result["duplicates"]) == 1
 
+    def test_batch_processing_single_duplicate_query(self):
+        """Test a batch checks stored duplicates with one query and tracks in-batch repeats."""
+        from uuid import uuid4
+        existing_id = uuid4()
+        stored_hash = self.repo._generate_content_hash("Stored feedback")
+        feedback_items = [
+            {"text": "Stored feedback"},
+            {"text": "New feedback"},
+            {"text": "New feedback"},
+        ]
+
+        new_feedback = Mock(id=uuid4())
+        new_feedback.created_at.isoformat.return_value = "2024-01-16T10:00:00"
+        existing_feedback = Mock(id=existing_id)
+        existing_feedback.created_at.isoformat.return_value = "2024-01-15T10:00:00"
+
+        with patch.object(self.repo, 'find_existing_hashes', return_value={stored_hash: existing_id}) as mock_find, \
+             patch.object(self.repo, 'check_duplicate') as mock_check, \
+             patch.object(self.repo, 'create_feedback', return_value=new_feedback) as mock_create, \
+             patch.object(self.repo, 'get_feedback_by_id',
+                          side_effect=lambda fid: existing_feedback if fid == existing_id else new_feedback):
+            result = self.repo.create_feedback_batch(feedback_items, "test_source")
+
+        mock_find.assert_called_once()
+        assert len(mock_find.call_args[0][0]) == 3
+        mock_check.assert_not_called()
+        mock_create.assert_called_once()
+        assert result["summary"]["created_count"] == 1
+        assert result["summary"]["duplicate_count"] == 2
+        assert [d["id"] for d in result["duplicates"]] == [str(existing_id), str(new_feedback.id)]
+
     def test_batch_processing_with_errors(self):
         """Test batch processing with validation errors."""
         feedback_items = [
@@ -309,6 +340,27 @@ class TestBatchProcessing:
             assert result["summary"]["error_count"] == 2
             assert len(result["errors"]) == 2
 
+    def test_batch_processing_with_mistyped_fields(self):
+        """Test rows with non-string text or created_at are reported, not fatal."""
+        feedback_items = [
+            {"text": "x", "created_at": 1700000000},
+            {"text": 42},
+            {"text": "Valid text"},
+        ]
+
+        with patch.object(self.repo, 'create_feedback_with_duplicate_check') as mock_create:
+            mock_feedback = Mock()
+            mock_feedback.id = "new-id"
+            mock_feedback.created_at.isoformat.return_value = "2024-01-15T10:00:00"
+            mock_create.return_value = (mock_feedback, False)
+
+            result = self.repo.create_feedback_batch(feedback_items, "test_source")
+
+        assert result["summary"]["created_count"] == 1
+        assert result["summary"]["error_count"] == 2
+        assert [e["index"] for e in result["errors"]] == [0, 1]
+        assert mock_create.call_args.kwargs["text"] == "Valid text"
+
 
 class TestIngestionEndpoint:
     """Test the ingestion endpoint."""
@@ -75,18 +75,13 @@ class TestQueueService:
 
             service = QueueService("redis://localhost:6379")
 
-            # Mock queue with stats
+            # Mock queue; counts come back from a single pipelined round trip
             mock_queue = Mock()
             mock_queue.name = QueueService.QUEUE_INGEST
-            mock_queue.started_job_registry.count = 5
-            mock_queue.finished_job_registry.count = 10
-            mock_queue.failed_job_registry.count = 2
-            mock_queue.deferred_job_registry.count = 1
+            service.queues = {QueueService.QUEUE_INGEST: mock_queue}
 
-            # Mock len(queue)
-            mock_queue.__len__ = Mock(return_value=3)
-
-            service.queues[QueueService.QUEUE_INGEST] = mock_queue
+            mock_pipe = mock_redis.from_url.return_value.pipeline.return_value
+            mock_pipe.execute.return_value = [3, 5, 10, 2, 1]
 
             stats = service.get_queue_stats()
 
@@ -97,6 +92,7 @@ class TestQueueService:
             assert queue_stats["finished_jobs"] == 10
             assert queue_stats["failed_jobs"] == 2
             assert queue_stats["deferred_jobs"] == 1
+            mock_pipe.execute.assert_called_once()
 
 
 def test_func():
@@ -4,8 +4,12 @@ Unit tests for sentiment service - VADER and DistilRoBERTa strategies.
 
 import pytest
 import os
-from unittest.mock import patch, MagicMock
-from app.services.sentiment_service import SentimentService
+import numpy as np
+import tempfile
+from unittest.mock import Mock, patch, MagicMock
+from app.services.sentiment_service import (
+    MiniLMSentimentHead, SentimentService, _classify_compound_numpy, classify_compound
+)
 
 
 class TestSentimentService:
@@ -28,6 +32,43 @@ class TestSentimentService:
                 assert service.roberta_analyzer is not None
                 mock_pipeline.assert_called_once()
 
+    def test_roberta_onnx_backend_falls_back_to_torch(self):
+        """Test the ONNX backend falls back to the PyTorch pipeline when it cannot load."""
+        service = SentimentService.__new__(SentimentService)
+        mock_pipeline = Mock()
+
+        with patch.dict(os.environ, {"SENTIMENT_BACKEND": "onnx"}), \
+             patch.object(SentimentService, '_load_roberta_onnx', side_effect=ImportError("optimum")):
+            service._load_roberta_pipeline(mock_pipeline)
+
+        mock_pipeline.assert_called_once()
+        assert mock_pipeline.call_args[1]['model'] == SentimentService.ROBERTA_MODEL
+
+        onnx_model, tokenizer = Mock(), Mock()
+        mock_pipeline.reset_mock()
+        with patch.dict(os.environ, {"SENTIMENT_BACKEND": "onnx"}), \
+             patch.object(SentimentService, '_load_roberta_onnx', return_value=(onnx_model, tokenizer)):
+            service._load_roberta_pipeline(mock_pipeline)
+
+        assert mock_pipeline.call_args[1]['model'] is onnx_model
+        assert mock_pipeline.call_args[1]['tokenizer'] is tokenizer
+
+    def test_roberta_torch_pipeline_tuning(self):
+        """Test the PyTorch pipeline configures threads and loads bf16 weights when requested."""
+        service = SentimentService.__new__(SentimentService)
+        mock_pipeline = Mock()
+        fake_torch = MagicMock()
+
+        with patch.dict('sys.modules', {'torch': fake_torch, 'intel_extension_for_pytorch': None}), \
+             patch.dict(os.environ, {"SENTIMENT_BACKEND": "torch", "SENTIMENT_DTYPE": "bf16", "OMP_NUM_THREADS": "4"}):
+            service._load_roberta_pipeline(mock_pipeline)
+
+        fake_torch.set_num_threads.assert_called_once_with(4)
+        fake_torch.set_num_interop_threads.assert_called_once_with(1)
+        assert fake_torch.backends.mkldnn.enabled is True
+        assert mock_pipeline.call_args[1]['torch_dtype'] is fake_torch.bfloat16
+        assert mock_pipeline.call_args[1]['device'] == "cpu"
+
     def test_unknown_strategy_fallback(self):
         """Test unknown strategy falls back to VADER."""
         with patch.dict(os.environ, {"SENTIMENT_STRATEGY": "unknown"}):
@@ -110,6 +151,203 @@ class TestSentimentService:
             assert all(isinstance(r[0], int) and -1 <= r[0] <= 1 for r in results)
             assert all(isinstance(r[1], float) and 0 <= r[1] <= 1 for r in results)
 
+    def test_vader_batch_matches_single_text_thresholds(self):
+        """Test vectorized VADER batch labels match the per-text thresholds."""
+        service = SentimentService.__new__(SentimentService)
+        service.strategy = "vader"
+        compounds = {"good": 0.6, "edge": 0.05, "flat": 0.01, "bad": -0.05, "awful": -0.9}
+        service.vader_analyzer = Mock()
+        service.vader_analyzer.polarity_scores.side_effect = lambda text: {"compound": compounds[text]}
+
+        texts = ["good", "edge", "", "flat", "bad", "awful"]
+        results = service.analyze_batch(texts)
+
+        assert results == [(1, 0.6), (1, 0.05), (0, 0.0), (0, 0.01), (-1, 0.05), (-1, 0.9)]
+        assert all(isinstance(r[0], int) and isinstance(r[1], float) for r in results)
+        assert results == [service.analyze_sentiment(text) for text in texts]
+
+    def test_classify_compound_kernels_agree(self):
+        """Test the compiled compound classifier matches the numpy fallback."""
+        compounds = np.array([0.6, 0.05, 0.049, 0.0, -0.049, -0.05, -0.9, 1.0])
+        expected_sentiments = np.empty(len(compounds), dtype=np.int8)
+        expected_confidences = np.empty(len(compounds))
+        _classify_compound_numpy(compounds, expected_sentiments, expected_confidences)
+
+        sentiments = np.empty(len(compounds), dtype=np.int8)
+        confidences = np.empty(len(compounds))
+        classify_compound(compounds, sentiments, confidences)
+
+        assert sentiments.tolist() == [1, 1, 0, 0, 0, -1, -1, 1]
+        assert sentiments.tolist() == expected_sentiments.tolist()
+        assert confidences.tolist() == expected_confidences.tolist()
+
+    def test_vader_large_batch_split_across_pool(self):
+        """Test large VADER batches are scored in pool chunks and merged in order."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        service = SentimentService.__new__(SentimentService)
+        service.strategy = "vader"
+        service.vader_analyzer = Mock()
+        service.VADER_PARALLEL_MIN_BATCH = 4
+        service.VADER_PROCESSES = 3
+        texts = [f"text {i}" for i in range(10)]
+        chunks = []
+
+        def fake_chunk(chunk):
+            chunks.append(chunk)
+            return [0.5 if int(text.split()[1]) % 2 else -0.5 for text in chunk]
+
+        with ThreadPoolExecutor(max_workers=1) as pool, \
+             patch('app.services.sentiment_service._vader_pool_enabled', True), \
+             patch('app.services.sentiment_service._get_vader_pool', return_value=pool), \
+             patch('app.services.sentiment_service._vader_compounds_chunk', side_effect=fake_chunk):
+            results = service.analyze_batch(texts)
+
+        assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+        assert results == [(-1, 0.5) if i % 2 == 0 else (1, 0.5) for i in range(10)]
+        service.vader_analyzer.polarity_scores.assert_not_called()
+
+    def test_vader_large_batch_in_process_without_pool(self):
+        """Test processes that never enabled the pool (RQ jobs) score large batches in-process."""
+        service = SentimentService.__new__(SentimentService)
+        service.strategy = "vader"
+        service.vader_analyzer = Mock()
+        service.vader_analyzer.polarity_scores.return_value = {'compound': 0.5}
+        service.VADER_PARALLEL_MIN_BATCH = 4
+        service.VADER_PROCESSES = 3
+
+        with patch('app.services.sentiment_service._vader_pool_enabled', False), \
+             patch('app.services.sentiment_service._get_vader_pool') as get_pool:
+            results = service.analyze_batch([f"text {i}" for i in range(10)])
+
+        get_pool.assert_not_called()
+        assert results == [(1, 0.5)] * 10
+
+    def test_vader_pool_spawned_capped_and_shut_down(self):
+        """Test the VADER pool uses spawned workers capped at OMP_NUM_THREADS."""
+        from app.services import sentiment_service
+
+        with patch.dict(os.environ, {"OMP_NUM_THREADS": "2"}):
+            pool = sentiment_service._get_vader_pool(8)
+        try:
+            assert pool._mp_context.get_start_method() == "spawn"
+            assert pool._max_workers == 2
+            assert sentiment_service._get_vader_pool(8) is pool
+        finally:
+            sentiment_service.shutdown_vader_pool()
+
+        assert sentiment_service._vader_pool is None
+        sentiment_service.shutdown_vader_pool()
+
+    def test_batch_results_cached_per_text(self):
+        """Test repeated texts are scored once, within a batch and across calls."""
+        service = SentimentService.__new__(SentimentService)
+        service.strategy = "vader"
+        service.vader_analyzer = Mock()
+        service.vader_analyzer.polarity_scores.return_value = {"compound": 0.7}
+
+        first = service.analyze_batch(["Great service!", "Great service!", "N/A"])
+        second = service.analyze_batch(["N/A", "Great service!"])
+        single = service.analyze_sentiment("Great service!")
+
+        scored = [call[0][0] for call in service.vader_analyzer.polarity_scores.call_args_list]
+        assert scored == ["Great service!", "N/A"]
+        assert first == [(1, 0.7)] * 3
+        assert second == [(1, 0.7)] * 2
+        assert single == (1, 0.7)
+
+    def test_roberta_batch_single_pipeline_call(self):
+        """Test RoBERTa batch analysis runs the pipeline once and keeps empty texts neutral."""
+        service = SentimentService.__new__(SentimentService)
+        service.strategy = "distilroberta"
+        service.roberta_analyzer = Mock(return_value=[
+            [{"label": "joy", "score": 0.9}, {"label": "neutral", "score": 0.1}],
+            [{"label": "anger", "score": 0.1}, {"label": "neutral", "score": 0.8}],
+        ])
+
+        results = service.analyze_batch(["Great product!", "", "It arrived."])
+
+        service.roberta_analyzer.assert_called_once()
+        assert service.roberta_analyzer.call_args[0][0] == ["Great product!", "It arrived."]
+        assert results == [(1, 0.9), (0, 0.0), (0, 0.8)]
+
+    def test_roberta_single_text_matches_batch_path(self):
+        """Test single-text RoBERTa scoring truncates like the batch path and shares its cache."""
+        service = SentimentService.__new__(SentimentService)
+        service.strategy = "distilroberta"
+        service.roberta_analyzer = Mock(return_value=[
+            [{"label": "joy", "score": 0.9}, {"label": "neutral", "score": 0.1}],
+        ])
+        long_text = "Great product! " * 200
+
+        assert service.analyze_sentiment(long_text) == (1, 0.9)
+        kwargs = service.roberta_analyzer.call_args.kwargs
+        assert kwargs["truncation"] is True
+        assert kwargs["max_length"] == SentimentService.ROBERTA_MAX_LENGTH
+
+        assert service.analyze_batch([long_text]) == [(1, 0.9)]
+        service.roberta_analyzer.assert_called_once()
+
+    def test_minilm_head_fit_save_load(self):
+        """Test the MiniLM head learns separable labels and survives a save/load roundtrip."""
+        rng = np.random.default_rng(0)
+        centers = rng.normal(size=(3, 384))
+        sentiments = [-1, 0, 1] * 20
+        embeddings = centers[np.asarray(sentiments) + 1] + 0.1 * rng.normal(size=(60, 384))
+
+        head = MiniLMSentimentHead.fit(embeddings, sentiments)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "head.npz")
+            head.save(path)
+            loaded = MiniLMSentimentHead.load(path)
+
+        predictions = loaded.predict(embeddings)
+        assert [sentiment for sentiment, _ in predictions] == sentiments
+        assert all(isinstance(confidence, float) and 0 < confidence <= 1 for _, confidence in predictions)
+
+    def test_minilm_head_batch_reuses_embeddings(self):
+        """Test the MiniLM head scores precomputed embeddings without re-embedding."""
+        service = SentimentService.__new__(SentimentService)
+        service.strategy = "minilm_head"
+        service.embedding_service = Mock()
+        weights = np.zeros((3, 4), dtype=np.float32)
+        weights[2, 0] = weights[0, 1] = 10.0
+        service.sentiment_head = MiniLMSentimentHead(weights, np.zeros(3))
+
+        embeddings = np.array([[1.0, 0, 0, 0], [0, 0, 1.0, 0], [0, 1.0, 0, 0]])
+        results = service.analyze_batch(["Great", "", "Awful"], embeddings=embeddings)
+
+        service.embedding_service.generate_embeddings.assert_not_called()
+        assert [sentiment for sentiment, _ in results] == [1, 0, -1]
+        assert results[1] == (0, 0.0)
+
+    def test_emotions_to_sentiment_batch(self):
+        """Test vectorized emotion mapping matches the per-text rules."""
+        service = SentimentService.__new__(SentimentService)
+        outputs = [
+            [{"label": "anger", "score": 0.4}, {"label": "sadness", "score": 0.4},
+             {"label": "neutral", "score": 0.1}, {"label": "joy", "score": 0.1}],
+            [{"label": "joy", "score": 0.7}, {"label": "surprise", "score": 0.3}],
+            [{"label": "neutral", "score": 0.6}, {"label": "fear", "score": 0.4}],
+        ]
+
+        results = service._emotions_to_sentiment_batch(outputs)
+
+        assert [sentiment for sentiment, _ in results] == [-1, 1, 0]
+        assert results[0][1] == pytest.approx(0.2)
+        assert results[1] == (1, 0.7)
+        assert results[2] == (0, 0.6)
+        assert service._emotions_to_sentiment(outputs[1]) == (1, 0.7)
+
+        # Full outputs in the model's label order take the positional fast path
+        ordered = [
+            [{"label": label, "score": score} for label, score in zip(SentimentService.EMOTION_LABELS, row)]
+            for row in ([0.1, 0.1, 0.1, 0.05, 0.5, 0.1, 0.05], [0.0, 0.0, 0.0, 0.9, 0.05, 0.0, 0.05])
+        ]
+        assert service._emotions_to_sentiment_batch(ordered) == [(0, 0.5), (1, 0.9)]
+        assert service._emotions_to_sentiment_batch(ordered[:1] + outputs[:1])[1] == results[0]
+
     def test_sentiment_label_conversion(self):
         """Test sentiment label conversion."""
         service = SentimentService()
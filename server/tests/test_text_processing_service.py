@@ -4,7 +4,15 @@ Unit tests for text processing service - normalization and language detection.
 
 import pytest
 from unittest.mock import Mock, patch, MagicMock
-from app.services.text_processing_service import TextProcessingService
+from app.services.text_processing_service import TextProcessingService, _language_caches
+
+
+@pytest.fixture(autouse=True)
+def clear_language_cache():
+    """Start every test without languages detected by earlier tests."""
+    _language_caches.clear()
+    yield
+    _language_caches.clear()
 
 
 class TestTextProcessingService:
@@ -121,10 +129,25 @@ class TestTextProcessingService:
         assert result == "en"
 
         # Test low confidence
+        _language_caches.clear()
         mock_model.predict.return_value = (['__label__en'], [0.3])
         result = service.detect_language("Hello world")
         assert result is None
 
+    def test_detect_language_cached(self):
+        """Test a repeated text is answered from the language cache without fasttext."""
+        service = TextProcessingService()
+        service.language_detector = Mock()
+        service.language_detector.predict.return_value = ([['__label__es']], [[0.9]])
+
+        assert service.detect_languages_batch(["muy bien"]) == ["es"]
+
+        # The cached result wins even though the model would now answer differently
+        service.language_detector.predict.return_value = ([['__label__fr']], [[0.9]])
+        assert service.detect_language("muy bien") == "es"
+        assert service.detect_languages_batch(["muy bien", "muy bien"]) == ["es", "es"]
+        service.language_detector.predict.assert_called_once()
+
     @patch('app.services.text_processing_service.FASTTEXT_AVAILABLE', False)
     def test_detect_language_without_fasttext(self):
         """Test language detection when fasttext is not available."""
@@ -186,6 +209,62 @@ class TestTextProcessingService:
         assert lang == "en"
         assert should_process is True  # Should process English
 
+    def test_process_texts_single_detection_call(self):
+        """Test batch processing detects all languages with one fasttext call."""
+        service = TextProcessingService()
+        service.language_detector = Mock()
+        service.language_detector.predict.return_value = (
+            [['__label__en'], ['__label__es'], ['__label__fr']],
+            [[0.9], [0.8], [0.3]]
+        )
+        mock_model = service.language_detector
+
+        results = service.process_texts(["Hello\nworld", "Hola mundo", "   ", "Bonjour"])
+
+        mock_model.predict.assert_called_once_with(["hello world", "hola mundo", "bonjour"], k=1)
+        assert results == [
+            ("hello world", "en", True),
+            ("hola mundo", "es", False),
+            ("", None, False),
+            ("bonjour", None, True),  # Below the confidence threshold
+        ]
+
+    def test_language_detection_cached_per_text(self):
+        """Test repeated texts skip fasttext inference."""
+        service = TextProcessingService()
+        service.language_detector = Mock()
+        service.language_detector.predict.return_value = (['__label__en'], [0.9])
+        mock_model = service.language_detector
+
+        assert service.detect_language("hello") == "en"
+        assert service.detect_language("hello") == "en"
+        mock_model.predict.assert_called_once_with("hello", k=1)
+
+        # Batch detection reuses the cache and sends each distinct miss once
+        mock_model.predict.return_value = ([['__label__es']], [[0.9]])
+        assert service.detect_languages_batch(["hello", "gracias", "gracias"]) == ["en", "es", "es"]
+        mock_model.predict.assert_called_with(["gracias"], k=1)
+        assert mock_model.predict.call_count == 2
+
+    def test_obvious_english_skips_fasttext(self):
+        """Test short ASCII texts with several English-only words bypass fasttext."""
+        service = TextProcessingService()
+        service.language_detector = Mock()
+        service.language_detector.predict.return_value = ([['__label__es']], [[0.9]])
+        mock_model = service.language_detector
+
+        assert service.detect_language("thanks, great product") == "en"
+        assert service.detect_languages_batch(["thank you", "this is good", "muy bien"]) == ["en", "en", "es"]
+        mock_model.predict.assert_called_once_with(["muy bien"], k=1)
+
+        # Words shared with other languages, or a single marker, are not enough
+        for text in ["het is goed", "was ist das?", "ok gracias", "la app no funciona, ok?", "good"]:
+            assert not service._is_obvious_english(text)
+
+        # Long or non-ASCII text still goes through the model
+        assert not service._is_obvious_english("the " * 20)
+        assert not service._is_obvious_english("the café")
+
     def test_process_text_no_skip_non_english(self):
         """Test text processing without language filtering."""
         service = TextProcessingService()
@@ -0,0 +1,113 @@
+"""
+Unit tests for upload service - CSV upload preprocessing.
+"""
+
+import asyncio
+import io
+import os
+import time
+import uuid
+from unittest.mock import Mock, patch
+import pytest
+from app.services.upload_service import UploadService, _uuid4_strings
+
+
+class TestUploadService:
+    """Test upload service functionality."""
+
+    def test_uuid4_strings_are_valid_v4(self):
+        """Test bulk-generated ids are unique, canonical version 4 UUIDs."""
+        ids = _uuid4_strings(500)
+
+        assert len(set(ids)) == 500
+        for value in ids:
+            parsed = uuid.UUID(value)
+            assert str(parsed) == value
+            assert parsed.version == 4
+            assert parsed.variant == uuid.RFC_4122
+
+    def test_uuid4_strings_empty(self):
+        """Test no ids are generated for an empty upload."""
+        assert _uuid4_strings(0) == []
+
+    def test_process_upload_enqueues_one_job_per_chunk(self):
+        """Test the CSV is streamed in chunks with one queued job per chunk."""
+        service = UploadService.__new__(UploadService)
+        service.UPLOAD_CHUNK_SIZE = 2
+        service.queue = Mock()
+        service.queue.enqueue.side_effect = [Mock(id=f"job-{i}") for i in range(3)]
+
+        csv_file = io.BytesIO(b"text\n" + b"".join(f"feedback {i}\n".encode() for i in range(5)))
+        result = asyncio.run(service.process_upload(Mock(file=csv_file)))
+
+        assert result["processed_count"] == 5
+        assert result["job_ids"] == ["job-0", "job-1", "job-2"]
+        assert result["job_id"] == "job-0"
+        batches = [call[0][1] for call in service.queue.enqueue.call_args_list]
+        assert [len(batch["text"]) for batch in batches] == [2, 2, 1]
+        assert batches[2]["text"] == ["feedback 4"]
+        assert batches[0]["source"] == ["csv_upload", "csv_upload"]
+        assert len(batches[0]["id"]) == 2
+
+    def test_process_upload_arrow_handoff(self):
+        """Test the Arrow hand-off enqueues file paths, and falls back without pyarrow."""
+        service = UploadService.__new__(UploadService)
+        service.UPLOAD_HANDOFF = "arrow"
+        service.queue = Mock()
+        service.queue.enqueue.return_value = Mock(id="job-0")
+        service._write_arrow_chunk = Mock(return_value="/dev/shm/feedback_1.arrow")
+        service._remove_stale_arrow_chunks = Mock(return_value=0)
+
+        with patch('app.services.upload_service.PYARROW_AVAILABLE', True):
+            asyncio.run(service.process_upload(Mock(file=io.BytesIO(b"text\nhello\n"))))
+        service.queue.enqueue.assert_called_once_with(
+            'worker.tasks.process_feedback_batch_arrow', "/dev/shm/feedback_1.arrow"
+        )
+        assert list(service._write_arrow_chunk.call_args[0][0].columns) == ["text", "id", "created_at", "source"]
+        service._remove_stale_arrow_chunks.assert_called_once_with()
+
+        service.queue.reset_mock()
+        with patch('app.services.upload_service.PYARROW_AVAILABLE', False):
+            asyncio.run(service.process_upload(Mock(file=io.BytesIO(b"text\nhello\n"))))
+        assert service.queue.enqueue.call_args[0][0] == 'worker.tasks.process_feedback_batch'
+
+    def test_remove_stale_arrow_chunks(self, tmp_path):
+        """Test only Arrow chunk files older than the TTL are removed."""
+        service = UploadService.__new__(UploadService)
+        service.UPLOAD_SHM_DIR = str(tmp_path)
+        service.UPLOAD_SHM_TTL_SECONDS = 3600
+
+        stale = tmp_path / "feedback_old.arrow"
+        fresh = tmp_path / "feedback_new.arrow"
+        other = tmp_path / "unrelated.arrow"
+        for path in (stale, fresh, other):
+            path.write_bytes(b"")
+        old = time.time() - 7200
+        os.utime(stale, (old, old))
+        os.utime(other, (old, old))
+
+        assert service._remove_stale_arrow_chunks() == 1
+        assert not stale.exists()
+        assert fresh.exists() and other.exists()
+
+    def test_process_upload_missing_text_column(self):
+        """Test uploads without a text column are rejected."""
+        service = UploadService.__new__(UploadService)
+        service.queue = Mock()
+
+        with pytest.raises(Exception, match="CSV must contain columns"):
+            asyncio.run(service.process_upload(Mock(file=io.BytesIO(b"comment\nhello\n"))))
+        service.queue.enqueue.assert_not_called()
+
+    def test_process_upload_malformed_row_enqueues_nothing(self):
+        """Test a parse error in a late chunk is caught before any job is queued."""
+        service = UploadService.__new__(UploadService)
+        service.UPLOAD_CHUNK_SIZE = 2
+        service.queue = Mock()
+
+        rows = b"".join(f"feedback {i},1\n".encode() for i in range(4))
+        csv_file = io.BytesIO(b"text,rating\n" + rows + b'"unterminated quote,1\n')
+        with pytest.raises(Exception, match="Failed to process upload"):
+            asyncio.run(service.process_upload(Mock(file=csv_file)))
+        service.queue.enqueue.assert_not_called()
+
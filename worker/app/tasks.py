@@ -2,26 +2,67 @@ import os
 import sys
 import uuid
 import time
+from collections import Counter
 from datetime import datetime
 
 # Add server path to sys.path so we can import services
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../server'))
 
+from app.cpu_threads import configure_cpu_threads
+configure_cpu_threads()  # Before the services below import torch
+
 from app.models.feedback import FeedbackItem
 from app.services.database import SessionLocal, create_tables
 from app.services.sentiment_service import SentimentService
 from app.services.clustering_service import ClusteringService
+from app.services.faiss_vector_store import save_faiss_stores
 from app.logging import setup_logging, LoggingSettings, get_logger
 from app.metrics import (
-    increment_worker_jobs,
-    observe_worker_job_duration,
+    worker_jobs_total,
+    worker_job_duration_seconds,
     worker_active_jobs,
-    increment_feedback_processed,
-    set_service_health,
+    feedback_processed_total,
+    service_health_status,
 )
 
-def process_feedback_batch(feedback_data: list):
-    """Process a batch of feedback items: analyze sentiment and cluster topics"""
+# Label children resolved once at import; the per-job path then skips the
+# label lookup (and its lock) that .labels(...) does on every call
+_batch_active_jobs = worker_active_jobs.labels(job_type="feedback_batch")
+_batch_job_duration = worker_job_duration_seconds.labels(job_type="feedback_batch")
+_batch_jobs_succeeded = worker_jobs_total.labels(job_type="feedback_batch", status="success")
+_batch_jobs_failed = worker_jobs_total.labels(job_type="feedback_batch", status="failed")
+_worker_health = service_health_status.labels(service="worker")
+
+def _as_records(feedback_data):
+    """Accept a list of row dicts or a dict of equal-length columns (as UploadService sends)."""
+    if isinstance(feedback_data, dict):
+        columns = list(feedback_data)
+        return [dict(zip(columns, values)) for values in zip(*feedback_data.values())]
+    return feedback_data
+
+
+def process_feedback_batch_arrow(path):
+    """Process a batch written by UploadService as an Arrow IPC file, then delete the file.
+
+    The file is only deleted once the batch has been processed, so a failed job can be
+    retried; files left behind by jobs that never succeed are removed by UploadService
+    after UPLOAD_SHM_TTL_SECONDS.
+    """
+    import pyarrow as pa
+
+    with pa.memory_map(path, 'r') as source:
+        columns = pa.ipc.open_file(source).read_all().to_pydict()
+    result = process_feedback_batch(columns)
+    os.remove(path)
+    return result
+
+
+def process_feedback_batch(feedback_data):
+    """Process a batch of feedback items: analyze sentiment and cluster topics
+
+    ``feedback_data`` is either a list of row dicts or a dict of column lists.
+    """
+    feedback_data = _as_records(feedback_data)
 
     # Setup logging for worker
     setup_logging(LoggingSettings())
@@ -42,7 +83,7 @@ def process_feedback_batch(feedback_data: list):
     )
 
     # Increment active jobs metric
-    worker_active_jobs.labels(job_type="feedback_batch").inc()
+    _batch_active_jobs.inc()
 
     # Initialize services
     sentiment_service = SentimentService()
@@ -138,13 +179,13 @@ def process_feedback_batch(feedback_data: list):
         total_duration = time.time() - job_start_time
 
         # Update metrics
-        increment_worker_jobs("feedback_batch", "success")
-        observe_worker_job_duration("feedback_batch", total_duration)
-        set_service_health("worker", True)
+        _batch_jobs_succeeded.inc()
+        _batch_job_duration.observe(total_duration)
+        _worker_health.set(1)
 
-        # Increment feedback processed metrics
-        for item in feedback_data:
-            increment_feedback_processed(item.get('source', 'api'), "success")
+        # Increment feedback processed metrics, once per source rather than per item
+        for source, count in Counter(item.get('source', 'api') for item in feedback_data).items():
+            feedback_processed_total.labels(source=source, status="success").inc(count)
 
         log.info(
             "Feedback batch processing completed successfully",
@@ -171,9 +212,9 @@ def process_feedback_batch(feedback_data: list):
         total_duration = time.time() - job_start_time
 
         # Update metrics for failed job
-        increment_worker_jobs("feedback_batch", "failed")
-        observe_worker_job_duration("feedback_batch", total_duration)
-        set_service_health("worker", False)
+        _batch_jobs_failed.inc()
+        _batch_job_duration.observe(total_duration)
+        _worker_health.set(0)
 
         log.error(
             "Feedback batch processing failed",
@@ -192,4 +233,6 @@ def process_feedback_batch(feedback_data: list):
     finally:
         db.close()
         # Decrement active jobs metric
-        worker_active_jobs.labels(job_type="feedback_batch").dec()
+        _batch_active_jobs.dec()
+        # The RQ work horse exits with os._exit(), skipping exit hooks
+        save_faiss_stores()
@@ -6,7 +6,7 @@ from unittest.mock import Mock, patch, MagicMock, call
 from datetime import datetime, timezone
 import uuid
 
-from app.tasks import process_feedback_batch
+from app.tasks import process_feedback_batch, process_feedback_batch_arrow
 
 
 class TestProcessFeedbackBatch:
@@ -422,3 +422,53 @@ class TestProcessFeedbackBatch:
 
             assert result1["processed_count"] == result2["processed_count"] == 1
             assert mock_session.add.call_count == 2  # Both should succeed (no uniqueness constraints in this test)
+
+    def test_columnar_batch_payload(self):
+        """Test a dict of column lists (as sent by CSV uploads) is processed like row dicts."""
+        batch = {
+            "id": ["col_001", "col_002"],
+            "text": ["Great app", "Slow checkout"],
+            "source": ["csv_upload", "csv_upload"]
+        }
+
+        with patch('app.tasks.SentimentService') as mock_sentiment_class, \
+             patch('app.tasks.ClusteringService') as mock_clustering_class, \
+             patch('app.tasks.SessionLocal') as mock_session_class, \
+             patch('app.tasks.create_tables'):
+
+            mock_sentiment_service = Mock()
+            mock_sentiment_service.analyze_batch.return_value = [(1, 0.8), (-1, 0.6)]
+            mock_sentiment_class.return_value = mock_sentiment_service
+
+            mock_clustering_service = Mock()
+            mock_clustering_service.cluster_texts.return_value = {"app": [0], "checkout": [1]}
+            mock_clustering_class.return_value = mock_clustering_service
+
+            mock_session = Mock()
+            mock_session_class.return_value = mock_session
+
+            result = process_feedback_batch(batch)
+
+            assert result["processed_count"] == 2
+            mock_sentiment_service.analyze_batch.assert_called_once_with(["Great app", "Slow checkout"])
+            assert mock_session.add.call_count == 2
+
+    def test_arrow_batch_payload(self, tmp_path):
+        """Test an Arrow IPC chunk file is read as columns and deleted afterwards."""
+        pa = pytest.importorskip("pyarrow")
+        path = tmp_path / "feedback_chunk.arrow"
+        table = pa.table({"id": ["arrow_001"], "text": ["Great app"], "source": ["csv_upload"]})
+        with pa.OSFile(str(path), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+        with patch('app.tasks.process_feedback_batch') as mock_process:
+            mock_process.return_value = {"processed_count": 1}
+            result = process_feedback_batch_arrow(str(path))
+
+        mock_process.assert_called_once_with(
+            {"id": ["arrow_001"], "text": ["Great app"], "source": ["csv_upload"]}
+        )
+        assert result == {"processed_count": 1}
+        assert not path.exists()
+
@@ -14,6 +14,10 @@ from typing import List, Optional
 # Add server directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'server'))
 
+# Cap model thread pools before anything imports torch; RQ work horses inherit them
+from app.cpu_threads import configure_cpu_threads
+configure_cpu_threads()
+
 from redis import Redis
 from rq import Worker, Queue, Connection
 from app.config import settings